@@ -0,0 +1,120 @@
+"""Benchmark of the overhead of a disabled CarbonTracker.
+
+Measures, in a fresh interpreter with CARBONTRACKER_DISABLED=1:
+
+- the constructor latency of CarbonTracker,
+- the cost per call of epoch_start(), epoch_end() and stop() compared to a
+  call of an empty method (the minimum cost of any method call), clamped at
+  zero since timing noise can make a call look cheaper than the empty method,
+
+and verifies that no hardware or network library (pynvml, psutil, requests,
+geocoder) was imported and no thread was started.
+
+Each metric is reported as the median over all runs and the script exits with
+status 1 if any median exceeds its budget or a forbidden module was imported.
+
+Usage:
+    python benchmarks/bench_disabled.py [--runs 5] [--calls 1000000]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# Budgets for the median of each metric: the constructor in us and the
+# overhead per call, on top of an empty method call, in ns.
+BUDGETS = {
+    "constructor_us": 50,
+    "epoch_start_ns": 50,
+    "epoch_end_ns": 50,
+    "stop_ns": 50,
+}
+
+FORBIDDEN_MODULES = ["pynvml", "psutil", "requests", "geocoder"]
+
+CODE = """
+import json, sys, threading, time, types
+
+from carbontracker.tracker import CarbonTracker
+
+class Baseline:
+    def noop(self):
+        pass
+
+def per_call(func, calls):
+    start = time.perf_counter()
+    for _ in range(calls):
+        func()
+    return (time.perf_counter() - start) / calls
+
+def overhead_ns(func, calls, baseline):
+    return max(per_call(func, calls) - baseline, 0) * 1e9
+
+calls = {calls}
+start = time.perf_counter()
+tracker = CarbonTracker(epochs=10, log_dir=None)
+constructor = time.perf_counter() - start
+
+baseline = per_call(Baseline().noop, calls)
+results = {{
+    "constructor_us": constructor * 1e6,
+    "epoch_start_ns": overhead_ns(tracker.epoch_start, calls, baseline),
+    "epoch_end_ns": overhead_ns(tracker.epoch_end, calls, baseline),
+    "stop_ns": overhead_ns(tracker.stop, calls, baseline),
+    "baseline_ns": baseline * 1e9,
+    "threads": threading.active_count(),
+    "imported": [m for m in {forbidden!r} if type(sys.modules.get(m)) is types.ModuleType],
+}}
+print(json.dumps(results))
+"""
+
+
+def measure(calls):
+    """Runs a disabled tracker in a fresh interpreter and returns its metrics."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, CARBONTRACKER_DISABLED="1")
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [root, env.get("PYTHONPATH")]))
+    code = CODE.format(calls=calls, forbidden=FORBIDDEN_MODULES)
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, env=env)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def main(args):
+    budgets = {
+        "constructor_us": args.max_constructor_us,
+        "epoch_start_ns": args.max_epoch_start_ns,
+        "epoch_end_ns": args.max_epoch_end_ns,
+        "stop_ns": args.max_stop_ns,
+    }
+    runs = [measure(args.calls) for _ in range(args.runs)]
+
+    failed = False
+    print(f"{'metric':<16}{'median':>10}{'max':>10}{'budget':>10}")
+    for name in budgets:
+        values = [run[name] for run in runs]
+        median = statistics.median(values)
+        status = "" if median <= budgets[name] else "  OVER BUDGET"
+        failed = failed or bool(status)
+        print(f"{name:<16}{median:>10.1f}{max(values):>10.1f}{budgets[name]:>10.0f}{status}")
+    print(f"{'baseline_ns':<16}{statistics.median(run['baseline_ns'] for run in runs):>10.1f}")
+
+    imported = sorted({module for run in runs for module in run["imported"]})
+    if imported:
+        failed = True
+        print(f"Imported by a disabled tracker: {', '.join(imported)}")
+    if any(run["threads"] > 1 for run in runs):
+        failed = True
+        print("A disabled tracker started threads.")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Number of fresh interpreters to measure.")
+    parser.add_argument("--calls", type=int, default=1000000, help="Calls per method and run.")
+    for name, budget in BUDGETS.items():
+        unit = name.rsplit("_", 1)[1]
+        parser.add_argument(f"--max-{name.rsplit('_', 1)[0].replace('_', '-')}-{unit}", type=float, default=budget)
+    sys.exit(main(parser.parse_args()))
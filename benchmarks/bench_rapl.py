@@ -0,0 +1,75 @@
+"""Microbenchmark of the per-sample cost of reading Intel RAPL counters.
+
+Reads all energy counters of a fake RAPL sysfs (by default 4 packages, each
+exposing its energy through 3 subdomains) with IntelCPU and reports the median
+time per sample of:
+
+- open: opening and reading every energy_uj file for each sample,
+- pread: reading the energy_uj files kept open since init() with pread.
+
+The script exits with status 1 if the median cost of pread exceeds its budget.
+
+Usage:
+    python benchmarks/bench_rapl.py [--packages 4] [--samples 10000]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import fakes  # noqa: E402
+
+# Budget (us) for the median cost of a sample with persistent file handles.
+BUDGET_US = 100
+
+
+def measure(cpu, samples, repeats):
+    """Returns the median time (s) per sample over repeats."""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(samples):
+            cpu._get_counters()
+        timings.append((time.perf_counter() - start) / samples)
+    return statistics.median(timings)
+
+
+def main(args):
+    os.environ["CARBONTRACKER_CACHE_DIR"] = ""
+    from carbontracker.components.cpu import intel
+
+    with tempfile.TemporaryDirectory() as root:
+        rapl_dir = fakes.create_rapl_sysfs(root, packages=args.packages)
+        # Remove the package counters s.t. energy is read from the subdomains.
+        for i in range(args.packages):
+            os.remove(os.path.join(rapl_dir, f"intel-rapl:{i}", "energy_uj"))
+        intel.RAPL_DIR = rapl_dir
+
+        cpu = intel.IntelCPU(pids=[], devices_by_pid={}, mode="counter")
+        cpu.init()
+        files = sum(len(domains) for domains in cpu._energy_domains)
+
+        pread = measure(cpu, args.samples, args.repeats)
+        cpu.shutdown()
+        opened = measure(cpu, args.samples, args.repeats)
+
+    print(f"{args.packages} package(s), {files} energy file(s) per sample")
+    print(f"{'method':<8}{'us/sample':>12}{'budget (us)':>13}")
+    print(f"{'open':<8}{opened * 1e6:>12.2f}{'':>13}")
+    status = "" if pread * 1e6 <= args.max_pread_us else "  OVER BUDGET"
+    print(f"{'pread':<8}{pread * 1e6:>12.2f}{args.max_pread_us:>13.0f}{status}")
+    print(f"speedup {opened / pread:.1f}x")
+    return 1 if status else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--packages", type=int, default=4, help="Number of fake RAPL packages.")
+    parser.add_argument("--samples", type=int, default=10000, help="Samples per repeat.")
+    parser.add_argument("--repeats", type=int, default=5, help="Number of repeats.")
+    parser.add_argument("--max-pread-us", type=float, default=BUDGET_US)
+    sys.exit(main(parser.parse_args()))
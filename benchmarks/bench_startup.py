@@ -0,0 +1,148 @@
+"""Benchmark of carbontracker startup and teardown cost.
+
+Measures, fully offline with a fake RAPL sysfs, a fake pynvml module and a
+stubbed geocoder:
+
+- import time of carbontracker.tracker (in a fresh interpreter),
+- CarbonTracker constructor latency,
+- time from the first epoch_start() until the first collection finished,
+  i.e., the first power sample in power mode or the baseline read in counter
+  and samples mode (whose first sample is only taken at the next collection),
+- teardown time of stop() until the monitoring thread has exited.
+
+Each metric is reported as the median over all runs and the script exits with
+status 1 if any median exceeds the budget of the sampling mode.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 5] [--sampling-mode power] [--max-constructor-ms 250]
+"""
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import fakes  # noqa: E402
+
+# Budgets (ms) for the median of each metric by sampling mode. In power mode,
+# Intel CPUs measure over 1 s per collection, which stop() interrupts.
+BUDGETS = {
+    "power": {
+        "import": 500,
+        "constructor": 250,
+        "first_sample": 2000,
+        "teardown": 100,
+    },
+    "counter": {
+        "import": 500,
+        "constructor": 250,
+        "first_sample": 250,
+        "teardown": 50,
+    },
+    "samples": {
+        "import": 500,
+        "constructor": 250,
+        "first_sample": 2000,
+        "teardown": 100,
+    },
+}
+
+
+def measure_import():
+    """Returns the time (s) to import carbontracker.tracker in a fresh
+    interpreter with fakes installed."""
+    code = (
+        "import sys, time\n"
+        f"sys.path.insert(0, {os.path.dirname(os.path.dirname(os.path.abspath(__file__)))!r})\n"
+        "from benchmarks import fakes\n"
+        "fakes.install()\n"
+        "start = time.perf_counter()\n"
+        "import carbontracker.tracker\n"
+        "print(time.perf_counter() - start)\n"
+    )
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return float(output.stdout.strip().splitlines()[-1])
+
+
+def collection_count(tracker):
+    """Returns the number of collections of all components, including those
+    which only read the baseline of counter and samples mode."""
+    return sum(comp.collection_durations.count for comp in tracker.tracker.components)
+
+
+def measure_tracker(update_interval, timeout, sampling_mode="power"):
+    """Returns constructor, time-to-first-sample and teardown times (s) of a
+    single CarbonTracker."""
+    from carbontracker.tracker import CarbonTracker
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        tracker = CarbonTracker(
+            epochs=2, update_interval=update_interval, log_dir=None, verbose=0, sampling_mode=sampling_mode
+        )
+        constructor = time.perf_counter() - start
+
+        start = time.perf_counter()
+        tracker.epoch_start()
+        while collection_count(tracker) == 0 and time.perf_counter() - start < timeout:
+            time.sleep(0.001)
+        first_sample = time.perf_counter() - start
+
+        thread = tracker.tracker
+        start = time.perf_counter()
+        tracker.stop()
+        thread.join(timeout)
+        teardown = time.perf_counter() - start
+    return constructor, first_sample, teardown
+
+
+def main(args):
+    budgets = dict(BUDGETS[args.sampling_mode])
+    for name in budgets:
+        budget = getattr(args, f"max_{name}_ms")
+        if budget is not None:
+            budgets[name] = budget
+    results = {name: [] for name in budgets}
+
+    for _ in range(args.runs):
+        results["import"].append(measure_import())
+
+    with tempfile.TemporaryDirectory() as root:
+        fakes.install(root, device_count=args.gpus, nvml_init_delay=args.nvml_init_delay)
+        for _ in range(args.runs):
+            constructor, first_sample, teardown = measure_tracker(
+                args.update_interval, args.timeout, args.sampling_mode
+            )
+            results["constructor"].append(constructor)
+            results["first_sample"].append(first_sample)
+            results["teardown"].append(teardown)
+
+    over_budget = False
+    print(f"{'metric':<14}{'median (ms)':>12}{'max (ms)':>12}{'budget (ms)':>13}")
+    for name, values in results.items():
+        median = statistics.median(values) * 1000
+        status = "" if median <= budgets[name] else "  OVER BUDGET"
+        over_budget = over_budget or bool(status)
+        print(f"{name:<14}{median:>12.1f}{max(values) * 1000:>12.1f}{budgets[name]:>13.0f}{status}")
+    return 1 if over_budget else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Number of runs per metric.")
+    parser.add_argument("--gpus", type=int, default=2, help="Number of fake GPUs.")
+    parser.add_argument("--nvml-init-delay", type=float, default=0.0, help="Seconds a fake nvmlInit() takes.")
+    parser.add_argument("--update-interval", type=float, default=10, help="update_interval of the trackers.")
+    parser.add_argument("--sampling-mode", default="power", choices=BUDGETS, help="sampling_mode of the trackers.")
+    parser.add_argument("--timeout", type=float, default=30, help="Seconds to wait for samples and teardown.")
+    for name in BUDGETS["power"]:
+        parser.add_argument(
+            f"--max-{name.replace('_', '-')}-ms", type=float, help="Overrides the budget of the sampling mode."
+        )
+    sys.exit(main(parser.parse_args()))
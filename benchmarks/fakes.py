@@ -0,0 +1,160 @@
+"""Offline stand-ins for the hardware and network interfaces used by carbontracker.
+
+The fakes are installed into sys.modules (pynvml, geocoder) and the RAPL
+directory of the Intel handler is pointed at a temporary sysfs tree, s.t.
+benchmarks exercise the real code paths without hardware or network access.
+"""
+import os
+import sys
+import time
+import types
+
+# Energy counters of the fake RAPL packages wrap at this value (~262 kJ),
+# which matches common Intel server parts.
+MAX_ENERGY_RANGE_UJ = 262143328850
+
+
+def create_rapl_sysfs(root, packages=2, subdomains=("core", "uncore", "dram")):
+    """Creates a fake /sys/class/powercap tree below root and returns its path.
+
+    Every package gets an energy_uj counter and the given subdomains, and an
+    additional psys domain is added which carbontracker should ignore.
+    """
+    rapl_dir = os.path.join(root, "powercap")
+    domains = [(f"intel-rapl:{i}", f"package-{i}") for i in range(packages)]
+    domains.append((f"intel-rapl:{packages}", "psys"))
+    for package, name in domains:
+        _write_rapl_domain(os.path.join(rapl_dir, package), name)
+        if name == "psys":
+            continue
+        for j, subdomain in enumerate(subdomains):
+            _write_rapl_domain(os.path.join(rapl_dir, package, f"{package}:{j}"), subdomain)
+    return rapl_dir + os.sep
+
+
+def _write_rapl_domain(path, name):
+    os.makedirs(path, exist_ok=True)
+    for filename, content in (
+        ("name", name),
+        ("energy_uj", "123456789"),
+        ("max_energy_range_uj", str(MAX_ENERGY_RANGE_UJ)),
+    ):
+        with open(os.path.join(path, filename), "w") as f:
+            f.write(content + "\n")
+
+
+def make_pynvml(device_count=2, init_delay=0.0, power_mw=150000):
+    """Returns a module implementing the subset of pynvml used by carbontracker.
+
+    Args:
+        device_count (int): Number of fake GPUs.
+        init_delay (float): Seconds nvmlInit() blocks for, to model slow
+            driver initialization.
+        power_mw (int): Constant power draw reported per GPU.
+    """
+    pynvml = types.ModuleType("pynvml")
+    pynvml.NVML_ERROR_NOT_SUPPORTED = 3
+    pynvml.NVML_ERROR_NOT_FOUND = 6
+    pynvml.NVML_TOTAL_POWER_SAMPLES = 0
+    pynvml.NVML_VALUE_TYPE_UNSIGNED_INT = 1
+    pynvml.init_count = 0
+    start = time.monotonic()
+
+    class NVMLError(Exception):
+        def __init__(self, value=None):
+            self.value = value
+
+    def nvmlInit():
+        pynvml.init_count += 1
+        time.sleep(init_delay)
+
+    def nvmlShutdown():
+        pass
+
+    def nvmlDeviceGetCount():
+        return device_count
+
+    def nvmlDeviceGetHandleByIndex(index):
+        if index >= device_count:
+            raise NVMLError(2)
+        return index
+
+    def nvmlDeviceGetName(handle):
+        return "Fake GPU"
+
+    def nvmlDeviceGetUUID(handle):
+        return f"GPU-00000000-0000-0000-0000-{handle:012d}"
+
+    def nvmlDeviceGetPowerUsage(handle):
+        return power_mw
+
+    def nvmlDeviceGetTotalEnergyConsumption(handle):
+        return int((time.monotonic() - start) * power_mw)
+
+    def nvmlDeviceGetSamples(handle, sampling_type, timestamp):
+        # The driver buffers power samples at ~20 Hz.
+        now_us = int((time.monotonic() - start) * 1e6)
+        first = timestamp // 50000 + 1
+        samples = [
+            types.SimpleNamespace(timeStamp=i * 50000, sampleValue=types.SimpleNamespace(uiVal=power_mw))
+            for i in range(max(first, now_us // 50000 - 99), now_us // 50000 + 1)
+        ]
+        if not samples:
+            raise NVMLError(pynvml.NVML_ERROR_NOT_FOUND)
+        return pynvml.NVML_VALUE_TYPE_UNSIGNED_INT, samples
+
+    def nvmlDeviceGetComputeRunningProcesses(handle):
+        return []
+
+    def nvmlDeviceGetGraphicsRunningProcesses(handle):
+        return []
+
+    for func in (
+        NVMLError,
+        nvmlInit,
+        nvmlShutdown,
+        nvmlDeviceGetCount,
+        nvmlDeviceGetHandleByIndex,
+        nvmlDeviceGetName,
+        nvmlDeviceGetUUID,
+        nvmlDeviceGetPowerUsage,
+        nvmlDeviceGetTotalEnergyConsumption,
+        nvmlDeviceGetSamples,
+        nvmlDeviceGetComputeRunningProcesses,
+        nvmlDeviceGetGraphicsRunningProcesses,
+    ):
+        setattr(pynvml, func.__name__, func)
+    return pynvml
+
+
+def make_geocoder(country="US", address="Benchmark City, US"):
+    """Returns a module whose ip() resolves to a fixed location without network
+    access. The default country has no live intensity fetcher, s.t. the
+    default intensity lookup is exercised offline."""
+    geocoder = types.ModuleType("geocoder")
+
+    def ip(location):
+        return types.SimpleNamespace(ok=True, address=address, country=country, postal=None, lat=0.0, lng=0.0)
+
+    geocoder.ip = ip
+    return geocoder
+
+
+def install(root=None, device_count=2, nvml_init_delay=0.0, rapl_packages=2):
+    """Installs all fakes and returns the fake pynvml module.
+
+    Must be called before carbontracker.tracker is imported. The fake RAPL
+    sysfs and a hardware cache directory are only created if root is given,
+    since the former requires importing the Intel handler.
+    """
+    pynvml = make_pynvml(device_count=device_count, init_delay=nvml_init_delay)
+    sys.modules["pynvml"] = pynvml
+    sys.modules["geocoder"] = make_geocoder()
+    os.environ.pop("CUDA_VISIBLE_DEVICES", None)
+
+    if root is not None:
+        from carbontracker.components.cpu import intel
+
+        intel.RAPL_DIR = create_rapl_sysfs(root, packages=rapl_packages)
+        os.environ["CARBONTRACKER_CACHE_DIR"] = os.path.join(root, "cache")
+    return pynvml
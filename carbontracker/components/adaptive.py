@@ -0,0 +1,75 @@
+"""Adaptive sampling interval driven by the observed power usage."""
+
+# Deviation of a sample from the recent average power usage (relative to the
+# latter) above which the interval is shortened and below which it is
+# lengthened.
+HIGH_DEVIATION = 0.1
+LOW_DEVIATION = 0.02
+# Factors by which the interval is shortened and lengthened.
+SHORTEN = 0.5
+LENGTHEN = 1.25
+# Weight of the latest sample in the moving average of the power usage.
+SMOOTHING = 0.25
+# Power usage (W) below which deviations are taken relative to this instead,
+# s.t. idle devices do not amplify noise.
+MIN_POWER = 1.0
+# Maximum fraction of time spent collecting samples.
+DEFAULT_OVERHEAD = 0.01
+# Default bounds of the interval relative to the initial interval.
+DEFAULT_RANGE = 10
+
+
+class AdaptiveInterval:
+    """Sampling interval of a component that is shortened while its power
+    usage fluctuates and lengthened while it is stable.
+
+    Every sample is compared to the exponentially weighted moving average of
+    the power usage, s.t. both noise and ramps show as a deviation. The
+    interval is halved if the relative deviation exceeds HIGH_DEVIATION, s.t.
+    transients are followed quickly, and grows gradually if it is below
+    LOW_DEVIATION. The interval stays within [min_interval, max_interval] and
+    is never shorter than the duration of the latest collection divided by
+    overhead, s.t. at most that fraction of time is spent collecting.
+
+    Args:
+        interval (float): Initial interval (s).
+        min_interval (float): Minimum interval (s). Defaults to interval / 10.
+        max_interval (float): Maximum interval (s). Defaults to interval * 10.
+        overhead (float): Maximum fraction of time spent collecting.
+    """
+
+    def __init__(self, interval, min_interval=None, max_interval=None, overhead=DEFAULT_OVERHEAD):
+        self.min_interval = interval / DEFAULT_RANGE if min_interval is None else min_interval
+        self.max_interval = interval * DEFAULT_RANGE if max_interval is None else max_interval
+        if not 0 < self.min_interval <= self.max_interval:
+            raise ValueError(
+                f"Expected 0 < min_interval <= max_interval, got {self.min_interval} and {self.max_interval}."
+            )
+        if not 0 < overhead <= 1:
+            raise ValueError(f"Expected an overhead in (0, 1], got {overhead}.")
+        self.overhead = overhead
+        self.interval = min(max(interval, self.min_interval), self.max_interval)
+        self._average = None
+        self._last_time = None
+
+    def update(self, timestamp, power_usage, duration):
+        """Adapts the interval to a sample of the total power usage (W) and
+        the duration (s) of its collection and returns it. Samples are only
+        taken into account once."""
+        if self._last_time is not None and timestamp <= self._last_time:
+            return self.interval
+        self._last_time = timestamp
+
+        if self._average is None:
+            self._average = power_usage
+        else:
+            deviation = abs(power_usage - self._average) / max(abs(self._average), MIN_POWER)
+            if deviation > HIGH_DEVIATION:
+                self.interval *= SHORTEN
+            elif deviation < LOW_DEVIATION:
+                self.interval *= LENGTHEN
+            self._average += SMOOTHING * (power_usage - self._average)
+
+        lower = min(max(self.min_interval, duration / self.overhead), self.max_interval)
+        self.interval = min(max(self.interval, lower), self.max_interval)
+        return self.interval
@@ -1,6 +1,7 @@
 import platform
 import subprocess
 import re
+import threading
 import time
 from carbontracker.components.handler import Handler
 
@@ -8,15 +9,19 @@ from carbontracker.components.handler import Handler
 class PowerMetricsUnified:
     _output = None
     _last_updated = None
+    # Serializes the CPU and GPU handlers, which are collected concurrently,
+    # s.t. they share one powermetrics run instead of starting one each.
+    _lock = threading.Lock()
 
     @staticmethod
     def get_output():
-        if PowerMetricsUnified._output is None or time.time() - PowerMetricsUnified._last_updated > 1:
-            PowerMetricsUnified._output = subprocess.check_output(
-                ["sudo", "powermetrics", "-n", "1", "-i", "1000", "--samplers", "all"], universal_newlines=True
-            )
-            PowerMetricsUnified._last_updated = time.time()
-        return PowerMetricsUnified._output
+        with PowerMetricsUnified._lock:
+            if PowerMetricsUnified._output is None or time.time() - PowerMetricsUnified._last_updated > 1:
+                PowerMetricsUnified._output = subprocess.check_output(
+                    ["sudo", "powermetrics", "-n", "1", "-i", "1000", "--samplers", "all"], universal_newlines=True
+                )
+                PowerMetricsUnified._last_updated = time.time()
+            return PowerMetricsUnified._output
 
 
 class AppleSiliconCPU(Handler):
@@ -0,0 +1,103 @@
+"""Preallocated ring buffer of timestamped power samples."""
+import numpy as np
+
+# Bytes before the timestamps in a buffer: the count of samples (int64).
+HEADER_SIZE = 8
+
+
+class RingBuffer:
+    """Ring buffer of samples (timestamp, values per device) stored in
+    preallocated float64 arrays.
+
+    Samples are addressed by their absolute index, i.e., the number of samples
+    appended before them, s.t. indices remain valid after older samples have
+    been overwritten. Only the latest `capacity` samples are retained.
+
+    The arrays are either allocated by the buffer or laid out in a given
+    memory block (e.g. multiprocessing.shared_memory) of at least
+    RingBuffer.nbytes(capacity, devices) bytes as: count (int64), timestamps
+    (capacity float64), values (capacity x devices float64). A single writer
+    and any number of readers may share the block.
+    """
+
+    def __init__(self, capacity, devices=None, buffer=None):
+        if capacity < 1:
+            raise ValueError(f"Argument capacity expected a positive number of samples, got {capacity}.")
+        self.capacity = int(capacity)
+        if buffer is None:
+            self._header = np.zeros(1, dtype=np.int64)
+            self._times = np.empty(self.capacity)
+            # Allocated by the first append once the number of devices is known.
+            self._values = None if devices is None else np.empty((self.capacity, devices))
+        else:
+            self._header = np.ndarray((1,), dtype=np.int64, buffer=buffer)
+            self._times = np.ndarray((self.capacity,), dtype=np.float64, buffer=buffer, offset=HEADER_SIZE)
+            self._values = np.ndarray(
+                (self.capacity, devices), dtype=np.float64, buffer=buffer, offset=HEADER_SIZE + 8 * self.capacity
+            )
+
+    @staticmethod
+    def nbytes(capacity, devices):
+        """Returns the size (bytes) of a memory block holding a buffer."""
+        return HEADER_SIZE + 8 * capacity * (1 + devices)
+
+    @property
+    def count(self):
+        """Absolute index of the next sample."""
+        return int(self._header[0])
+
+    @property
+    def start(self):
+        """Absolute index of the oldest retained sample."""
+        return max(self.count - self.capacity, 0)
+
+    def __len__(self):
+        return self.count - self.start
+
+    def append(self, timestamp, values):
+        values = np.asarray(values, dtype=float).reshape(-1)
+        if self._values is None:
+            self._values = np.empty((self.capacity, values.size))
+        count = self.count
+        i = count % self.capacity
+        self._times[i] = timestamp
+        self._values[i] = values
+        # Increment the count last s.t. concurrent readers never see the slot
+        # before it is written.
+        self._header[0] = count + 1
+
+    def get(self, start=None, stop=None):
+        """Returns the timestamps (n,) and values (n, devices) of the retained
+        samples with absolute indices in [start, stop).
+
+        Note:
+            Unless the samples wrap around the end of the buffer, the arrays
+            are read-only views into the buffer instead of copies.
+        """
+        count = self.count
+        first = max(count - self.capacity, 0)
+        start = first if start is None else min(max(start, first), count)
+        stop = count if stop is None else min(max(stop, start), count)
+        if self._values is None:
+            return np.empty(0), np.empty((0, 0))
+        i = start % self.capacity
+        n = stop - start
+        if i + n <= self.capacity:
+            times, values = self._times[i : i + n], self._values[i : i + n]
+            times.flags.writeable = values.flags.writeable = False
+            return times, values
+        indices = np.arange(start, stop)
+        return np.take(self._times, indices, mode="wrap"), np.take(self._values, indices, axis=0, mode="wrap")
+
+    def latest_time(self):
+        """Returns the timestamp of the latest sample or None."""
+        count = self.count
+        return float(self._times[(count - 1) % self.capacity]) if count else None
+
+    def copy(self):
+        """Returns a copy of the buffer in memory of its own."""
+        buffer = RingBuffer(self.capacity)
+        buffer._header[0] = self._header[0]
+        buffer._times[:] = self._times
+        buffer._values = None if self._values is None else self._values.copy()
+        return buffer
@@ -0,0 +1,113 @@
+"""Persistent cache of discovered hardware.
+
+The hardware topology (e.g. RAPL domains) of a machine does not change until
+it is rebooted, so handlers store what they discover in a small JSON file named
+by the kernel boot ID and reuse it in subsequent processes instead of walking
+sysfs again. Machines sharing the cache directory, e.g. a home directory on
+NFS, thereby use separate files.
+
+The cache is located in $CARBONTRACKER_CACHE_DIR (defaults to
+$XDG_CACHE_HOME/carbontracker or ~/.cache/carbontracker). Setting
+CARBONTRACKER_CACHE_DIR to an empty string disables it. The cache is best
+effort: any error while reading or writing it is treated as a cache miss.
+"""
+import json
+import os
+import tempfile
+import time
+
+BOOT_ID_FILE = "/proc/sys/kernel/random/boot_id"
+CACHE_FILE = "hardware-{boot_id}.json"
+# Time (s) after which unmodified cache files of other boot IDs are removed.
+# They may belong to other machines sharing the directory, so they are not
+# removed right away.
+STALE_AGE = 30 * 24 * 3600
+
+
+def cache_dir():
+    """Returns the cache directory or None if caching is disabled."""
+    directory = os.environ.get("CARBONTRACKER_CACHE_DIR")
+    if directory is None:
+        cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        directory = os.path.join(cache_home, "carbontracker")
+    return directory or None
+
+
+def boot_id():
+    """Returns the boot ID of the running kernel or None if unavailable."""
+    try:
+        with open(BOOT_ID_FILE, "r") as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+def _cache_path(directory, current_boot_id):
+    return os.path.join(directory, CACHE_FILE.format(boot_id=current_boot_id))
+
+
+def _read_entries(directory, current_boot_id):
+    try:
+        with open(_cache_path(directory, current_boot_id), "r") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("boot_id") != current_boot_id:
+        return {}
+    entries = data.get("entries")
+    return entries if isinstance(entries, dict) else {}
+
+
+def load(key):
+    """Returns the value cached for key during the current boot or None."""
+    directory = cache_dir()
+    current_boot_id = boot_id()
+    if directory is None or current_boot_id is None:
+        return None
+    return _read_entries(directory, current_boot_id).get(key)
+
+
+def store(key, value):
+    """Caches a JSON serializable value for key until the next reboot."""
+    directory = cache_dir()
+    current_boot_id = boot_id()
+    if directory is None or current_boot_id is None:
+        return
+
+    entries = _read_entries(directory, current_boot_id)
+    entries[key] = value
+    try:
+        os.makedirs(directory, exist_ok=True)
+        # Write to a temporary file and rename it s.t. concurrent readers never
+        # see a partially written cache.
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".hardware-", suffix=".json")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump({"boot_id": current_boot_id, "entries": entries}, f)
+            os.replace(tmp_path, _cache_path(directory, current_boot_id))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except (OSError, TypeError, ValueError):
+        return
+    _remove_stale(directory, current_boot_id)
+
+
+def _remove_stale(directory, current_boot_id):
+    """Removes the cache files of other boot IDs unmodified for STALE_AGE."""
+    prefix, suffix = CACHE_FILE.split("{boot_id}")
+    current_name = os.path.basename(_cache_path(directory, current_boot_id))
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return
+    now = time.time()
+    for name in names:
+        if name == current_name or not (name.startswith(prefix) and name.endswith(suffix)):
+            continue
+        path = os.path.join(directory, name)
+        try:
+            if now - os.path.getmtime(path) > STALE_AGE:
+                os.unlink(path)
+        except OSError:
+            pass
@@ -1,20 +1,52 @@
+import time
+from concurrent import futures
+from threading import Thread
+
 import numpy as np
 
 from carbontracker import exceptions
-from carbontracker.components.gpu import nvidia
-from carbontracker.components.cpu import intel
-from carbontracker.components.apple_silicon.powermetrics import AppleSiliconCPU, AppleSiliconGPU
+from carbontracker import lazyutil
+from carbontracker.components.buffer import RingBuffer
+from carbontracker.components.stats import DurationStats, EpochStats
+
+# Maximum time (s) spent probing handlers. Handlers that have not finished
+# probing by then are considered unavailable.
+PROBE_TIMEOUT = 10
+
+# Number of samples retained per component by default.
+DEFAULT_RETENTION = 65536
+
+# Sentinel s.t. a Component probes its own handler if none is given.
+_PROBE = object()
 
+# How handlers sample power usage:
+# - "power": instantaneous power readings at every collection.
+# - "counter": average power since the previous collection computed from
+#   cumulative energy counters.
+# - "samples": average of the power samples buffered by the driver since the
+#   previous collection.
+# Handlers fall back to "power" if they do not support a mode.
+SAMPLING_MODES = ("power", "counter", "samples")
+
+# Handlers are given by their import path s.t. handler modules (and their
+# dependencies such as pynvml) are only imported once their component is
+# probed.
 COMPONENTS = [
     {
         "name": "gpu",
         "error": exceptions.GPUError("No GPU(s) available."),
-        "handlers": [nvidia.NvidiaGPU, AppleSiliconGPU],
+        "handlers": [
+            "carbontracker.components.gpu.nvidia.NvidiaGPU",
+            "carbontracker.components.apple_silicon.powermetrics.AppleSiliconGPU",
+        ],
     },
     {
         "name": "cpu",
         "error": exceptions.CPUError("No CPU(s) available."),
-        "handlers": [intel.IntelCPU, AppleSiliconCPU],
+        "handlers": [
+            "carbontracker.components.cpu.intel.IntelCPU",
+            "carbontracker.components.apple_silicon.powermetrics.AppleSiliconCPU",
+        ],
     },
 ]
 
@@ -32,17 +64,145 @@ def error_by_name(name):
 def handlers_by_name(name):
     for comp in COMPONENTS:
         if comp["name"] == name:
-            return comp["handlers"]
+            return [lazyutil.import_object(handler) for handler in comp["handlers"]]
+
+
+def _probe_handler(handler_cls, pids, devices_by_pid, mode="power"):
+    """Instantiates and probes a handler in a daemon thread s.t. a hanging
+    probe can neither block the caller nor interpreter exit.
+
+    Returns:
+        Future with the handler if it is available and None otherwise.
+    """
+    future = futures.Future()
+
+    def probe():
+        try:
+            handler = handler_cls(pids=pids, devices_by_pid=devices_by_pid, mode=mode)
+            future.set_result(handler if handler.available() else None)
+        except Exception as e:
+            future.set_exception(e)
+
+    Thread(target=probe, name="CarbonTrackerProbe", daemon=True).start()
+    return future
+
+
+def _preferred_handler(probes, timed_out=False):
+    """Returns (resolved, handler) for the probes of a component ordered by
+    preference. The preferred handler is resolved once it is available and all
+    handlers before it are unavailable. After a timeout, the first available
+    handler that finished probing is used."""
+    for probe in probes:
+        if not probe.done():
+            if timed_out:
+                continue
+            return False, None
+        handler = probe.result()
+        if handler is not None:
+            return True, handler
+    return True, None
+
+
+def determine_handlers(names, pids, devices_by_pid, timeout=PROBE_TIMEOUT, mode="power"):
+    """Probes all handlers of the named components concurrently.
+
+    Returns as soon as the preferred available handler of every component is
+    known, or after timeout seconds.
+
+    Returns:
+        Dict mapping each component name to its handler or None if no handler
+        is available.
+    """
+    probes = {
+        name: [_probe_handler(h, pids=pids, devices_by_pid=devices_by_pid, mode=mode) for h in handlers_by_name(name)]
+        for name in names
+    }
+    deadline = time.monotonic() + timeout
+    handlers = {}
+
+    while True:
+        for name, name_probes in probes.items():
+            if name not in handlers:
+                resolved, handler = _preferred_handler(name_probes)
+                if resolved:
+                    handlers[name] = handler
+
+        pending = [probe for name in probes if name not in handlers for probe in probes[name] if not probe.done()]
+        remaining = deadline - time.monotonic()
+        if not pending or remaining <= 0:
+            break
+        futures.wait(pending, timeout=remaining, return_when=futures.FIRST_COMPLETED)
+
+    for name, name_probes in probes.items():
+        if name not in handlers:
+            handlers[name] = _preferred_handler(name_probes, timed_out=True)[1]
+        # Handlers may keep resources such as an NVML session open after
+        # probing, so release those of handlers that were not selected.
+        for probe in name_probes:
+            probe.add_done_callback(lambda p, selected=handlers[name]: _release_unselected(p, selected))
+    return handlers
+
+
+def _release_unselected(probe, selected):
+    if probe.cancelled() or probe.exception() is not None:
+        return
+    handler = probe.result()
+    if handler is not None and handler is not selected:
+        handler.shutdown()
+
+
+def _integrate(times, powers, points, energies=None, step=False):
+    """Returns the integral (J) of the power usage from times[0] to each point.
+
+    Power usage is interpolated linearly between samples and held constant
+    before the first and after the last sample, s.t. the integral between two
+    points is the trapezoidal rule clipped to exactly these points. If step,
+    the power usage of every sample is instead held constant since the
+    previous sample as for averaged readings (see SAMPLING_MODES). The
+    energies between consecutive samples default to the respective rule.
+    """
+    last = len(times) - 1
+    idx = np.clip(np.searchsorted(times, points, side="right") - 1, 0, last)
+    if step:
+        if energies is None:
+            energies = np.diff(times) * powers[1:]
+        held = powers[np.clip(np.searchsorted(times, points, side="left"), 0, last)]
+    else:
+        if energies is None:
+            energies = np.diff(times) * (powers[1:] + powers[:-1]) / 2
+        held = (powers[idx] + np.interp(points, times, powers)) / 2
+    cumulative = np.concatenate(([0.0], np.cumsum(energies)))
+    return cumulative[idx] + held * (points - times[idx])
 
 
 class Component:
-    def __init__(self, name, pids, devices_by_pid):
+    def __init__(
+        self, name, pids, devices_by_pid, handler=_PROBE, mode="power", retention=DEFAULT_RETENTION, streaming=False
+    ):
         self.name = name
         if name not in component_names():
             raise exceptions.ComponentNameError(f"No component found with name '{self.name}'.")
-        self._handler = self._determine_handler(pids=pids, devices_by_pid=devices_by_pid)
-        self.power_usages = []
+        if handler is _PROBE:
+            handler = self._determine_handler(pids=pids, devices_by_pid=devices_by_pid, mode=mode)
+        self._handler = handler
+        # Monotonic time (s) and power usages (W) per device of the latest
+        # `retention` samples. Not stored if streaming.
+        self.samples = None if streaming else RingBuffer(retention)
+        # Absolute index into samples of the first sample of every epoch.
+        self.epoch_starts = []
+        # Streaming statistics of the samples of every epoch.
+        self.epoch_stats = []
+        # Timestamp of the latest sample if streaming.
+        self._latest_sample_time = None
+        # Energy (kWh) of epochs that ended before the latest sample.
+        self._epoch_energies = []
+        # Durations (s) of all collections of power usages and of those since
+        # the latest take_collection_durations().
+        self.collection_durations = DurationStats()
+        self._recent_collection_durations = DurationStats()
         self.cur_epoch = -1  # Sentry
+        self._last_collection_time = None
+        self._error_epoch = None
 
     @property
     def handler(self):
@@ -50,13 +210,8 @@ class Component:
             raise error_by_name(self.name)
         return self._handler
 
-    def _determine_handler(self, pids, devices_by_pid):
-        handlers = handlers_by_name(self.name)
-        for h in handlers:
-            handler = h(pids=pids, devices_by_pid=devices_by_pid)
-            if handler.available():
-                return handler
-        return None
+    def _determine_handler(self, pids, devices_by_pid, mode="power"):
+        return determine_handlers([self.name], pids=pids, devices_by_pid=devices_by_pid, mode=mode)[self.name]
 
     def devices(self):
         return self.handler.devices()
@@ -64,57 +219,215 @@ class Component:
     def available(self):
         return self._handler is not None
 
+    @property
+    def averaged(self):
+        """Whether readings are average power usages since the previous
+        collection (see SAMPLING_MODES)."""
+        return self._handler is not None and self._handler.mode in ("counter", "samples")
+
+    @property
+    def streaming(self):
+        return self.samples is None
+
+    def epoch_samples(self, epoch):
+        """Returns the timestamps and power usages of the retained samples of
+        an epoch (starting from 1)."""
+        if self.streaming or not 1 <= epoch <= len(self.epoch_starts):
+            return np.empty(0), np.empty((0, 0))
+        stop = self.epoch_starts[epoch] if epoch < len(self.epoch_starts) else None
+        return self.samples.get(self.epoch_starts[epoch - 1], stop)
+
+    def epoch_statistics(self, epoch):
+        """Returns the EpochStats of an epoch (starting from 1) or None if the
+        epoch has no samples."""
+        if not 1 <= epoch <= len(self.epoch_stats) or not self.epoch_stats[epoch - 1].count:
+            return None
+        return self.epoch_stats[epoch - 1]
+
+    def average_power_usage(self, epoch):
+        """Returns the average power usage (W) per device of an epoch or None
+        if the epoch has no samples."""
+        stats = self.epoch_statistics(epoch)
+        return None if stats is None else stats.mean
+
+    def _begin_epoch(self, epoch):
+        # Epochs without any collection due to too slow update_interval get
+        # empty statistics and start (and end) at the same index.
+        while len(self.epoch_stats) < epoch:
+            self.epoch_stats.append(EpochStats(step=self.averaged))
+            if not self.streaming:
+                self.epoch_starts.append(self.samples.count)
+
+    def _add_sample(self, timestamp, power_usage):
+        """Adds a sample to the current (latest) epoch."""
+        self.epoch_stats[-1].add(timestamp, power_usage)
+        if self.streaming:
+            self._latest_sample_time = timestamp
+        else:
+            self.samples.append(timestamp, power_usage)
+
+    def latest_sample_time(self):
+        """Returns the monotonic time (s) of the latest sample or None."""
+        return self._latest_sample_time if self.streaming else self.samples.latest_time()
+
+    def begin_epoch(self, epoch):
+        """Begins an epoch with the latest collection as its baseline, e.g.,
+        the boundary sample of the previous epoch, s.t. the first collection
+        of the epoch is a sample instead of resetting the baseline."""
+        if epoch > self.cur_epoch and self._last_collection_time is not None:
+            self.cur_epoch = epoch
+            self._begin_epoch(epoch)
+
+    def take_collection_durations(self):
+        """Returns the DurationStats of the collections since the previous
+        call and starts over."""
+        durations, self._recent_collection_durations = self._recent_collection_durations, DurationStats()
+        return durations
+
     def collect_power_usage(self, epoch):
         if epoch < 1:
             return
 
-        if epoch != self.cur_epoch:
+        new_epoch = epoch != self.cur_epoch
+        if new_epoch:
             self.cur_epoch = epoch
-            # If we haven't measured for some epochs due to too slow
-            # update_interval, we copy previous epoch measurements s.t.
-            # there exists measurements for every epoch.
-            diff = self.cur_epoch - len(self.power_usages) - 1
-            if diff != 0:
-                for _ in range(diff):
-                    # Copy previous measurement lists.
-                    latest_measurements = self.power_usages[-1] if self.power_usages else []
-                    self.power_usages.append(latest_measurements)
-            self.power_usages.append([])
+            self._begin_epoch(epoch)
         try:
-            self.power_usages[-1].append(self.handler.power_usage())
+            start = time.monotonic()
+            power_usage = self.handler.power_usage()
+            end = time.monotonic()
+            self.collection_durations.add(end - start)
+            self._recent_collection_durations.add(end - start)
+            self._last_collection_time = end
+            if not self.averaged:
+                self._add_sample((start + end) / 2, power_usage)
+            elif not new_epoch:
+                # Timestamped with the end of the interval it averages s.t. it
+                # is held since the previous sample when integrated.
+                self._add_sample(end, power_usage)
+                power_range = self.handler.power_range() if self.handler.mode == "samples" else None
+                if power_range is not None:
+                    self.epoch_stats[-1].include_range(*power_range)
+            # Otherwise, the energy counted (or samples buffered) since the
+            # previous collection belong to the time between epochs, so the
+            # reading only resets the baseline.
         except exceptions.IntelRaplPermissionError:
-            # Only raise error if no measurements have been collected.
-            if not self.power_usages[-1]:
+            # Only raise error once per epoch without measurements.
+            if self._report_error(epoch):
                 print(
                     "No sudo access to read Intel's RAPL measurements from the energy_uj file."
                     "\nSee issue: https://github.com/lfwa/carbontracker/issues/40"
                 )
-            # Append zero measurement to avoid further errors.
-            self.power_usages.append([0])
         except exceptions.GPUPowerUsageRetrievalError:
-            if not self.power_usages[-1]:
+            if self._report_error(epoch):
                 print(
                     "GPU model does not support retrieval of power usages in NVML."
                     "\nSee issue: https://github.com/lfwa/carbontracker/issues/36"
                 )
-                # Append zero measurement to avoid further errors.
-                self.power_usages.append([0])
 
-    def energy_usage(self, epoch_times):
-        """Returns energy (mWh) used by component per epoch."""
+    def _report_error(self, epoch):
+        """Returns True if an error of a collection should be reported, i.e.,
+        the epoch has no measurements and no error was reported for it yet."""
+        if self._error_epoch == epoch or self.epoch_stats[epoch - 1].count:
+            return False
+        self._error_epoch = epoch
+        return True
+
+    def close_epochs(self, epoch_bounds):
+        """Stores the energy of every epoch that ended before the latest sample
+        s.t. it is kept after its samples leave the retention window.
+
+        Args:
+            epoch_bounds (list of (float, float)): Monotonic (start, end) time
+                of every ended epoch.
+        """
+        latest = self.latest_sample_time()
+        if latest is None:
+            return
+        closed = len(self._epoch_energies)
+        ended = closed
+        while ended < len(epoch_bounds) and epoch_bounds[ended][1] <= latest:
+            ended += 1
+        if ended > closed:
+            self._epoch_energies.extend(self._integrate_epochs(epoch_bounds[closed:ended], first=closed))
+
+    def _integrate_epochs(self, epoch_bounds, first=0):
+        """Returns the energy (kWh) within each of the monotonic (start, end)
+        bounds of the epochs starting from index first.
+
+        Note:
+            If streaming, the samples are integrated from the skeletons of the
+            epochs' statistics (see EpochStats.skeleton()) from the last epoch
+            with samples before to the first epoch with samples after them.
+        """
+        if self.streaming:
+            times, powers, energies = self._skeleton(first, first + len(epoch_bounds))
+        else:
+            times, power_usages = self.samples.get()
+            powers, energies = power_usages.sum(axis=1), None
+        bounds = np.array(epoch_bounds, dtype=float).reshape(-1, 2)
+        step = self.averaged
+        energy = _integrate(times, powers, bounds[:, 1], energies, step) - _integrate(
+            times, powers, bounds[:, 0], energies, step
+        )
+        # Convert from J to kWh.
+        return list(energy / 3600000)
+
+    def _skeleton(self, first, stop):
+        """Returns the times, total powers and energies between consecutive
+        times of the skeletons of the epochs with index in [first, stop) and
+        their closest neighbouring epochs with samples."""
+        before = first - 1
+        while before >= 0 and not self.epoch_stats[before].count:
+            before -= 1
+        after = stop
+        while after < len(self.epoch_stats) and not self.epoch_stats[after].count:
+            after += 1
+
+        times, powers, energies = [], [], []
+        for stats in self.epoch_stats[max(before, 0) : after + 1]:
+            if not stats.count:
+                continue
+            epoch_times, epoch_powers, epoch_energies = stats.skeleton()
+            if times:
+                # Energy between the last sample of the previous and the first
+                # sample of this epoch.
+                if self.averaged:
+                    gap_power = epoch_powers[0]
+                else:
+                    gap_power = (epoch_powers[0] + powers[-1][-1]) / 2
+                energies.append([(epoch_times[0] - times[-1][-1]) * gap_power])
+            times.append(epoch_times)
+            powers.append(epoch_powers)
+            energies.append(epoch_energies)
+        return np.concatenate(times), np.concatenate(powers), np.concatenate(energies)
+
+    def energy_usage(self, epoch_times, epoch_bounds=None):
+        """Returns energy (kWh) used by component per epoch.
+
+        If the monotonic (start, end) times of the epochs are given, the
+        timestamped samples are integrated with the trapezoidal rule over
+        exactly each epoch. Otherwise, the average power usage of each epoch is
+        multiplied by its duration.
+        """
+        integrate = epoch_bounds is not None and len(epoch_bounds) == len(epoch_times)
+        if integrate and self.latest_sample_time() is not None:
+            energy_usages = self._epoch_energies[: len(epoch_times)]
+            closed = len(energy_usages)
+            if closed < len(epoch_times):
+                energy_usages += self._integrate_epochs(epoch_bounds[closed:], first=closed)
+            return energy_usages
+
         energy_usages = []
-        # We have to compute each epoch in a for loop since numpy cannot
-        # handle lists of uneven length.
-        for idx, (power, time) in enumerate(zip(self.power_usages, epoch_times)):
+        epochs = len(self.epoch_stats)
+        for epoch, time in enumerate(epoch_times[:epochs], start=1):
             # If no power measurement exists, try to use measurements from
             # later epochs.
-            while not power and idx != len(self.power_usages) - 1:
-                idx += 1
-                power = self.power_usages[idx]
-            if not power:
-                power = [[0]]
-            avg_power_usage = np.mean(power, axis=0)
-            energy_usage = np.multiply(avg_power_usage, time).sum()
+            avg_power_usage = self.average_power_usage(epoch)
+            while avg_power_usage is None and epoch < epochs:
+                epoch += 1
+                avg_power_usage = self.average_power_usage(epoch)
+            energy_usage = 0 if avg_power_usage is None else np.multiply(avg_power_usage, time).sum()
             # Convert from J to kWh.
             if energy_usage != 0:
                 energy_usage /= 3600000
@@ -135,14 +448,44 @@ class Component:
         self.handler.init()
 
     def shutdown(self):
-        self.handler.shutdown()
+        # Unavailable components have nothing to release.
+        if self._handler is not None:
+            self._handler.shutdown()
+
+    def interrupt(self):
+        """Makes a blocking collection return early, see Handler.interrupt()."""
+        if self._handler is not None:
+            self._handler.interrupt()
 
 
-def create_components(components, pids, devices_by_pid):
+def parse_component_names(components):
+    """Returns the names of a comma-separated string of components or "all"."""
     components = components.strip().replace(" ", "").lower()
     if components == "all":
-        return [Component(name=comp_name, pids=pids, devices_by_pid=devices_by_pid) for comp_name in component_names()]
+        names = component_names()
     else:
-        return [
-            Component(name=comp_name, pids=pids, devices_by_pid=devices_by_pid) for comp_name in components.split(",")
-        ]
+        names = components.split(",")
+    for name in names:
+        if name not in component_names():
+            raise exceptions.ComponentNameError(f"No component found with name '{name}'.")
+    return names
+
+
+def create_components(
+    components, pids, devices_by_pid, sampling_mode="power", retention=DEFAULT_RETENTION, streaming=False
+):
+    names = parse_component_names(components)
+    # Probe handlers of all components concurrently instead of one by one.
+    handlers = determine_handlers(names, pids=pids, devices_by_pid=devices_by_pid, mode=sampling_mode)
+    return [
+        Component(
+            name=name,
+            pids=pids,
+            devices_by_pid=devices_by_pid,
+            handler=handlers[name],
+            mode=sampling_mode,
+            retention=retention,
+            streaming=streaming,
+        )
+        for name in names
+    ]
@@ -1,8 +1,10 @@
 import os
 import re
+import threading
 import time
 
 from carbontracker import exceptions
+from carbontracker.components import cache
 from carbontracker.components.handler import Handler
 
 # RAPL Literature:
@@ -12,12 +14,24 @@ RAPL_DIR = "/sys/class/powercap/"
 CPU = 0
 DRAM = 2
 MEASURE_DELAY = 1
+# Minimum duration (s) of an interrupted measurement s.t. the energy counters,
+# which are updated about every millisecond, advance.
+MIN_MEASURE_DELAY = 0.01
+# energy_uj holds at most a 20 digit integer and a newline.
+ENERGY_BUFFER_SIZE = 32
 
 
 class IntelCPU(Handler):
-    def __init__(self, pids, devices_by_pid):
-        super().__init__(pids, devices_by_pid)
+    SAMPLING_MODES = ("power", "counter")
+
+    def __init__(self, pids, devices_by_pid, mode="power"):
+        super().__init__(pids, devices_by_pid, mode=mode)
         self._handler = None
+        self._last_counters = None
+        self._last_time = None
+        self._energy_fds = None
+        self._buffer = bytearray(ENERGY_BUFFER_SIZE)
+        self._interrupted = threading.Event()
 
     def devices(self):
         """Returns the name of all RAPL Domains"""
@@ -27,64 +41,113 @@ class IntelCPU(Handler):
         return os.path.exists(RAPL_DIR) and bool(os.listdir(RAPL_DIR))
 
     def power_usage(self):
-        before_measures = self._get_measurements()
-        time.sleep(MEASURE_DELAY)
-        after_measures = self._get_measurements()
-        # Ensure all power measurements >= 0 and retry up to 3 times.
-        attempts = 3
-        while attempts > 0:
-            attempts -= 1
-            power_usages = [
-                self._compute_power(before, after) for before, after in zip(before_measures, after_measures)
-            ]
-            if all(power >= 0 for power in power_usages):
-                return power_usages
-        default = [0.0 for device in range(len(self._devices))]
-        return default
-
-    def _compute_power(self, before, after):
-        """Compute avg. power usage from two samples in microjoules."""
-        joules = (after - before) / 1000000
-        watt = joules / MEASURE_DELAY
-        return watt
+        if self.mode == "counter":
+            return self._counter_power_usage()
+
+        before_counters = self._get_counters()
+        start = time.monotonic()
+        duration = MEASURE_DELAY
+        if self._interrupted.wait(MEASURE_DELAY):
+            time.sleep(max(MIN_MEASURE_DELAY - (time.monotonic() - start), 0))
+            duration = time.monotonic() - start
+        after_counters = self._get_counters()
+        return self._compute_power_usages(before_counters, after_counters, duration)
+
+    def interrupt(self):
+        """Shortens the measurement in progress and all further ones to
+        MIN_MEASURE_DELAY until the next init()."""
+        self._interrupted.set()
+
+    def _counter_power_usage(self):
+        """Returns the average power usage since the previous call (or init())
+        from the cumulative energy counters without blocking."""
+        now = time.monotonic()
+        after_counters = self._get_counters()
+        before_counters, self._last_counters = self._last_counters, after_counters
+        duration, self._last_time = now - self._last_time, now
+        if before_counters is None or duration <= 0:
+            return [0.0 for device in range(len(self._devices))]
+        return self._compute_power_usages(before_counters, after_counters, duration)
+
+    def _compute_power_usages(self, before_counters, after_counters, duration):
+        """Returns the avg. power usage (W) of every device between two
+        readings of its domain counters or zeros if any is negative."""
+        power_usages = [
+            self._compute_power(self._energy_delta(before, after, max_energy_ranges) / 1000000, duration)
+            for before, after, max_energy_ranges in zip(before_counters, after_counters, self._max_energy_ranges)
+        ]
+        if all(power >= 0 for power in power_usages):
+            return power_usages
+        return [0.0 for device in range(len(self._devices))]
+
+    def _energy_delta(self, before, after, max_energy_ranges):
+        """Returns the energy (uJ) used between two readings of the domain
+        counters of a device.
+
+        Note:
+            A counter that wrapped around at its max_energy_range_uj is
+            corrected, assuming that it wrapped at most once between readings.
+        """
+        energy = 0
+        for before_uj, after_uj, max_energy_range in zip(before, after, max_energy_ranges):
+            delta = after_uj - before_uj
+            if delta < 0 and max_energy_range:
+                delta += max_energy_range
+            energy += delta
+        return energy
+
+    def _compute_power(self, joules, duration=MEASURE_DELAY):
+        """Compute avg. power usage (W) from the energy (J) used over the
+        duration (s)."""
+        return joules / duration
 
     def _read_energy(self, path):
         with open(os.path.join(path, "energy_uj"), "r") as f:
             return int(f.read())
 
-    def _get_measurements(self):
-        measurements = []
-        for package in self._rapl_devices:
+    def _pread_energy(self, fd):
+        """Reads an energy counter from an open energy_uj file into the
+        preallocated buffer."""
+        if hasattr(os, "preadv"):
+            size = os.preadv(fd, [self._buffer], 0)
+            return int(self._buffer[:size])
+        return int(os.pread(fd, ENERGY_BUFFER_SIZE, 0))
+
+    def _get_counters(self):
+        """Returns the energy counters (uJ) of all domains of every device."""
+        if self._energy_fds is not None:
+            return [[self._pread_energy(fd) for fd in fds] for fds in self._energy_fds]
+
+        counters = []
+        for domains in self._energy_domains:
             try:
-                power_usage = self._read_energy(os.path.join(RAPL_DIR, package))
-                measurements.append(power_usage)
+                counters.append([self._read_energy(domain) for domain in domains])
             # If there is no sudo access, we cannot read the energy_uj file.
             # Permission denied error is raised.
             except PermissionError:
                 raise exceptions.IntelRaplPermissionError()
 
-            except FileNotFoundError:
-                # check cpu/gpu/dram
-                parts = [f for f in os.listdir(os.path.join(RAPL_DIR, package)) if re.match(self.parts_pattern, f)]
-                total_power_usage = 0
-                for part in parts:
-                    total_power_usage += self._read_energy(os.path.join(RAPL_DIR, package, part))
-
-                measurements.append(total_power_usage)
-
-        return measurements
+        return counters
 
     def _convert_rapl_name(self, name, pattern):
         if re.match(pattern, name):
             return "cpu:" + name[-1]
 
-    def init(self):
+    def _read_max_energy_range(self, path):
+        try:
+            with open(os.path.join(path, "max_energy_range_uj"), "r") as f:
+                return int(f.read())
+        except (OSError, ValueError):
+            return None
+
+    def _discover(self):
+        """Walks the RAPL directory and returns the discovered topology."""
         # Get amount of intel-rapl folders
         packages = list(filter(lambda x: ":" in x, os.listdir(RAPL_DIR)))
-        self.device_count = len(packages)
-        self._devices = []
-        self._rapl_devices = []
-        self.parts_pattern = re.compile(r"intel-rapl:(\d):(\d)")
+        devices = []
+        energy_domains = []
+        max_energy_ranges = []
+        parts_pattern = re.compile(r"intel-rapl:(\d):(\d)")
         devices_pattern = re.compile("intel-rapl:.")
 
         for package in packages:
@@ -92,8 +155,69 @@ class IntelCPU(Handler):
                 with open(os.path.join(RAPL_DIR, package, "name"), "r") as f:
                     name = f.read().strip()
                 if name != "psys":
-                    self._rapl_devices.append(package)
-                    self._devices.append(self._convert_rapl_name(package, devices_pattern))
+                    devices.append(self._convert_rapl_name(package, devices_pattern))
+                    package_dir = os.path.join(RAPL_DIR, package)
+                    # Some packages do not expose energy_uj themselves, in
+                    # which case we sum their cpu/gpu/dram subdomains.
+                    if os.path.exists(os.path.join(package_dir, "energy_uj")):
+                        domains = [package_dir]
+                    else:
+                        parts = sorted(f for f in os.listdir(package_dir) if re.match(parts_pattern, f))
+                        domains = [os.path.join(package_dir, part) for part in parts]
+                    energy_domains.append(domains)
+                    max_energy_ranges.append([self._read_max_energy_range(domain) for domain in domains])
+
+        return {
+            "package_count": len(packages),
+            "devices": devices,
+            "energy_domains": energy_domains,
+            "max_energy_ranges": max_energy_ranges,
+        }
+
+    def init(self):
+        self._interrupted.clear()
+        cache_key = f"intel_rapl:{RAPL_DIR}"
+        topology = cache.load(cache_key)
+        if topology is None:
+            topology = self._discover()
+            cache.store(cache_key, topology)
+
+        self.device_count = topology["package_count"]
+        self._devices = topology["devices"]
+        self._energy_domains = topology["energy_domains"]
+        self._max_energy_ranges = topology["max_energy_ranges"]
+        self._open_energy_files()
+
+        if self.mode == "counter":
+            # Baseline for the first interval. Missing permissions are
+            # reported by the first power_usage() instead.
+            self._last_time = time.monotonic()
+            try:
+                self._last_counters = self._get_counters()
+            except exceptions.IntelRaplPermissionError:
+                self._last_counters = None
+
+    def _open_energy_files(self):
+        """Keeps all energy_uj files open s.t. samples need a single pread()
+        per domain. Falls back to opening the files for every read if any
+        cannot be opened, e.g. due to missing permissions."""
+        self._close_energy_files()
+        fds = []
+        try:
+            for domains in self._energy_domains:
+                fds.append([])
+                for domain in domains:
+                    fds[-1].append(os.open(os.path.join(domain, "energy_uj"), os.O_RDONLY))
+        except OSError:
+            for fd in (fd for device_fds in fds for fd in device_fds):
+                os.close(fd)
+            return
+        self._energy_fds = fds
+
+    def _close_energy_files(self):
+        fds, self._energy_fds = self._energy_fds, None
+        for fd in (fd for device_fds in fds or [] for fd in device_fds):
+            os.close(fd)
 
     def shutdown(self):
-        pass
+        self._close_energy_files()
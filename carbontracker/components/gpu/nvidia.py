@@ -6,8 +6,14 @@ and nvmlShutdown() after all queries are finished. For performance, it is
 recommended to run nvmlInit() and nvmlShutdown() as few times as possible, e.g.
 by running queries in batches (initializing and shutdown after each query can
 result in more than a 10x slowdown).
+
+NVML is therefore initialized through a reference-counted session shared by
+all handlers in the process. A handler keeps the session and device handles it
+opened while probing availability and reuses them in init().
 """
 import sys
+import threading
+import time
 
 import pynvml
 import os
@@ -16,63 +22,222 @@ from carbontracker import exceptions
 from carbontracker.components.handler import Handler
 
 
+_session_lock = threading.Lock()
+_session_refs = 0
+
+
+def _acquire_session():
+    """Initializes NVML unless a session is already open in the process."""
+    global _session_refs
+    with _session_lock:
+        if _session_refs == 0:
+            pynvml.nvmlInit()
+        _session_refs += 1
+
+
+def _release_session():
+    """Shuts down NVML once the last handler released the session."""
+    global _session_refs
+    with _session_lock:
+        if _session_refs == 0:
+            return
+        _session_refs -= 1
+        if _session_refs == 0:
+            pynvml.nvmlShutdown()
+
+
+# Fields of nvmlValue_t holding a sample for each nvmlValueType_t.
+_SAMPLE_VALUE_FIELDS = ["dVal", "uiVal", "ulVal", "ullVal", "sllVal"]
+
+
 class NvidiaGPU(Handler):
-    def __init__(self, pids, devices_by_pid):
-        super().__init__(pids, devices_by_pid)
+    SAMPLING_MODES = ("power", "counter", "samples")
+
+    def __init__(self, pids, devices_by_pid, mode="power"):
+        super().__init__(pids, devices_by_pid, mode=mode)
         self._handles = None
+        self._last_energies = None
+        self._last_time = None
+        self._last_sample_times = None
+        self._power_range = None
+        self._session = False
 
     def devices(self):
         """
         Note:
             Requires NVML to be initialized.
         """
-        names = [pynvml.nvmlDeviceGetName(handle) for handle in self._handles]
+        return [self._device_name(handle) for handle in self._handles]
+
+    def _device_name(self, handle):
+        name = pynvml.nvmlDeviceGetName(handle)
 
         # Decode names if Python version is less than 3.9
         if sys.version_info < (3,10):
-            names = [name.decode() for name in names]
+            name = name.decode()
 
-        return names
+        return name
 
     def available(self):
-        """Checks if NVML and any GPUs are available."""
+        """Checks if NVML and any GPUs are available.
+
+        Note:
+            If available, the NVML session and device handles are kept open
+            for init(). Call shutdown() to release them.
+        """
         try:
             self.init()
-            if len(self._handles) > 0:
-                available = True
-            else:
-                available = False
-            self.shutdown()
+            available = len(self._handles) > 0
         except pynvml.NVMLError:
             available = False
+        if not available:
+            try:
+                self.shutdown()
+            except pynvml.NVMLError:
+                pass
         return available
 
     def power_usage(self):
-        """Retrieves instantaneous power usages (W) of all GPUs in a list.
+        """Retrieves instantaneous power usages (W) of all GPUs in a list, or
+        in counter mode the average power usages since the previous call.
 
         Note:
             Requires NVML to be initialized.
         """
+        if self.mode == "counter":
+            return self._counter_power_usage()
+        if self.mode == "samples":
+            return self._samples_power_usage()
+
+        return [self._instantaneous_power_usage(handle) for handle in self._handles]
+
+    def _instantaneous_power_usage(self, handle):
+        try:
+            # Retrieves power usage in mW, divide by 1000 to get in W.
+            return pynvml.nvmlDeviceGetPowerUsage(handle) / 1000
+        except pynvml.NVMLError:
+            raise exceptions.GPUPowerUsageRetrievalError()
+
+    def _total_energy(self, handle):
+        """Returns the energy (mJ) used by the GPU since the driver was loaded
+        or None if the GPU has no energy counter (pre-Volta)."""
+        try:
+            return pynvml.nvmlDeviceGetTotalEnergyConsumption(handle)
+        except pynvml.NVMLError:
+            return None
+
+    def power_samples(self):
+        """Retrieves the power samples the driver buffered (at ~20 Hz) since
+        the previous call (or init()) for each GPU.
+
+        Returns:
+            List of [(timestamp (s), power usage (W)), ...] per GPU. The list
+            is empty for GPUs without new samples or sample buffer.
+
+        Note:
+            Requires NVML to be initialized in samples mode.
+        """
+        gpu_samples = []
+        for i, handle in enumerate(self._handles):
+            last_time = self._last_sample_times[i]
+            samples = []
+            if last_time is not None:
+                samples = self._buffered_samples(handle, last_time)
+                if samples is None:
+                    self._last_sample_times[i] = None
+                    samples = []
+                elif samples:
+                    self._last_sample_times[i] = samples[-1][0]
+            # Timestamps are given in us and values in mW.
+            gpu_samples.append([(timestamp / 1e6, value / 1000) for timestamp, value in samples])
+        return gpu_samples
+
+    def _buffered_samples(self, handle, last_time):
+        """Returns [(timestamp (us), power usage (mW)), ...] of samples newer
+        than last_time or None if the GPU has no sample buffer."""
+        try:
+            value_type, samples = pynvml.nvmlDeviceGetSamples(handle, pynvml.NVML_TOTAL_POWER_SAMPLES, last_time)
+        except pynvml.NVMLError as e:
+            if getattr(e, "value", None) == pynvml.NVML_ERROR_NOT_SUPPORTED:
+                return None
+            # E.g. NVML_ERROR_NOT_FOUND if there are no new samples.
+            return []
+        field = _SAMPLE_VALUE_FIELDS[value_type]
+        samples = [(sample.timeStamp, getattr(sample.sampleValue, field)) for sample in samples]
+        return sorted(sample for sample in samples if sample[0] > last_time)
+
+    def _samples_power_usage(self):
+        """Returns the average of the buffered power samples (W) since the
+        previous call for each GPU. GPUs without new samples or sample buffer
+        report their instantaneous power usage instead.
+
+        Note:
+            The individual samples are not passed on since the component
+            stores one sample per device and timestamp, whereas the driver
+            samples every GPU at its own times. Their min and max are kept for
+            power_range() s.t. short spikes are not averaged away.
+        """
+        power_usages, minima, maxima = [], [], []
+        for handle, samples in zip(self._handles, self.power_samples()):
+            powers = [power for _, power in samples] or [self._instantaneous_power_usage(handle)]
+            power_usages.append(sum(powers) / len(powers))
+            minima.append(min(powers))
+            maxima.append(max(powers))
+        self._power_range = (minima, maxima)
+        return power_usages
+
+    def power_range(self):
+        """Returns the min and max of the power samples (W) per GPU averaged
+        by the latest power_usage() in samples mode or None otherwise."""
+        return self._power_range if self.mode == "samples" else None
+
+    def _counter_power_usage(self):
+        """Returns the average power usages (W) since the previous call (or
+        init()) from the total energy counters of the GPUs. GPUs without
+        energy counter report their instantaneous power usage instead."""
+        now = time.monotonic()
+        duration, self._last_time = now - self._last_time, now
         gpu_power_usages = []
 
-        for handle in self._handles:
-            try:
-                # Retrieves power usage in mW, divide by 1000 to get in W.
-                power_usage = pynvml.nvmlDeviceGetPowerUsage(handle) / 1000
-                gpu_power_usages.append(power_usage)
-            except pynvml.NVMLError:
-                raise exceptions.GPUPowerUsageRetrievalError()
+        for i, handle in enumerate(self._handles):
+            before = self._last_energies[i]
+            after = self._total_energy(handle) if before is not None else None
+            self._last_energies[i] = after
+            if after is None:
+                gpu_power_usages.append(self._instantaneous_power_usage(handle))
+            elif duration <= 0:
+                gpu_power_usages.append(0.0)
+            else:
+                # Energy is given in mJ, divide by 1000 to get in J.
+                gpu_power_usages.append(max(after - before, 0) / 1000 / duration)
         return gpu_power_usages
 
     def init(self):
-        pynvml.nvmlInit()
+        """Opens the NVML session and retrieves device handles unless already
+        done by available()."""
+        if self._handles is not None:
+            return
+        if not self._session:
+            _acquire_session()
+            self._session = True
         if self.devices_by_pid:
             self._handles = self._get_handles_by_pid()
         else:
             self._handles = self._get_handles()
 
+        if self.mode == "counter":
+            # Baseline for the first interval.
+            self._last_time = time.monotonic()
+            self._last_energies = [self._total_energy(handle) for handle in self._handles]
+        elif self.mode == "samples":
+            # Skip samples buffered before tracking started.
+            self._last_sample_times = [0 for handle in self._handles]
+            self.power_samples()
+
     def shutdown(self):
-        pynvml.nvmlShutdown()
+        if self._session:
+            self._session = False
+            _release_session()
         self._handles = None
 
     def _get_handles(self):
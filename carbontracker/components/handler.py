@@ -4,9 +4,16 @@ from abc import ABCMeta, abstractmethod
 class Handler:
     __metaclass__ = ABCMeta
 
-    def __init__(self, pids, devices_by_pid):
+    # Sampling modes supported by the handler, see component.SAMPLING_MODES.
+    SAMPLING_MODES = ("power",)
+    mode = "power"
+
+    def __init__(self, pids, devices_by_pid, mode="power"):
         self.pids = pids
         self.devices_by_pid = devices_by_pid
+        # Handlers fall back to instantaneous power readings if they do not
+        # support the requested mode.
+        self.mode = mode if mode in self.SAMPLING_MODES else "power"
 
     @abstractmethod
     def devices(self):
@@ -20,9 +27,24 @@ class Handler:
 
     @abstractmethod
     def power_usage(self):
-        """Returns the current power usage (W) in a list."""
+        """Returns the current power usage (W) in a list.
+
+        Note:
+            In counter mode, the average power usage since the previous call
+            (or init()) is returned instead.
+        """
         raise NotImplementedError
 
+    def power_range(self):
+        """Returns the min and max power usages (W) per device of the
+        readings averaged by the latest power_usage() or None if unknown."""
+        return None
+
+    def interrupt(self):
+        """Makes a blocking power_usage() return early, e.g. when tracking
+        stops. Handlers whose calls do not block ignore it."""
+        pass
+
     @abstractmethod
     def init(self):
         """Initializes the handler."""
@@ -0,0 +1,154 @@
+"""Constant-memory streaming statistics of the power samples of an epoch and
+of the durations of collections."""
+import numpy as np
+
+# Number of samples kept per epoch to estimate quantiles.
+SKETCH_SIZE = 64
+
+
+class EpochStats:
+    """Streaming statistics of the power samples (W) of an epoch per device.
+
+    Keeps the running mean and variance (Welford's algorithm), min and max, a
+    uniform reservoir sample of at most SKETCH_SIZE samples to estimate
+    quantiles, and the trapezoidal integral of the total power between the
+    first and the last sample, s.t. memory does not grow with the number of
+    samples. If step, the integral instead holds the power of every sample
+    since the previous sample as for averaged readings.
+    """
+
+    def __init__(self, sketch_size=SKETCH_SIZE, seed=None, step=False):
+        self.count = 0
+        self.step = step
+        self.mean = None
+        self.min = None
+        self.max = None
+        # Monotonic time (s) and total power (W) of the first, second to last
+        # and last sample.
+        self.first = None
+        self.penultimate = None
+        self.last = None
+        # Energy (J) between the first and the last sample.
+        self.energy = 0.0
+        self._m2 = None
+        self._sketch = None
+        self._sketch_size = sketch_size
+        self._rng = np.random.default_rng(seed)
+
+    @classmethod
+    def from_samples(cls, times, power_usages, sketch_size=SKETCH_SIZE, seed=None, step=False):
+        """Returns the statistics of arrays of timestamps (n,) and power
+        usages (n, devices) computed at once."""
+        stats = cls(sketch_size=sketch_size, seed=seed, step=step)
+        count = len(times)
+        if not count:
+            return stats
+        power_usages = np.asarray(power_usages, dtype=float).reshape(count, -1)
+        stats.count = count
+        stats.mean = power_usages.mean(axis=0)
+        stats.min = power_usages.min(axis=0)
+        stats.max = power_usages.max(axis=0)
+        stats._m2 = power_usages.var(axis=0) * count
+        stats._sketch = np.empty((sketch_size, power_usages.shape[1]))
+        sketch = stats._rng.choice(count, size=min(count, sketch_size), replace=False)
+        stats._sketch[: len(sketch)] = power_usages[sketch]
+
+        totals = power_usages.sum(axis=1)
+        stats.energy = float(np.sum(stats._energies(np.asarray(times, dtype=float), totals)))
+        stats.first = (float(times[0]), float(totals[0]))
+        stats.penultimate = (float(times[-2]), float(totals[-2])) if count > 1 else None
+        stats.last = (float(times[-1]), float(totals[-1]))
+        return stats
+
+    def add(self, timestamp, power_usages):
+        power_usages = np.asarray(power_usages, dtype=float).reshape(-1)
+        self.count += 1
+        if self.count == 1:
+            self.mean = power_usages.copy()
+            self.min = power_usages.copy()
+            self.max = power_usages.copy()
+            self._m2 = np.zeros_like(power_usages)
+            self._sketch = np.empty((self._sketch_size, power_usages.size))
+        else:
+            delta = power_usages - self.mean
+            self.mean += delta / self.count
+            self._m2 += delta * (power_usages - self.mean)
+            np.minimum(self.min, power_usages, out=self.min)
+            np.maximum(self.max, power_usages, out=self.max)
+
+        # Reservoir sampling s.t. every sample is kept with equal probability.
+        if self.count <= self._sketch_size:
+            self._sketch[self.count - 1] = power_usages
+        else:
+            i = self._rng.integers(self.count)
+            if i < self._sketch_size:
+                self._sketch[i] = power_usages
+
+        total = float(power_usages.sum())
+        if self.last is None:
+            self.first = (timestamp, total)
+        else:
+            held = total if self.step else (total + self.last[1]) / 2
+            self.energy += (timestamp - self.last[0]) * held
+        self.penultimate, self.last = self.last, (timestamp, total)
+
+    def include_range(self, minimum, maximum):
+        """Widens the min and max per device of the latest sample to the
+        readings it averages. Requires at least one sample."""
+        np.minimum(self.min, np.asarray(minimum, dtype=float).reshape(-1), out=self.min)
+        np.maximum(self.max, np.asarray(maximum, dtype=float).reshape(-1), out=self.max)
+
+    @property
+    def variance(self):
+        """Population variance per device or None without samples."""
+        return self._m2 / self.count if self.count else None
+
+    @property
+    def std(self):
+        """Population standard deviation per device or None without samples."""
+        return np.sqrt(self.variance) if self.count else None
+
+    def quantiles(self, q):
+        """Returns the estimated q-quantiles per device (rows by q) or None
+        without samples."""
+        if not self.count:
+            return None
+        return np.quantile(self._sketch[: min(self.count, self._sketch_size)], q, axis=0)
+
+    def skeleton(self):
+        """Returns the times, total powers and energies between consecutive
+        times of the first, second to last and last sample s.t. integrating
+        them yields the energy of all samples."""
+        # With fewer than three samples, the first sample is the second to last
+        # or the last one.
+        points = (self.first, self.penultimate, self.last)[-min(self.count, 3) :] if self.count else ()
+        times = np.array([t for t, _ in points], dtype=float)
+        powers = np.array([p for _, p in points], dtype=float)
+        energies = self._energies(times, powers)
+        if self.count > 3:
+            # The samples between the first and the second to last sample are
+            # only known by their energy.
+            energies[0] = self.energy - energies[1]
+        return times, powers, energies
+
+    def _energies(self, times, powers):
+        """Returns the energies (J) between consecutive samples."""
+        if self.step:
+            return np.diff(times) * powers[1:]
+        return np.diff(times) * (powers[1:] + powers[:-1]) / 2
+
+
+class DurationStats:
+    """Number, total, max and last of a series of durations (s)."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = None
+
+    def add(self, duration):
+        self.count += 1
+        self.total += duration
+        self.max = max(self.max, duration)
+        self.last = duration
@@ -1,17 +1,51 @@
-import pandas as pd
+import csv
 import os
 
+import numpy as np
+
 here = os.path.abspath(os.path.dirname(__file__))
 conversion_file = os.path.join(here, "co2eq.csv")
-CONVERSION_DF = pd.read_csv(conversion_file)
+
+# Loaded on first conversion by _conversion_table().
+_conversion_table_cache = None
+
+
+def _conversion_table():
+    """Returns the latest conversion factors as NumPy arrays (gCO2eq per unit,
+    unit names, lower bounds and upper bounds)."""
+    global _conversion_table_cache
+    if _conversion_table_cache is None:
+        with open(conversion_file, "r", newline="") as f:
+            rows = list(csv.DictReader(f))
+        rows = rows[-1:]  # Use latest conversion factors
+        _conversion_table_cache = (
+            np.array([float(row["gCO2eq_per_unit"]) for row in rows]),
+            [row["unit"] for row in rows],
+            np.array([float(row["lowerbound"]) for row in rows]),
+            np.array([float(row["upperbound"]) for row in rows]),
+        )
+    return _conversion_table_cache
 
 
 def convert(g_co2eq):
     """Converts gCO2eq to all units in range specified by CONVERSION_FILE."""
-    conversions = []
-    df = CONVERSION_DF.iloc[-1:]  # Use latest conversion factors
-    converters = df.loc[(df["lowerbound"] <= g_co2eq) & (df["upperbound"] >= g_co2eq)]
-    for _, converter in converters.iterrows():
-        units = g_co2eq / converter["gCO2eq_per_unit"]
-        conversions.append((units, converter["unit"]))
-    return conversions
+    gco2eq_per_unit, units, lowerbounds, upperbounds = _conversion_table()
+    in_range = (lowerbounds <= g_co2eq) & (upperbounds >= g_co2eq)
+    return [(g_co2eq / gco2eq_per_unit[i], units[i]) for i in np.flatnonzero(in_range)]
+
+
+def convert_many(g_co2eq):
+    """Converts an array of gCO2eq to all units specified by CONVERSION_FILE.
+
+    Args:
+        g_co2eq (array_like): Values in gCO2eq.
+
+    Returns:
+        Dict mapping each unit to an array with the converted values. Values
+        outside of the range of a converter are NaN.
+    """
+    gco2eq_per_unit, units, lowerbounds, upperbounds = _conversion_table()
+    g_co2eq = np.asarray(g_co2eq, dtype=float)[..., np.newaxis]
+    in_range = (lowerbounds <= g_co2eq) & (upperbounds >= g_co2eq)
+    conversions = np.where(in_range, g_co2eq / gco2eq_per_unit, np.nan)
+    return {unit: conversions[..., i] for i, unit in enumerate(units)}
@@ -0,0 +1,196 @@
+"""Average carbon intensity of electricity by ISO 3166-1 alpha-2 country code.
+
+Generated by scripts/create_carbon_intensity_csv.py from
+carbontracker/data/carbon-intensities.csv. Do not edit manually.
+"""
+
+# alpha-2: (year, carbon intensity in gCO2/kWh)
+CARBON_INTENSITIES = {
+    "AE": (2020, 427.86282),
+    "AF": (2020, 115.38463),
+    "AG": (2020, 687.5),
+    "AL": (2020, 24.482107),
+    "AM": (2021, 206.94258),
+    "AO": (2020, 168.86728),
+    "AR": (2021, 347.29196),
+    "AS": (2020, 733.3333),
+    "AT": (2021, 81.25418),
+    "AU": (2021, 486.25497),
+    "AW": (2020, 579.5454),
+    "AZ": (2021, 481.51907),
+    "BA": (2021, 478.45804),
+    "BB": (2020, 670.103),
+    "BD": (2021, 446.66843),
+    "BE": (2021, 139.7274),
+    "BF": (2020, 631.25),
+    "BG": (2021, 419.39273),
+    "BH": (2020, 489.95312),
+    "BI": (2021, 312.5),
+    "BJ": (2020, 652.17395),
+    "BR": (2021, 141.77426),
+    "BS": (2020, 698.49243),
+    "BT": (2020, 23.463686),
+    "BW": (2020, 800.0),
+    "BY": (2021, 443.62558),
+    "BZ": (2020, 474.57626),
+    "CA": (2021, 118.99668),
+    "CF": (2020, 0.0),
+    "CG": (2020, 364.14563),
+    "CH": (2021, 57.772644),
+    "CK": (2020, 500.0),
+    "CL": (2021, 374.46323),
+    "CM": (2020, 243.7071),
+    "CN": (2021, 541.3317),
+    "CO": (2020, 192.62947),
+    "CR": (2021, 30.903326),
+    "CU": (2020, 575.9049),
+    "CY": (2021, 587.49805),
+    "CZ": (2021, 412.24548),
+    "DE": (2021, 352.42252),
+    "DJ": (2020, 800.0),
+    "DK": (2021, 149.74605),
+    "DM": (2020, 500.0),
+    "DO": (2020, 605.7243),
+    "DZ": (2020, 449.74878),
+    "EC": (2021, 137.54825),
+    "EE": (2021, 739.8695),
+    "EG": (2021, 389.0191),
+    "EH": (2009, 666.6666),
+    "ER": (2020, 659.0909),
+    "ES": (2021, 169.03445),
+    "ET": (2020, 25.441698),
+    "FI": (2021, 68.833595),
+    "FJ": (2020, 292.92926),
+    "FR": (2021, 58.4792),
+    "GA": (2020, 294.91525),
+    "GB": (2021, 264.5091),
+    "GD": (2020, 700.0),
+    "GE": (2021, 111.374405),
+    "GF": (2020, 350.51547),
+    "GH": (2020, 355.04724),
+    "GL": (2020, 118.644066),
+    "GM": (2020, 689.65515),
+    "GN": (2020, 175.0),
+    "GP": (2020, 588.6076),
+    "GQ": (2020, 628.31854),
+    "GR": (2021, 430.25867),
+    "GT": (2020, 332.0158),
+    "GU": (2020, 670.58826),
+    "GW": (2020, 750.0),
+    "GY": (2020, 636.3636),
+    "HK": (2020, 644.89954),
+    "HN": (2020, 358.64594),
+    "HR": (2021, 131.26709),
+    "HT": (2020, 606.383),
+    "HU": (2021, 195.50255),
+    "ID": (2020, 624.6789),
+    "IE": (2021, 381.08688),
+    "IL": (2020, 527.77277),
+    "IN": (2021, 626.0071),
+    "IQ": (2020, 419.7325),
+    "IS": (2020, 28.75471),
+    "IT": (2021, 222.8387),
+    "JM": (2020, 532.3383),
+    "JO": (2020, 432.20337),
+    "JP": (2021, 416.4962),
+    "KE": (2021, 112.37928),
+    "KG": (2020, 91.52752),
+    "KH": (2020, 423.52942),
+    "KI": (2020, 666.6667),
+    "KM": (2020, 692.3078),
+    "KN": (2020, 666.6667),
+    "KW": (2020, 438.1219),
+    "KY": (2020, 681.1594),
+    "KZ": (2021, 654.9424),
+    "LB": (2020, 544.89166),
+    "LC": (2020, 696.9697),
+    "LK": (2020, 439.22418),
+    "LR": (2020, 292.13483),
+    "LS": (2020, 20.0),
+    "LT": (2021, 209.03082),
+    "LU": (2021, 0.0),
+    "LV": (2021, 171.61119),
+    "LY": (2020, 496.51044),
+    "MA": (2020, 571.06445),
+    "ME": (2021, 350.6849),
+    "MG": (2020, 452.8302),
+    "MK": (2021, 349.11407),
+    "ML": (2020, 465.625),
+    "MM": (2020, 311.10156),
+    "MN": (2021, 725.97406),
+    "MO": (2020, 482.14288),
+    "MQ": (2020, 653.5948),
+    "MR": (2020, 522.7273),
+    "MS": (2020, 1000.0),
+    "MT": (2021, 406.50406),
+    "MU": (2020, 613.1387),
+    "MV": (2020, 701.7544),
+    "MW": (2020, 113.20756),
+    "MX": (2021, 373.80746),
+    "MY": (2021, 541.00055),
+    "MZ": (2020, 129.77527),
+    "NA": (2020, 56.603775),
+    "NC": (2020, 640.0),
+    "NE": (2020, 675.00006),
+    "NG": (2020, 395.2415),
+    "NI": (2020, 343.34766),
+    "NL": (2021, 328.90408),
+    "NO": (2021, 25.080723),
+    "NP": (2020, 22.653723),
+    "NR": (2020, 750.0),
+    "NZ": (2021, 135.98497),
+    "OM": (2020, 440.53098),
+    "PA": (2020, 183.39417),
+    "PE": (2021, 233.97925),
+    "PF": (2020, 469.69696),
+    "PG": (2020, 563.6793),
+    "PH": (2021, 544.3023),
+    "PK": (2021, 295.77448),
+    "PL": (2021, 727.7765),
+    "PM": (2020, 800.0),
+    "PR": (2020, 664.7727),
+    "PT": (2021, 181.10257),
+    "PY": (2020, 23.915686),
+    "QA": (2020, 442.76172),
+    "RO": (2021, 252.84236),
+    "RS": (2021, 545.552),
+    "RW": (2020, 289.15662),
+    "SA": (2021, 568.50006),
+    "SB": (2020, 700.0),
+    "SC": (2020, 698.1133),
+    "SD": (2020, 259.31232),
+    "SE": (2021, 11.770537),
+    "SG": (2021, 463.89664),
+    "SI": (2021, 250.87906),
+    "SK": (2021, 100.85782),
+    "SL": (2020, 47.61905),
+    "SN": (2021, 534.4203),
+    "SO": (2020, 648.6486),
+    "SR": (2020, 298.7013),
+    "SS": (2020, 698.1133),
+    "ST": (2020, 600.0),
+    "SV": (2021, 245.827),
+    "SZ": (2020, 203.12498),
+    "TC": (2020, 720.00006),
+    "TD": (2020, 678.5714),
+    "TG": (2020, 576.92316),
+    "TH": (2021, 503.15494),
+    "TJ": (2021, 83.28969),
+    "TM": (2020, 412.32855),
+    "TN": (2021, 470.38147),
+    "TO": (2020, 666.6667),
+    "TR": (2021, 429.6388),
+    "TT": (2020, 497.9688),
+    "UA": (2021, 240.50241),
+    "UG": (2020, 77.0878),
+    "US": (2021, 357.2021),
+    "UY": (2021, 152.38716),
+    "UZ": (2020, 426.88644),
+    "VC": (2020, 533.3333),
+    "VU": (2020, 571.4286),
+    "WS": (2020, 500.0),
+    "YE": (2020, 538.46155),
+    "ZA": (2021, 664.73755),
+    "ZM": (2020, 120.77597),
+    "ZW": (2020, 279.0279),
+}
@@ -1,12 +1,14 @@
-import requests
 import datetime
 
 import numpy as np
 
 from carbontracker import exceptions
+from carbontracker import lazyutil
 from carbontracker.emissions.intensity.fetcher import IntensityFetcher
 from carbontracker.emissions.intensity import intensity
 
+requests = lazyutil.lazy_import("requests")
+
 API_URL = "https://api.carbonintensity.org.uk"
 
 
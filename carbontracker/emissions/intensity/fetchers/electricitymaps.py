@@ -1,9 +1,10 @@
-import requests
-
 from carbontracker import exceptions
+from carbontracker import lazyutil
 from carbontracker.emissions.intensity.fetcher import IntensityFetcher
 from carbontracker.emissions.intensity import intensity
 
+requests = lazyutil.lazy_import("requests")
+
 API_URL = "https://api-access.electricitymaps.com/free-tier/carbon-intensity/latest"
 
 
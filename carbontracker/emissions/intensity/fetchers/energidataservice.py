@@ -1,12 +1,14 @@
 import datetime
 
-import requests
 import numpy as np
 
 from carbontracker import exceptions
+from carbontracker import lazyutil
 from carbontracker.emissions.intensity.fetcher import IntensityFetcher
 from carbontracker.emissions.intensity import intensity
 
+requests = lazyutil.lazy_import("requests")
+
 
 class EnergiDataService(IntensityFetcher):
     def suitable(self, g_location):
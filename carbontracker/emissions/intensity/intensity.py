@@ -1,22 +1,35 @@
 import os.path
+import threading
+import time
 import traceback
 
-import geocoder
 import numpy as np
-import pandas as pd
-import sys
 
 from carbontracker import loggerutil
 from carbontracker import exceptions
 from carbontracker import constants
-from carbontracker.emissions.intensity.fetchers import carbonintensitygb
-from carbontracker.emissions.intensity.fetchers import energidataservice
-from carbontracker.emissions.intensity.fetchers import electricitymaps
+from carbontracker import lazyutil
+from carbontracker.emissions.intensity import carbon_intensities
 
-def get_default_intensity():
-    """Retrieve static default carbon intensity value based on location."""
+geocoder = lazyutil.lazy_import("geocoder")
+carbonintensitygb = lazyutil.lazy_import("carbontracker.emissions.intensity.fetchers.carbonintensitygb")
+energidataservice = lazyutil.lazy_import("carbontracker.emissions.intensity.fetchers.energidataservice")
+electricitymaps = lazyutil.lazy_import("carbontracker.emissions.intensity.fetchers.electricitymaps")
+
+def get_default_intensity(durations=None):
+    """Retrieve static default carbon intensity value based on location.
+
+    Args:
+        durations (dict): If given, the wall time (s) of locating the IP
+            address is appended to it under "geocoder".
+    """
     try:
-        g_location = geocoder.ip("me")
+        start = time.monotonic()
+        try:
+            g_location = geocoder.ip("me")
+        finally:
+            if durations is not None:
+                durations.setdefault("geocoder", []).append(time.monotonic() - start)
         if not g_location.ok:
             raise exceptions.IPLocationError("Failed to retrieve location based on IP.")
         address = g_location.address
@@ -26,17 +39,7 @@ def get_default_intensity():
         country = "Unknown"
 
     try:
-        # importlib.resources.files was introduced in Python 3.9
-        if sys.version_info < (3,9):
-            import pkg_resources
-            path = pkg_resources.resource_filename("carbontracker", "data/carbon-intensities.csv")
-        else:
-            import importlib.resources
-            path = importlib.resources.files("carbontracker").joinpath("data", "carbon-intensities.csv")
-        carbon_intensities_df = pd.read_csv(str(path))
-        intensity_row = carbon_intensities_df[carbon_intensities_df["alpha-2"] == country].iloc[0]
-        intensity = intensity_row["Carbon intensity of electricity (gCO2/kWh)"]
-        year = intensity_row["Year"]
+        year, intensity = carbon_intensities.CARBON_INTENSITIES[country]
         description = f"Defaulted to average carbon intensity for {country} in {year} of {intensity:.2f} gCO2/kWh."
     except Exception as err:
         intensity = constants.WORLD_2019_CARBON_INTENSITY
@@ -50,7 +53,30 @@ def get_default_intensity():
     return default_intensity
 
 
-default_intensity = get_default_intensity()
+# Resolved lazily by resolve_default_intensity() since it requires an IP
+# geolocation request which may block for a long time without network access.
+default_intensity = None
+_default_intensity_lock = threading.Lock()
+
+
+def resolve_default_intensity(durations=None):
+    """Returns the memoized default carbon intensity, resolving it on first use.
+
+    Args:
+        durations (dict): Passed to get_default_intensity() if it is called.
+
+    Note:
+        The first call performs the geolocation request of
+        get_default_intensity(). It is made from CarbonIntensityThread during
+        normal operation s.t. the training thread never blocks on the network.
+    """
+    global default_intensity
+    if default_intensity is None:
+        with _default_intensity_lock:
+            if default_intensity is None:
+                default_intensity = get_default_intensity(durations)
+    return default_intensity
+
 
 class CarbonIntensity:
     def __init__(
@@ -77,23 +103,36 @@ class CarbonIntensity:
         self.set_default_message()
 
     def set_default_intensity(self):
-        self.carbon_intensity = default_intensity["carbon_intensity"]
+        self.carbon_intensity = resolve_default_intensity()["carbon_intensity"]
 
     def set_default_message(self):
-        self.message = default_intensity["description"]
+        self.message = resolve_default_intensity()["description"]
+
 
+def carbon_intensity(logger, time_dur=None, durations=None):
+    """Returns the CarbonIntensity at the location of the IP address.
 
-def carbon_intensity(logger, time_dur=None):
+    Args:
+        durations (dict): If given, the wall time (s) of locating the IP
+            address and of every fetcher called is appended to it by name.
+    """
+    durations = {} if durations is None else durations
     fetchers = [
         electricitymaps.ElectricityMap(),
         energidataservice.EnergiDataService(),
         carbonintensitygb.CarbonIntensityGB(),
     ]
 
+    # Resolved first s.t. its geolocation request is timed as well.
+    resolve_default_intensity(durations)
     carbon_intensity = CarbonIntensity(default=True)
 
     try:
-        g_location = geocoder.ip("me")
+        start = time.monotonic()
+        try:
+            g_location = geocoder.ip("me")
+        finally:
+            durations.setdefault("geocoder", []).append(time.monotonic() - start)
         if not g_location.ok:
             raise exceptions.IPLocationError("Failed to retrieve location based on IP.")
         carbon_intensity.address = g_location.address
@@ -106,7 +145,11 @@ def carbon_intensity(logger, time_dur=None):
         if not fetcher.suitable(g_location):
             continue
         try:
-            carbon_intensity = fetcher.carbon_intensity(g_location, time_dur)
+            start = time.monotonic()
+            try:
+                carbon_intensity = fetcher.carbon_intensity(g_location, time_dur)
+            finally:
+                durations.setdefault(type(fetcher).__name__, []).append(time.monotonic() - start)
             if not np.isnan(carbon_intensity.carbon_intensity):
                 carbon_intensity.success = True
                 set_carbon_intensity_message(carbon_intensity, time_dur)
@@ -118,7 +161,7 @@ def carbon_intensity(logger, time_dur=None):
     if not carbon_intensity.success:
         logger.err_warn(
             "Failed to retrieve carbon intensity: Defaulting to average carbon intensity {} gCO2/kWh.".format(
-                default_intensity["carbon_intensity"]
+                resolve_default_intensity()["carbon_intensity"]
             )
         )
     return carbon_intensity
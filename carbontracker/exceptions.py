@@ -58,3 +58,9 @@ class FetcherNameError(Exception):
 
 class MismatchedLogFilesError(Exception):
     pass
+
+
+class SamplerProcessError(Exception):
+    """Raised when the sampler process fails."""
+
+    pass
@@ -0,0 +1,78 @@
+import importlib
+import importlib.util
+import sys
+import threading
+import types
+
+# Serializes execution of lazy modules. Reentrant s.t. a module being executed
+# may access itself or other lazy modules.
+_load_lock = threading.RLock()
+
+
+class _LazyModule(types.ModuleType):
+    """Module whose code is executed on first attribute access.
+
+    Unlike importlib.util.LazyLoader (before Python 3.12.3), execution is
+    guarded by a lock, s.t. a thread never observes a partially executed module
+    while another thread is loading it.
+    """
+
+    def __getattribute__(self, attr):
+        _load(self)
+        return types.ModuleType.__getattribute__(self, attr)
+
+    def __delattr__(self, attr):
+        _load(self)
+        types.ModuleType.__delattr__(self, attr)
+
+
+def _load(module):
+    with _load_lock:
+        if type(module) is not _LazyModule:
+            return
+        namespace = types.ModuleType.__getattribute__(module, "__dict__")
+        if namespace.get("__lazy_loading__"):
+            # Attribute access by the module's own code while executing.
+            return
+        namespace["__lazy_loading__"] = True
+        try:
+            spec = namespace["__spec__"]
+            spec.loader.exec_module(module)
+            module.__class__ = types.ModuleType
+        finally:
+            namespace.pop("__lazy_loading__", None)
+
+
+def lazy_import(name):
+    """Returns module `name` without executing it until first attribute access.
+
+    The module is registered in sys.modules (and on its parent package) like a
+    regular import, s.t. later imports and unittest.mock.patch() targets refer
+    to the same module object.
+
+    Raises:
+        ModuleNotFoundError: If the module cannot be found.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+    if not hasattr(spec.loader, "exec_module"):
+        return importlib.import_module(name)
+    module = importlib.util.module_from_spec(spec)
+    module.__class__ = _LazyModule
+    sys.modules[name] = module
+
+    parent, _, child = name.rpartition(".")
+    if parent:
+        setattr(sys.modules[parent], child, module)
+    return module
+
+
+def import_object(path):
+    """Imports and returns the object given by its dotted path, e.g.
+    "carbontracker.components.cpu.intel.IntelCPU"."""
+    module_name, _, attr = path.rpartition(".")
+    return getattr(importlib.import_module(module_name), attr)
@@ -0,0 +1,408 @@
+"""Sampling of the components in a separate process.
+
+The sampler process runs the sampling loop of CarbonTrackerThread and writes
+the samples of every component into a RingBuffer in shared memory, which the
+tracking process reads without copying. Thereby, sampling does not compete
+with training for the GIL and a hanging handler cannot stall training.
+
+The tracking process launches the sampler with `python -m carbontracker.sampler
+<config>` and commands it with JSON lines through stdin:
+
+- ["attach", [shared memory name per component], capacity]
+- ["epoch_start"], ["epoch_end"]
+- ["intervals", update_interval, sampling_intervals]
+- ["stop"]
+
+The sampler replies JSON lines through stdout: first either
+{"components": [[name, devices], ...]} or {"error": traceback}, then
+{"epoch": epoch, "overhead": [cpu_time, handler_calls]} for every ended epoch
+once its boundary is sampled, with the overhead of the sampler since the
+previous epoch.
+"""
+import json
+import os
+import subprocess
+import sys
+import time
+import traceback
+from multiprocessing import resource_tracker, shared_memory
+from threading import Lock
+
+import numpy as np
+
+from carbontracker import exceptions
+from carbontracker import loggerutil
+from carbontracker import tracker
+from carbontracker.components import component
+from carbontracker.components.buffer import RingBuffer
+from carbontracker.components.stats import EpochStats
+
+# Time (s) the sampler process is given to stop before it is killed.
+STOP_TIMEOUT = 5
+
+
+class _RemoteHandler:
+    """Handler of a component sampled by the sampler process in the sampling
+    mode of its handler there."""
+
+    def __init__(self, devices, mode="power"):
+        self._devices = devices
+        self.mode = mode
+
+    def devices(self):
+        return self._devices
+
+    def init(self):
+        pass
+
+    def shutdown(self):
+        pass
+
+    def interrupt(self):
+        pass
+
+
+class SamplerProcess(tracker.CarbonTrackerThread):
+    """Thread managing a sampler process, which samples the components into
+    shared memory.
+
+    Note:
+        Timestamps of the samples are compared to the epochs' bounds, which
+        relies on time.monotonic() being system-wide.
+    """
+
+    def __init__(
+        self,
+        components,
+        pids,
+        devices_by_pid,
+        logger,
+        ignore_errors,
+        delete,
+        update_interval=10,
+        sampling_intervals=None,
+        sampling_mode="power",
+        retention=component.DEFAULT_RETENTION,
+        adaptive_sampling=None,
+    ):
+        self._process = None
+        self._process_lock = Lock()
+        # Components are created once the sampler process has found them.
+        super(SamplerProcess, self).__init__(
+            components=[],
+            logger=logger,
+            ignore_errors=ignore_errors,
+            delete=delete,
+            update_interval=update_interval,
+            sampling_intervals=sampling_intervals,
+            adaptive_sampling=adaptive_sampling,
+        )
+        self.retention = retention
+        self._config = {
+            "components": components,
+            "pids": pids,
+            "devices_by_pid": devices_by_pid,
+            "sampling_mode": sampling_mode,
+            "update_interval": update_interval,
+            "sampling_intervals": self.sampling_intervals,
+            "adaptive_sampling": adaptive_sampling,
+        }
+        self._shared_memory = []
+        # Overhead of the sampler process reported with the latest epoch and
+        # summed over all epochs.
+        self._sampler_overhead = (0.0, {})
+        self._sampler_cpu_time = 0.0
+        self._sampler_handler_calls = {}
+
+    def start(self):
+        """Launches the sampler process and starts the thread managing it."""
+        env = dict(os.environ)
+        # The sampler imports carbontracker (and the handlers' dependencies)
+        # from where this process does, in the same order s.t. e.g.
+        # site-packages does not shadow the standard library.
+        env["PYTHONPATH"] = os.pathsep.join(os.path.abspath(path) for path in sys.path)
+        self._process = subprocess.Popen(
+            [sys.executable, "-m", "carbontracker.sampler", json.dumps(self._config)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            env=env,
+            text=True,
+        )
+        super(SamplerProcess, self).start()
+
+    def run(self):
+        try:
+            self._attach(self._receive())
+            self._log_components_info()
+            self.logger.info("Monitoring thread started.")
+            # Ended epochs are reported until the sampler process exits.
+            for line in iter(self._process.stdout.readline, ""):
+                message = json.loads(line)
+                # Store the energy of ended epochs before the sampler process
+                # overwrites their samples.
+                for comp in self.components:
+                    comp.close_epochs(self.epoch_bounds)
+                self._sampler_overhead = message["overhead"]
+                self._log_epoch_measurements(message["epoch"])
+            if self.running:
+                raise exceptions.SamplerProcessError(f"Sampler process exited with code {self._process.wait()}.")
+            self._stop_process()
+            self._log_run_overhead()
+        except Exception as e:
+            self._stop_process()
+            if self.running:
+                self._handle_error(e)
+            else:
+                self.logger.err_warn(f"Sampler process failed while stopping: {e}")
+
+    def _receive(self):
+        """Returns the names and devices of the components found by the
+        sampler process."""
+        line = self._process.stdout.readline()
+        if not line:
+            raise exceptions.SamplerProcessError(f"Sampler process exited with code {self._process.wait()}.")
+        message = json.loads(line)
+        if "error" in message:
+            raise exceptions.SamplerProcessError(f"Sampler process failed:\n{message['error']}")
+        return message["components"]
+
+    def _attach(self, components):
+        """Creates a component with a RingBuffer in shared memory for every
+        component of the sampler process and attaches the latter to them."""
+        comps = []
+        names = []
+        for name, devices, mode in components:
+            shm = shared_memory.SharedMemory(create=True, size=RingBuffer.nbytes(self.retention, len(devices)))
+            self._shared_memory.append(shm)
+            comp = component.Component(
+                name=name, pids=[], devices_by_pid=False, handler=_RemoteHandler(devices, mode), retention=1
+            )
+            comp.samples = RingBuffer(self.retention, len(devices), buffer=shm.buf)
+            comps.append(comp)
+            names.append(shm.name)
+        self.components = comps
+        self._send(["attach", names, self.retention])
+
+    def _send(self, command):
+        with self._process_lock:
+            if self._process is None:
+                return
+            try:
+                self._process.stdin.write(json.dumps(command) + "\n")
+                self._process.stdin.flush()
+            except (OSError, ValueError):
+                # The exit of the sampler process is handled by run().
+                pass
+
+    def _stop_process(self):
+        """Stops the sampler process, keeps a copy of the samples and releases
+        the shared memory."""
+        self._send(["stop"])
+        with self._process_lock:
+            process, self._process = self._process, None
+        if process is None:
+            return
+        try:
+            process.stdin.close()
+        except OSError:
+            pass
+        try:
+            process.wait(STOP_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            self.logger.err_warn("Sampler process did not stop in time and was killed.")
+            process.kill()
+            process.wait()
+        process.stdout.close()
+
+        for comp in self.components:
+            comp.samples = comp.samples.copy()
+        for shm in self._shared_memory:
+            try:
+                shm.close()
+            except BufferError:
+                # Still read by another thread. Unmapped once released.
+                pass
+            shm.unlink()
+        self._shared_memory = []
+
+    def _join(self):
+        """Waits for the sampler process to report the remaining epochs and
+        exit s.t. the log is complete and the shared memory is released
+        before the interpreter exits."""
+        self._send(["stop"])
+        self.join(2 * STOP_TIMEOUT)
+        if self.is_alive():
+            # The sampler process hangs, e.g. in a handler call.
+            process = self._process
+            if process is not None:
+                process.kill()
+
+    def epoch_start(self):
+        super(SamplerProcess, self).epoch_start()
+        self._send(["epoch_start"])
+
+    def epoch_end(self):
+        super(SamplerProcess, self).epoch_end()
+        # Commanded after the end of the epoch is recorded s.t. the sampler
+        # samples the boundary after it.
+        self._send(["epoch_end"])
+
+    def _reschedule(self):
+        super(SamplerProcess, self)._reschedule()
+        if self._process is not None:
+            self._send(["intervals", self.update_interval, self.sampling_intervals])
+
+    def _epoch_overhead(self):
+        """Returns the overhead of the thread and of the sampler process as
+        reported with the latest epoch."""
+        cpu_time, _ = super(SamplerProcess, self)._epoch_overhead()
+        sampler_cpu_time, handler_calls = self._sampler_overhead
+        handler_calls = {name: tuple(calls) for name, calls in handler_calls.items()}
+        self._sampler_cpu_time += sampler_cpu_time
+        for name, (count, total, longest) in handler_calls.items():
+            previous = self._sampler_handler_calls.get(name, (0, 0.0, 0.0))
+            self._sampler_handler_calls[name] = (previous[0] + count, previous[1] + total, max(previous[2], longest))
+        return cpu_time + sampler_cpu_time, handler_calls
+
+    def _log_run_overhead(self):
+        """Logs the overhead of the thread and of the sampler process as
+        reported with all epochs."""
+        self._record_cpu_time()
+        self._log_overhead(
+            "Overhead of monitoring", self.cpu_time() + self._sampler_cpu_time, self._sampler_handler_calls
+        )
+
+    def _epoch_statistics(self, comp, epoch):
+        """Returns the EpochStats of the samples in shared memory within the
+        bounds of an epoch or None."""
+        times, power_usages = comp.samples.get()
+        start, end = self.epoch_bounds[epoch - 1]
+        first = np.searchsorted(times, start, side="left")
+        stop = np.searchsorted(times, end, side="right")
+        if stop <= first:
+            return None
+        return EpochStats.from_samples(times[first:stop], power_usages[first:stop], step=comp.averaged)
+
+
+class _SamplerThread(tracker.CarbonTrackerThread):
+    """Sampling loop of the sampler process. The tracking process logs the
+    components and the epochs reported through messages."""
+
+    def __init__(self, components, logger, messages, update_interval, sampling_intervals, adaptive_sampling=None):
+        # Errors are fatal to the sampler process and handled by the tracking
+        # process once it exits.
+        super(_SamplerThread, self).__init__(
+            components=components,
+            logger=logger,
+            ignore_errors=False,
+            delete=None,
+            update_interval=update_interval,
+            sampling_intervals=sampling_intervals,
+            adaptive_sampling=adaptive_sampling,
+        )
+        self._messages = messages
+
+    def begin(self):
+        # Components are initialized by serve().
+        self._start_workers()
+
+    def cpu_time(self):
+        """Returns the CPU time (s) of the sampler process."""
+        return time.process_time()
+
+    def _log_epoch_measurements(self, epoch):
+        _reply(self._messages, {"epoch": epoch, "overhead": self._epoch_overhead()})
+
+    def _log_run_overhead(self):
+        pass
+
+
+def _attach_shared_memory(name):
+    """Returns the SharedMemory created by the tracking process, which owns
+    and unlinks it."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Before Python 3.13, attached shared memory is registered with the
+        # resource tracker, which would unlink it once this process exits.
+        shm = shared_memory.SharedMemory(name=name)
+        resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
+
+
+def _reply(messages, message):
+    messages.write(json.dumps(message) + "\n")
+    messages.flush()
+
+
+def serve(config, commands, messages, logger):
+    """Reports the available components through messages and samples them
+    into shared memory as read from commands until stopped."""
+    try:
+        components = component.create_components(
+            components=config["components"],
+            pids=config["pids"],
+            devices_by_pid=config["devices_by_pid"],
+            sampling_mode=config["sampling_mode"],
+            retention=1,
+        )
+        components = [comp for comp in components if comp.available()]
+        if not components:
+            raise exceptions.NoComponentsAvailableError()
+        # Devices are only known once initialized.
+        for comp in components:
+            comp.init()
+        _reply(messages, {"components": [[comp.name, comp.devices(), comp.handler.mode] for comp in components]})
+    except Exception:
+        _reply(messages, {"error": traceback.format_exc()})
+        return
+
+    thread = _SamplerThread(
+        components,
+        logger,
+        messages,
+        config["update_interval"],
+        config["sampling_intervals"],
+        config.get("adaptive_sampling"),
+    )
+    shared = []
+    try:
+        for line in iter(commands.readline, ""):
+            command, *args = json.loads(line)
+            if command == "attach":
+                names, capacity = args
+                for comp, name in zip(components, names):
+                    shm = _attach_shared_memory(name)
+                    shared.append(shm)
+                    comp.samples = RingBuffer(capacity, len(comp.devices()), buffer=shm.buf)
+                thread.start()
+            elif command == "epoch_start":
+                thread.epoch_start()
+            elif command == "epoch_end":
+                thread.epoch_end()
+            elif command == "intervals":
+                thread.update_interval, thread.sampling_intervals = args
+            elif command == "stop":
+                break
+    finally:
+        thread.stop()
+        if thread.ident is not None:
+            thread.join()
+        # Release the views into the shared memory before closing it.
+        for comp in components:
+            comp.samples = None
+        for shm in shared:
+            shm.close()
+
+
+def main(argv=None):
+    config = json.loads((sys.argv[1:] if argv is None else argv)[0])
+    # Commands and replies are exchanged through stdin and stdout, so output
+    # of the components goes to stderr.
+    messages, sys.stdout = sys.stdout, sys.stderr
+    logger = loggerutil.Logger(log_dir=None, verbose=0)
+    serve(config, sys.stdin, messages, logger)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,12 @@
+import heapq
 import os
+import queue
 import sys
 import time
 import traceback
-import psutil
 import math
-from threading import Thread, Event
+from concurrent import futures
+from threading import Thread, Event, Lock, current_thread, get_ident
 
 import numpy as np
 
@@ -12,14 +14,38 @@ from carbontracker import constants
 from carbontracker import loggerutil
 from carbontracker import predictor
 from carbontracker import exceptions
-from carbontracker.components import component
+from carbontracker import lazyutil
+from carbontracker.components import adaptive, component
 from carbontracker.emissions.intensity import intensity
 from carbontracker.emissions.conversion import co2eq
-from carbontracker.emissions.intensity.fetchers import electricitymaps
+
+psutil = lazyutil.lazy_import("psutil")
+electricitymaps = lazyutil.lazy_import("carbontracker.emissions.intensity.fetchers.electricitymaps")
+sampler = lazyutil.lazy_import("carbontracker.sampler")
+
+# Environment variable which disables all trackers when set to a true value.
+DISABLE_ENV_VAR = "CARBONTRACKER_DISABLED"
+
+# Quantiles of the power usage of every epoch that are logged.
+LOG_QUANTILES = (0.5, 0.9, 0.99)
+
+# Time (s) stop() waits for the monitoring thread to log the remaining epochs.
+STOP_TIMEOUT = 5
+
+
+def _tracking_disabled(disabled):
+    if disabled:
+        return True
+    return os.environ.get(DISABLE_ENV_VAR, "").strip().lower() in ("1", "true", "yes", "on")
 
 
 class CarbonIntensityThread(Thread):
-    """Sleeper thread to update Carbon Intensity every 15 minutes."""
+    """Sleeper thread to update Carbon Intensity every 15 minutes.
+
+    Note:
+        The thread is not started on construction s.t. no geolocation or
+        HTTP requests are made before tracking begins. Call start().
+    """
 
     def __init__(self, logger, stop_event, update_interval=900):
         super(CarbonIntensityThread, self).__init__()
@@ -29,20 +55,35 @@ class CarbonIntensityThread(Thread):
         self.daemon = True
         self.stop_event = stop_event
         self.carbon_intensities = []
-
-        self.start()
+        # Wall times (s) of locating the IP and of every fetcher by name. Only
+        # fetches made by the thread itself are recorded, s.t. no other thread
+        # modifies it and fetches of the training thread are not counted.
+        self.fetch_durations = {}
+        # CPU time (s) consumed by the thread.
+        self.cpu_time = 0.0
 
     def run(self):
         try:
             self._fetch_carbon_intensity()
+            self.cpu_time = time.thread_time()
             while not self.stop_event.wait(self.update_interval):
                 self._fetch_carbon_intensity()
+                self.cpu_time = time.thread_time()
+            self._log_overhead()
         except Exception:
             err_str = traceback.format_exc()
             self.logger.err_warn(err_str)
 
+    def _log_overhead(self):
+        self.logger.info(f"Overhead of carbon intensity: CPU time {self.cpu_time:.6f} s.")
+        for name, durations in self.fetch_durations.items():
+            self.logger.info(
+                f"Overhead of carbon intensity from {name}: {len(durations)} call(s) taking {sum(durations):.6f} s, "
+                f"max {max(durations):.6f} s."
+            )
+
     def _fetch_carbon_intensity(self):
-        ci = intensity.carbon_intensity(self.logger)
+        ci = intensity.carbon_intensity(self.logger, durations=self.fetch_durations)
         if ci.success and isinstance(ci.carbon_intensity, (int, float)) and not np.isnan(ci.carbon_intensity):
             self.carbon_intensities.append(ci)
 
@@ -92,66 +133,309 @@ class CarbonIntensityThread(Thread):
         return avg_ci
 
 
+def _run_worker(tasks, cpu_times):
+    """Runs (future, func, arg) tasks from the queue until None is received and
+    records the CPU time of the worker by thread id in cpu_times."""
+    while True:
+        task = tasks.get()
+        if task is None:
+            return
+        future, func, arg = task
+        if future.set_running_or_notify_cancel():
+            try:
+                future.set_result(func(arg))
+            except BaseException as e:
+                future.set_exception(e)
+            cpu_times[get_ident()] = time.thread_time()
+
+
 class CarbonTrackerThread(Thread):
-    """Thread to fetch consumptions"""
+    """Thread to fetch consumptions
+
+    Note:
+        The thread is not started on construction. Call start() before the
+        first epoch_start().
+    """
 
-    def __init__(self, components, logger, ignore_errors, delete, update_interval=10):
+    def __init__(
+        self,
+        components,
+        logger,
+        ignore_errors,
+        delete,
+        update_interval=10,
+        sampling_intervals=None,
+        adaptive_sampling=None,
+    ):
         super(CarbonTrackerThread, self).__init__()
+        # Wakes the thread whenever its state changes. State is always updated
+        # before the event is set and the thread clears the event before it
+        # reads the state, s.t. no wakeup is lost.
+        self._wakeup_event = Event()
+        self._request_lock = Lock()
+        self._sample_requested = False
+        # Ended epochs yet to be sampled at their boundary and logged.
+        self._ended_epochs = []
+        self._schedule_changed = False
+        # Task queues of the per component collection workers by id(component).
+        self._worker_queues = {}
+        # AdaptiveInterval of every sampled component by id(component).
+        self._adaptive_intervals = {}
+        # CPU time (s) of the thread and its workers by thread id, as measured
+        # by each of them.
+        self._cpu_times = {}
+        # CPU time (s) at the latest overhead of an epoch.
+        self._overhead_cpu_time = 0.0
+        self.adaptive_sampling = adaptive_sampling
         self.cur_epoch_time = time.time()
         self.name = "CarbonTrackerThread"
         self.delete = delete
         self.components = components
         self.update_interval = update_interval
+        self.sampling_intervals = sampling_intervals
         self.ignore_errors = ignore_errors
         self.logger = logger
         self.epoch_times = []
+        # Monotonic (start, end) time of every epoch.
+        self.epoch_bounds = []
+        self.cur_epoch_start = time.monotonic()
         self.running = True
         self.measuring_event = Event()
         self.epoch_counter = 0
         self.daemon = True
 
-        self.start()
+    @property
+    def running(self):
+        return self._running
+
+    @running.setter
+    def running(self, running):
+        self._running = running
+        self._wakeup_event.set()
+
+    @property
+    def update_interval(self):
+        return self._update_interval
+
+    @update_interval.setter
+    def update_interval(self, update_interval):
+        self._update_interval = update_interval
+        self._reschedule()
+
+    @property
+    def sampling_intervals(self):
+        """Dict of sampling interval (s) by component name. Components not
+        contained are sampled every update_interval."""
+        return self._sampling_intervals
+
+    @sampling_intervals.setter
+    def sampling_intervals(self, sampling_intervals):
+        self._sampling_intervals = dict(sampling_intervals or {})
+        self._reschedule()
+
+    def _reschedule(self):
+        with self._request_lock:
+            self._schedule_changed = True
+        self._wakeup_event.set()
+
+    def sampling_interval(self, comp):
+        """Returns the (current) sampling interval (s) of a component."""
+        adaptive_interval = self._adaptive_intervals.get(id(comp))
+        if adaptive_interval is not None:
+            return adaptive_interval.interval
+        return self._sampling_intervals.get(comp.name, self._update_interval)
+
+    def _adapt_interval(self, comp):
+        """Adapts the sampling interval of a component to its latest sample if
+        sampling is adaptive.
+
+        Note:
+            The intervals of update_interval and sampling_intervals are the
+            initial intervals of the components.
+        """
+        if self.adaptive_sampling is None or not comp.epoch_stats or comp.epoch_stats[-1].last is None:
+            return
+        adaptive_interval = self._adaptive_intervals.get(id(comp))
+        if adaptive_interval is None:
+            adaptive_interval = adaptive.AdaptiveInterval(self.sampling_interval(comp), **self.adaptive_sampling)
+            self._adaptive_intervals[id(comp)] = adaptive_interval
+        timestamp, power_usage = comp.epoch_stats[-1].last
+        adaptive_interval.update(timestamp, power_usage, comp.collection_durations.last)
 
     def run(self):
-        """Thread's activity."""
+        """Thread's activity.
+
+        Note:
+            Components are sampled on their own schedule, driven by a heap of
+            (due time, component index). Instead of sleeping until the next
+            due time, the thread waits on an event s.t. stop(), epoch
+            boundaries and changes of the sampling intervals take effect
+            immediately. Ended epochs are logged by the thread after their
+            boundary is sampled, s.t. their statistics are complete and no
+            longer modified while logged.
+        """
         try:
             self.begin()
-            while self.running:
-                # Wait for the measuring_event to be set
-                self.measuring_event.wait()
-                self._collect_measurements()
-                time.sleep(self.update_interval)
+            # Time of the latest sample of each component (by index).
+            last_samples = {}
+            schedule = []
+            while True:
+                self._wakeup_event.clear()
+                with self._request_lock:
+                    sample_requested, self._sample_requested = self._sample_requested, False
+                    ended_epochs, self._ended_epochs = self._ended_epochs, []
+                    schedule_changed, self._schedule_changed = self._schedule_changed, False
+
+                measuring = self.measuring_event.is_set()
+                if self._log_ended_epochs(ended_epochs, measuring):
+                    # The boundary sample is the baseline of the epoch in
+                    # progress, so it is not sampled again.
+                    sample_requested = False
+                    now = time.monotonic()
+                    last_samples = {i: now for i in range(len(self.components))}
+                    schedule_changed = True
+                if not self.running:
+                    break
+
+                timeout = None
+                if measuring:
+                    if sample_requested or not last_samples:
+                        self._collect_measurements()
+                        now = time.monotonic()
+                        last_samples = {i: now for i in range(len(self.components))}
+                        schedule_changed = True
+                    if schedule_changed:
+                        # Changed intervals apply to the interval in progress.
+                        schedule = [
+                            (last + self.sampling_interval(self.components[i]), i) for i, last in last_samples.items()
+                        ]
+                        heapq.heapify(schedule)
+
+                    while schedule and schedule[0][0] <= time.monotonic():
+                        # Collect all due components together s.t. they are
+                        # sampled at the same instant.
+                        now = time.monotonic()
+                        due = []
+                        while schedule and schedule[0][0] <= now:
+                            due.append(heapq.heappop(schedule)[1])
+                        self._collect_measurements([self.components[i] for i in due])
+                        now = time.monotonic()
+                        for i in due:
+                            last_samples[i] = now
+                            heapq.heappush(schedule, (now + self.sampling_interval(self.components[i]), i))
+                    if schedule:
+                        timeout = max(schedule[0][0] - time.monotonic(), 0)
+                self._record_cpu_time()
+                self._wakeup_event.wait(timeout)
+
+            # Log epochs that ended since the latest wakeup.
+            with self._request_lock:
+                ended_epochs, self._ended_epochs = self._ended_epochs, []
+            self._log_ended_epochs(ended_epochs, self.measuring_event.is_set())
 
             # Shutdown in thread's activity instead of epoch_end() to ensure
             # that we only shutdown after last measurement.
+            self._stop_workers()
             self._components_shutdown()
+            self._log_run_overhead()
         except Exception as e:
+            self._stop_workers()
             self._handle_error(e)
 
+    def _log_ended_epochs(self, ended_epochs, measuring):
+        """Samples the last partial interval of the latest ended epoch and
+        logs the ended epochs.
+
+        Returns:
+            True if the next epoch began before the boundary was sampled, in
+            which case the boundary sample is the baseline of the next epoch.
+        """
+        if not ended_epochs:
+            return False
+        ended = max(ended_epochs)
+        epoch = self.epoch_counter
+        began = epoch > ended
+        if began or not measuring:
+            self._collect_measurements(epoch=ended)
+            if began:
+                for comp in self.components:
+                    comp.begin_epoch(epoch)
+        for ended_epoch in ended_epochs:
+            self._log_epoch_measurements(ended_epoch)
+        return began
+
     def begin(self):
         self._components_remove_unavailable()
         self._components_init()
+        self._start_workers()
         self._log_components_info()
         self.logger.info("Monitoring thread started.")
 
+    def _start_workers(self):
+        """Starts a daemon worker thread per component s.t. components are
+        collected concurrently. Daemon threads are used s.t. a hanging handler
+        cannot block interpreter exit."""
+        worker_queues = {}
+        if len(self.components) > 1:
+            for comp in self.components:
+                tasks = queue.SimpleQueue()
+                Thread(
+                    target=_run_worker,
+                    args=(tasks, self._cpu_times),
+                    name=f"CarbonTrackerWorker-{comp.name}",
+                    daemon=True,
+                ).start()
+                worker_queues[id(comp)] = tasks
+        self._worker_queues = worker_queues
+
+    def _stop_workers(self):
+        for tasks in self._worker_queues.values():
+            tasks.put(None)
+        self._worker_queues = {}
+
     def stop(self):
         if not self.running:
             return
 
         self.running = False
+        if self.ident is None:
+            # Never started, so release what the components acquired while
+            # probing their availability ourselves.
+            self._components_shutdown()
+        elif current_thread() is not self:
+            # A collection in progress, e.g. an Intel CPU measuring power over
+            # MEASURE_DELAY, would otherwise delay stopping.
+            self._components_interrupt()
+            self._join()
         self.logger.info("Monitoring thread ended.")
         self.logger.output("Finished monitoring.", verbose_level=1)
 
+    def _join(self):
+        """Waits for the thread to log the remaining epochs s.t. the log is
+        complete when stop() returns, but no longer than STOP_TIMEOUT."""
+        self.join(STOP_TIMEOUT)
+        if self.is_alive():
+            self.logger.err_warn("Monitoring thread did not stop in time.")
+
 
     def epoch_start(self):
         self.epoch_counter += 1
         self.cur_epoch_time = time.time()
+        self.cur_epoch_start = time.monotonic()
+        with self._request_lock:
+            self._sample_requested = True
         self.measuring_event.set()  # Set the event to start measuring
+        self._wakeup_event.set()
 
     def epoch_end(self):
         self.measuring_event.clear()  # Clear the event to stop measuring
         self.epoch_times.append(time.time() - self.cur_epoch_time)
-        self._log_epoch_measurements()
+        self.epoch_bounds.append((self.cur_epoch_start, time.monotonic()))
+        # The thread samples the boundary and logs the epoch s.t. training is
+        # not blocked.
+        with self._request_lock:
+            self._ended_epochs.append(self.epoch_counter)
+        self._wakeup_event.set()
 
     def _log_components_info(self):
         log = ["The following components were found:"]
@@ -163,24 +447,35 @@ class CarbonTrackerThread(Thread):
         self.logger.info(log_str)
         self.logger.output(log_str, verbose_level=1)
 
-    def _log_epoch_measurements(self):
-        self.logger.info(f"Epoch {self.epoch_counter}:")
-        duration = self.epoch_times[-1]
+    def _log_epoch_measurements(self, epoch):
+        self.logger.info(f"Epoch {epoch}:")
+        duration = self.epoch_times[epoch - 1]
         self.logger.info(f"Duration: {loggerutil.convert_to_timestring(duration, True)}")
         for comp in self.components:
-            if comp.power_usages and comp.power_usages[-1]:
-                power_avg = np.mean(comp.power_usages[-1], axis=0)
-                # If np.mean is calculated during a measurement, it will get an
-                # empty list and return nan, if this is the case we take the
-                #  previous measurement.
-                # TODO: Use semaphores to wait for measurement to finish.
-                if np.isnan(power_avg).all():
-                    power_avg = np.mean(comp.power_usages[-2], axis=0) if len(comp.power_usages) >= 2 else None
-            else:
+            stats = self._epoch_statistics(comp, epoch)
+            if stats is None:
                 self.logger.err_warn("Epoch duration is too short for a measurement to be " "collected.")
                 power_avg = None
+            else:
+                power_avg = stats.mean
 
             self.logger.info(f"Average power usage (W) for {comp.name}: {power_avg}")
+            if stats is not None:
+                quantiles = ", ".join(
+                    f"p{q * 100:g} {value}" for q, value in zip(LOG_QUANTILES, stats.quantiles(LOG_QUANTILES))
+                )
+                self.logger.info(
+                    f"Power usage (W) for {comp.name}: min {stats.min}, max {stats.max}, std {stats.std}, {quantiles}"
+                )
+                if self.adaptive_sampling is not None and duration > 0:
+                    self.logger.info(f"Effective sample rate (Hz) for {comp.name}: {stats.count / duration:.3f}")
+        # Measured since the overhead of the previous epoch, i.e., including
+        # the time between epochs.
+        self._log_overhead(f"Overhead of epoch {epoch}", *self._epoch_overhead())
+
+    def _epoch_statistics(self, comp, epoch):
+        """Returns the EpochStats of an epoch of a component or None."""
+        return comp.epoch_statistics(epoch)
 
     def _components_remove_unavailable(self):
         self.components = [cmp for cmp in self.components if cmp.available()]
@@ -195,17 +490,81 @@ class CarbonTrackerThread(Thread):
         for comp in self.components:
             comp.shutdown()
 
-    def _collect_measurements(self):
-        """Collect one round of measurements."""
+    def _components_interrupt(self):
+        for comp in self.components:
+            comp.interrupt()
+
+    def _collect_measurements(self, components=None, epoch=None):
+        """Collect one round of measurements of the given (default all)
+        components for an epoch (default the current one). Multiple components
+        are collected concurrently by their workers s.t. a slow handler does
+        not delay the others."""
+        components = self.components if components is None else components
+        epoch = self.epoch_counter if epoch is None else epoch
+        worker_queues = self._worker_queues
+        if len(components) < 2 or not all(id(comp) in worker_queues for comp in components):
+            for comp in components:
+                comp.collect_power_usage(epoch)
+        else:
+            collections = []
+            for comp in components:
+                collection = futures.Future()
+                worker_queues[id(comp)].put((collection, comp.collect_power_usage, epoch))
+                collections.append(collection)
+            futures.wait(collections)
+            for collection in collections:
+                collection.result()
+
+        # Store the energy of ended epochs before their samples are dropped.
+        for comp in components:
+            comp.close_epochs(self.epoch_bounds)
+            self._adapt_interval(comp)
+
+    def _record_cpu_time(self):
+        """Records the CPU time of the calling thread."""
+        self._cpu_times[get_ident()] = time.thread_time()
+
+    def cpu_time(self):
+        """Returns the CPU time (s) consumed by the thread and its workers as
+        of their latest activity."""
+        return sum(self._cpu_times.copy().values())
+
+    def _handler_calls(self, recent=False):
+        """Returns the number, total and max wall time (s) of the handler calls
+        of every component by name, or of those since the previous epoch's
+        overhead if recent."""
+        calls = {}
         for comp in self.components:
-            comp.collect_power_usage(self.epoch_counter)
+            durations = comp.take_collection_durations() if recent else comp.collection_durations
+            if durations.count:
+                calls[comp.name] = (durations.count, durations.total, durations.max)
+        return calls
+
+    def _epoch_overhead(self):
+        """Returns the CPU time (s) and the handler calls (see _handler_calls())
+        since the overhead of the previous epoch."""
+        self._record_cpu_time()
+        cpu_time = self.cpu_time()
+        previous_cpu_time, self._overhead_cpu_time = self._overhead_cpu_time, cpu_time
+        return cpu_time - previous_cpu_time, self._handler_calls(recent=True)
+
+    def _log_overhead(self, title, cpu_time, handler_calls):
+        self.logger.info(f"{title}: CPU time {cpu_time:.6f} s.")
+        for name, (count, total, longest) in handler_calls.items():
+            self.logger.info(
+                f"{title} for {name}: {count} sample(s), handler time {total:.6f} s, max {longest:.6f} s per call."
+            )
+
+    def _log_run_overhead(self):
+        self._record_cpu_time()
+        self._log_overhead("Overhead of monitoring", self.cpu_time(), self._handler_calls())
 
     def total_energy_per_epoch(self):
         """Retrieves total energy (kWh) per epoch used by all components
         including PUE."""
         total_energy = np.zeros(len(self.epoch_times))
         for comp in self.components:
-            energy_usage = comp.energy_usage(self.epoch_times)
+            energy_usage = comp.energy_usage(self.epoch_times, self.epoch_bounds)
             total_energy += energy_usage
         return total_energy * constants.PUE_2022
 
@@ -225,6 +584,11 @@ class CarbonTrackerThread(Thread):
 
 
 class CarbonTracker:
+    def __new__(cls, *args, disabled=False, **kwargs):
+        if cls is CarbonTracker and _tracking_disabled(disabled):
+            return super().__new__(DisabledCarbonTracker)
+        return super().__new__(cls)
+
     def __init__(
         self,
         epochs,
@@ -241,6 +605,13 @@ class CarbonTracker:
         verbose=1,
         decimal_precision=12,
         api_keys=None,
+        disabled=False,
+        sampling_mode="power",
+        sampling_intervals=None,
+        sample_retention=component.DEFAULT_RETENTION,
+        streaming=False,
+        sampler_process=False,
+        adaptive_sampling=False,
     ):
         if api_keys is not None:
             self.set_api_keys(api_keys)
@@ -253,33 +624,106 @@ class CarbonTracker:
                 "Argument monitor_epochs expected a value in "
                 f"{{-1, >0, >=epochs_before_pred}}, got {monitor_epochs}."
             )
+        if sampling_mode not in component.SAMPLING_MODES:
+            raise ValueError(
+                f"Argument sampling_mode expected one of {component.SAMPLING_MODES}, got {sampling_mode!r}."
+            )
+        for name, interval in (sampling_intervals or {}).items():
+            if name not in component.component_names() or not interval > 0:
+                raise ValueError(
+                    "Argument sampling_intervals expected positive intervals by component name in "
+                    f"{component.component_names()}, got {sampling_intervals}."
+                )
+        if not isinstance(sample_retention, int) or sample_retention < 1:
+            raise ValueError(f"Argument sample_retention expected a positive integer, got {sample_retention}.")
+        if sampler_process and streaming:
+            raise ValueError("Argument sampler_process expected False if streaming is True.")
+        if adaptive_sampling is True:
+            adaptive_sampling = {}
+        elif not adaptive_sampling:
+            adaptive_sampling = None
+        if adaptive_sampling is not None:
+            try:
+                adaptive.AdaptiveInterval(update_interval, **adaptive_sampling)
+            except (TypeError, ValueError) as e:
+                raise ValueError(
+                    "Argument adaptive_sampling expected True or a dict of min_interval, max_interval and overhead, "
+                    f"got {adaptive_sampling}: {e}"
+                )
         self.interpretable = interpretable
         self.stop_and_confirm = stop_and_confirm
         self.ignore_errors = ignore_errors
         self.epoch_counter = 0
         self.decimal_precision = decimal_precision
         self.deleted = False
+        self.started = False
 
         try:
             pids = self._get_pids()
             self.logger = loggerutil.Logger(log_dir=log_dir, verbose=verbose, log_prefix=log_file_prefix)
-            self.tracker = CarbonTrackerThread(
-                delete=self._delete,
-                components=component.create_components(components=components, pids=pids, devices_by_pid=devices_by_pid),
-                logger=self.logger,
-                ignore_errors=ignore_errors,
-                update_interval=update_interval,
-            )
+            if sampler_process:
+                # Validate the names before the sampler process looks for the
+                # components.
+                component.parse_component_names(components)
+                self.tracker = sampler.SamplerProcess(
+                    components=components,
+                    pids=pids,
+                    devices_by_pid=devices_by_pid,
+                    logger=self.logger,
+                    ignore_errors=ignore_errors,
+                    delete=self._delete,
+                    update_interval=update_interval,
+                    sampling_intervals=sampling_intervals,
+                    adaptive_sampling=adaptive_sampling,
+                    sampling_mode=sampling_mode,
+                    retention=sample_retention,
+                )
+            else:
+                self.tracker = CarbonTrackerThread(
+                    delete=self._delete,
+                    components=component.create_components(
+                        components=components,
+                        pids=pids,
+                        devices_by_pid=devices_by_pid,
+                        sampling_mode=sampling_mode,
+                        retention=sample_retention,
+                        streaming=streaming,
+                    ),
+                    logger=self.logger,
+                    ignore_errors=ignore_errors,
+                    update_interval=update_interval,
+                    sampling_intervals=sampling_intervals,
+                    adaptive_sampling=adaptive_sampling,
+                )
             self.intensity_stopper = Event()
             self.intensity_updater = CarbonIntensityThread(self.logger, self.intensity_stopper)
         except Exception as e:
             self._handle_error(e)
 
+    def start(self):
+        """Starts the monitoring and carbon intensity threads unless already
+        started. Called by the first epoch_start()."""
+        if self.deleted:
+            return
+
+        try:
+            self._start_threads()
+        except Exception as e:
+            self._handle_error(e)
+
+    def _start_threads(self):
+        if self.started:
+            return
+        self.tracker.start()
+        self.intensity_updater.start()
+        self.started = True
+
     def epoch_start(self):
         if self.deleted:
             return
 
         try:
+            self._start_threads()
             self.tracker.epoch_start()
             self.epoch_counter += 1
         except Exception as e:
@@ -413,8 +857,13 @@ class CarbonTracker:
             self._check_input(user_input)
 
     def _delete(self):
-        self.tracker.stop()
         self.intensity_stopper.set()
+        # Joined before the monitoring thread logs the run overhead s.t. the
+        # overhead of the daemonic carbon intensity thread is not lost at exit.
+        updater = self.intensity_updater
+        if updater.ident is not None and current_thread() is not updater:
+            updater.join(STOP_TIMEOUT)
+        self.tracker.stop()
         del self.logger
         del self.tracker
         del self.intensity_updater
@@ -426,3 +875,38 @@ class CarbonTracker:
         process = psutil.Process()
         pids = [process.pid] + [child.pid for child in process.children(recursive=True)]
         return pids
+
+
+class DisabledCarbonTracker(CarbonTracker):
+    """No-op tracker returned by CarbonTracker(disabled=True) or when the
+    CARBONTRACKER_DISABLED environment variable is set.
+
+    Note:
+        Neither creates a logger, probes hardware, starts threads nor imports
+        hardware or network libraries, s.t. tracking calls can be left in code
+        at practically no cost.
+    """
+
+    def __new__(cls, *args, **kwargs):
+        return object.__new__(cls)
+
+    def __init__(self, epochs=None, *args, **kwargs):
+        self.epochs = epochs
+        self.epoch_counter = 0
+        self.deleted = True
+        self.started = False
+
+    def start(self):
+        pass
+
+    def epoch_start(self):
+        pass
+
+    def epoch_end(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def set_api_keys(self, api_dict):
+        pass
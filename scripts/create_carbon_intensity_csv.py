@@ -1,12 +1,19 @@
 """Script to create a short csv file with carbon intensity data.
 
 Uses csv from https://ourworldindata.org/grapher/carbon-intensity-electricity.
+
+The csv is additionally compiled into a Python lookup table (see
+carbontracker/emissions/intensity/carbon_intensities.py) s.t. the default
+intensity can be retrieved without parsing the csv at runtime.
 """
 import argparse
+import csv
 
 import pycountry
 import pandas as pd
 
+INTENSITY_COLUMN = "Carbon intensity of electricity (gCO2/kWh)"
+
 
 def country_to_alpha2(name):
     try:
@@ -15,6 +22,30 @@ def country_to_alpha2(name):
         return None
 
 
+def write_lookup_module(input_csv, output_py):
+    """Compiles the short carbon intensity csv into a Python dict keyed by
+    alpha-2 country code."""
+    with open(input_csv, "r", newline="") as f:
+        rows = sorted(csv.DictReader(f), key=lambda row: row["alpha-2"])
+
+    lines = [
+        '"""Average carbon intensity of electricity by ISO 3166-1 alpha-2 country code.',
+        "",
+        "Generated by scripts/create_carbon_intensity_csv.py from",
+        "carbontracker/data/carbon-intensities.csv. Do not edit manually.",
+        '"""',
+        "",
+        "# alpha-2: (year, carbon intensity in gCO2/kWh)",
+        "CARBON_INTENSITIES = {",
+    ]
+    for row in rows:
+        lines.append(f'    "{row["alpha-2"]}": ({int(row["Year"])}, {float(row[INTENSITY_COLUMN])!r}),')
+    lines.append("}")
+
+    with open(output_py, "w") as f:
+        f.write("\n".join(lines) + "\n")
+
+
 def main(args):
     intensity_df = pd.read_csv(args.input_csv)
     intensity_df.sort_values(by="Year", inplace=True, ascending=False)
@@ -32,10 +63,14 @@ def main(args):
     # Save to csv.
     intensity_df.to_csv(args.output_csv)
 
+    if args.output_py:
+        write_lookup_module(args.output_csv, args.output_py)
+
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--input_csv", help="Path to input csv.", required=True)
     parser.add_argument("--output_csv", help="Path to output csv.", required=True)
+    parser.add_argument("--output_py", help="Path to output Python lookup table.", default=None)
     args = parser.parse_args()
     main(args)
@@ -0,0 +1,53 @@
+import unittest
+
+from carbontracker.components.adaptive import AdaptiveInterval
+
+
+class TestAdaptiveInterval(unittest.TestCase):
+    def test_shortens_when_fluctuating(self):
+        adaptive = AdaptiveInterval(8, min_interval=1, max_interval=16)
+        for i, power_usage in enumerate([100, 200, 100, 200]):
+            adaptive.update(float(i), power_usage, 0)
+
+        self.assertEqual(adaptive.interval, 1)
+
+    def test_lengthens_when_stable(self):
+        adaptive = AdaptiveInterval(8, min_interval=1, max_interval=16)
+        adaptive.update(0.0, 100, 0)
+        adaptive.update(1.0, 100, 0)
+        self.assertEqual(adaptive.interval, 10)
+
+        for i in range(2, 10):
+            adaptive.update(float(i), 100.5, 0)
+        self.assertEqual(adaptive.interval, 16)
+
+    def test_overhead_bounds_interval(self):
+        adaptive = AdaptiveInterval(8, min_interval=1, max_interval=16, overhead=0.1)
+        adaptive.update(0.0, 100, 0.2)
+        adaptive.update(1.0, 300, 0.2)
+        adaptive.update(2.0, 100, 0.2)
+
+        self.assertEqual(adaptive.interval, 2)
+
+    def test_sample_taken_into_account_once(self):
+        adaptive = AdaptiveInterval(8, min_interval=1, max_interval=16)
+        adaptive.update(0.0, 100, 0)
+        adaptive.update(1.0, 200, 0)
+        adaptive.update(1.0, 200, 0)
+
+        self.assertEqual(adaptive.interval, 4)
+
+    def test_default_bounds(self):
+        adaptive = AdaptiveInterval(10)
+
+        self.assertEqual(adaptive.min_interval, 1)
+        self.assertEqual(adaptive.max_interval, 100)
+
+    def test_invalid_arguments(self):
+        for kwargs in ({"min_interval": 0}, {"min_interval": 2, "max_interval": 1}, {"overhead": 0}):
+            with self.assertRaises(ValueError):
+                AdaptiveInterval(1, **kwargs)
+
+
+if __name__ == "__main__":
+    unittest.main()
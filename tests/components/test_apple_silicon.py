@@ -1,3 +1,5 @@
+import threading
+import time
 import unittest
 from unittest.mock import patch
 from carbontracker.components.apple_silicon.powermetrics import AppleSiliconCPU, AppleSiliconGPU, PowerMetricsUnified
@@ -81,6 +83,18 @@ class TestPowerMetricsUnified(unittest.TestCase):
         self.assertEqual(output2, "Sample Output")
         self.assertEqual(output3, "Sample Output")
 
+    @patch('subprocess.check_output', side_effect=lambda *args, **kwargs: time.sleep(0.1) or "Sample Output")
+    def test_get_output_concurrent_calls_share_run(self, mock_check_output):
+        PowerMetricsUnified._output = None
+        self.addCleanup(setattr, PowerMetricsUnified, "_output", None)
+        threads = [threading.Thread(target=PowerMetricsUnified.get_output) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        mock_check_output.assert_called_once()
+
 
 class TestAppleSiliconGPUPowerUsage(unittest.TestCase):
     def setUp(self):
@@ -0,0 +1,85 @@
+import unittest
+
+import numpy as np
+
+from carbontracker.components.buffer import RingBuffer
+
+
+class TestRingBuffer(unittest.TestCase):
+    def test_append_and_get(self):
+        buffer = RingBuffer(4)
+        buffer.append(1.0, [10, 20])
+        buffer.append(2.0, [30, 40])
+
+        times, values = buffer.get()
+        np.testing.assert_array_equal(times, [1.0, 2.0])
+        np.testing.assert_array_equal(values, [[10, 20], [30, 40]])
+        self.assertEqual(len(buffer), 2)
+        self.assertEqual(buffer.count, 2)
+
+    def test_scalar_values(self):
+        buffer = RingBuffer(2)
+        buffer.append(1.0, 5)
+
+        _, values = buffer.get()
+        np.testing.assert_array_equal(values, [[5]])
+
+    def test_overwrites_oldest_samples(self):
+        buffer = RingBuffer(3)
+        for i in range(5):
+            buffer.append(float(i), [i])
+
+        times, values = buffer.get()
+        np.testing.assert_array_equal(times, [2.0, 3.0, 4.0])
+        np.testing.assert_array_equal(values, [[2], [3], [4]])
+        self.assertEqual(buffer.start, 2)
+        self.assertEqual(len(buffer), 3)
+
+    def test_get_by_absolute_index(self):
+        buffer = RingBuffer(3)
+        for i in range(5):
+            buffer.append(float(i), [i])
+
+        np.testing.assert_array_equal(buffer.get(3, 5)[0], [3.0, 4.0])
+        # Indices of overwritten samples are clipped to the retained ones.
+        np.testing.assert_array_equal(buffer.get(0, 3)[0], [2.0])
+        np.testing.assert_array_equal(buffer.get(4)[0], [4.0])
+        self.assertEqual(len(buffer.get(5)[0]), 0)
+
+    def test_empty(self):
+        buffer = RingBuffer(3)
+
+        times, values = buffer.get()
+        self.assertEqual(len(times), 0)
+        self.assertEqual(len(values), 0)
+
+    def test_shared_buffer(self):
+        block = bytearray(RingBuffer.nbytes(3, 2))
+        writer = RingBuffer(3, 2, buffer=block)
+        reader = RingBuffer(3, 2, buffer=block)
+        for i in range(4):
+            writer.append(float(i), [i, 2 * i])
+
+        times, values = reader.get()
+        np.testing.assert_array_equal(times, [1.0, 2.0, 3.0])
+        np.testing.assert_array_equal(values, [[1, 2], [2, 4], [3, 6]])
+        self.assertEqual(reader.count, 4)
+        self.assertEqual(reader.latest_time(), 3.0)
+
+    def test_copy(self):
+        block = bytearray(RingBuffer.nbytes(2, 1))
+        buffer = RingBuffer(2, 1, buffer=block)
+        buffer.append(1.0, [10])
+        copy = buffer.copy()
+        buffer.append(2.0, [20])
+
+        np.testing.assert_array_equal(copy.get()[0], [1.0])
+        self.assertEqual(copy.count, 1)
+
+    def test_invalid_capacity(self):
+        with self.assertRaises(ValueError):
+            RingBuffer(0)
+
+
+if __name__ == "__main__":
+    unittest.main()
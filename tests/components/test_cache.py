@@ -0,0 +1,97 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from carbontracker.components import cache
+
+
+class TestCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.env = patch.dict(os.environ, {"CARBONTRACKER_CACHE_DIR": self.tmp_dir.name})
+        self.env.start()
+        self.boot_id = patch("carbontracker.components.cache.boot_id", return_value="boot-1")
+        self.boot_id.start()
+
+    def tearDown(self):
+        self.boot_id.stop()
+        self.env.stop()
+        self.tmp_dir.cleanup()
+
+    def test_store_and_load(self):
+        cache.store("intel_rapl", {"devices": ["cpu:0"]})
+        cache.store("intel_rapl:/other", {"devices": ["cpu:1"]})
+
+        self.assertEqual(cache.load("intel_rapl"), {"devices": ["cpu:0"]})
+        self.assertEqual(cache.load("intel_rapl:/other"), {"devices": ["cpu:1"]})
+        self.assertIsNone(cache.load("missing"))
+
+    def test_load_after_reboot_misses(self):
+        cache.store("nvidia", [])
+
+        with patch("carbontracker.components.cache.boot_id", return_value="boot-2"):
+            self.assertIsNone(cache.load("nvidia"))
+
+    def test_load_corrupt_file_misses(self):
+        with open(os.path.join(self.tmp_dir.name, "hardware-boot-1.json"), "w") as f:
+            f.write("{not json")
+
+        self.assertIsNone(cache.load("nvidia"))
+        cache.store("nvidia", [])
+        self.assertEqual(cache.load("nvidia"), [])
+
+    def test_store_writes_boot_id(self):
+        cache.store("nvidia", [])
+
+        with open(os.path.join(self.tmp_dir.name, "hardware-boot-1.json")) as f:
+            self.assertEqual(json.load(f), {"boot_id": "boot-1", "entries": {"nvidia": []}})
+
+    def test_machines_sharing_directory(self):
+        cache.store("intel_rapl", ["cpu:0"])
+        with patch("carbontracker.components.cache.boot_id", return_value="boot-2"):
+            cache.store("intel_rapl", ["cpu:0", "cpu:1"])
+
+        self.assertEqual(cache.load("intel_rapl"), ["cpu:0"])
+        with patch("carbontracker.components.cache.boot_id", return_value="boot-2"):
+            self.assertEqual(cache.load("intel_rapl"), ["cpu:0", "cpu:1"])
+
+    def test_store_removes_stale_files(self):
+        stale = os.path.join(self.tmp_dir.name, "hardware-boot-0.json")
+        recent = os.path.join(self.tmp_dir.name, "hardware-boot-2.json")
+        other = os.path.join(self.tmp_dir.name, "other.json")
+        for path in (stale, recent, other):
+            with open(path, "w") as f:
+                f.write("{}")
+        old = time.time() - cache.STALE_AGE - 1
+        os.utime(stale, (old, old))
+        os.utime(other, (old, old))
+
+        cache.store("nvidia", [])
+
+        self.assertEqual(
+            sorted(os.listdir(self.tmp_dir.name)), ["hardware-boot-1.json", "hardware-boot-2.json", "other.json"]
+        )
+
+    def test_disabled(self):
+        with patch.dict(os.environ, {"CARBONTRACKER_CACHE_DIR": ""}):
+            self.assertIsNone(cache.cache_dir())
+            cache.store("nvidia", [])
+            self.assertIsNone(cache.load("nvidia"))
+        self.assertEqual(os.listdir(self.tmp_dir.name), [])
+
+    def test_no_boot_id(self):
+        with patch("carbontracker.components.cache.boot_id", return_value=None):
+            cache.store("nvidia", [])
+            self.assertIsNone(cache.load("nvidia"))
+
+    @patch.dict(os.environ, {"XDG_CACHE_HOME": "/xdg"})
+    def test_cache_dir_default(self):
+        del os.environ["CARBONTRACKER_CACHE_DIR"]
+        self.assertEqual(cache.cache_dir(), os.path.join("/xdg", "carbontracker"))
+
+
+if __name__ == "__main__":
+    unittest.main()
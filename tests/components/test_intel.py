@@ -1,10 +1,16 @@
+import os
+import tempfile
+import threading
+import time
 import unittest
-from unittest.mock import patch, mock_open
+from unittest.mock import MagicMock, patch, mock_open
+from carbontracker.components.cpu import intel
 from carbontracker.components.cpu.intel import IntelCPU
 from carbontracker.components.component import Component
 from carbontracker import exceptions
 import re
 
+@patch.dict(os.environ, {"CARBONTRACKER_CACHE_DIR": ""})
 class TestIntelCPU(unittest.TestCase):
     @patch("os.path.exists")
     @patch("os.listdir")
@@ -37,29 +43,66 @@ class TestIntelCPU(unittest.TestCase):
         cpu = Component(name='cpu', pids=[], devices_by_pid={})
         self.assertFalse(cpu.available())
 
-    @patch("time.sleep")
-    @patch("carbontracker.components.cpu.intel.IntelCPU._get_measurements")
-    def test_power_usage_positive(self, mock_get_measurements, mock_sleep):
-        mock_get_measurements.side_effect = [[10, 20], [20, 30]]
-        mock_sleep.return_value = None
+    @patch("carbontracker.components.cpu.intel.IntelCPU._get_counters")
+    def test_power_usage_positive(self, mock_get_counters):
+        mock_get_counters.side_effect = [[[10], [20]], [[20], [30]]]
 
         cpu = IntelCPU(pids=[], devices_by_pid={})
+        cpu._interrupted = MagicMock(**{"wait.return_value": False})
+        cpu._max_energy_ranges = [[None], [None]]
         power_usages = cpu.power_usage()
 
         self.assertEqual(power_usages, [0.00001, 0.00001])
 
-    @patch("time.sleep")
-    @patch("carbontracker.components.cpu.intel.IntelCPU._get_measurements")
-    def test_power_usage_negative(self, mock_get_measurements, mock_sleep):
-        mock_get_measurements.side_effect = [[30, 20], [20, 30]]
-        mock_sleep.return_value = None
+    @patch("carbontracker.components.cpu.intel.IntelCPU._get_counters")
+    def test_power_usage_negative(self, mock_get_counters):
+        mock_get_counters.side_effect = [[[30], [20]], [[20], [30]]]
 
         cpu = IntelCPU(pids=[], devices_by_pid={})
+        cpu._interrupted = MagicMock(**{"wait.return_value": False})
         cpu._devices = ["cpu:0", "cpu:1"]
+        cpu._max_energy_ranges = [[None], [None]]
         power_usages = cpu.power_usage()
 
         self.assertEqual(power_usages, [0.00, 0.00])
 
+    @patch("carbontracker.components.cpu.intel.IntelCPU._get_counters")
+    def test_power_usage_wraparound(self, mock_get_counters):
+        # The core counter of the first package wraps at 10 J.
+        mock_get_counters.side_effect = [[[9000000, 500000], [20]], [[1000000, 1500000], [30]]]
+
+        cpu = IntelCPU(pids=[], devices_by_pid={})
+        cpu._interrupted = MagicMock(**{"wait.return_value": False})
+        cpu._devices = ["cpu:0", "cpu:1"]
+        cpu._max_energy_ranges = [[10000000, 10000000], [None]]
+        power_usages = cpu.power_usage()
+
+        self.assertEqual(power_usages, [3.0, 0.00001])
+
+    @patch("carbontracker.components.cpu.intel.IntelCPU._get_counters")
+    def test_power_usage_interrupted(self, mock_get_counters):
+        mock_get_counters.side_effect = [[[0]], [[20000]]] * 2
+        cpu = IntelCPU(pids=[], devices_by_pid={})
+        cpu._devices = ["cpu:0"]
+        cpu._max_energy_ranges = [[None]]
+        threading.Timer(0.05, cpu.interrupt).start()
+
+        start = time.monotonic()
+        power_usages = cpu.power_usage()
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertGreater(power_usages[0], 0.02)
+
+        # Further measurements are shortened as well.
+        start = time.monotonic()
+        power_usages = cpu.power_usage()
+        self.assertGreaterEqual(time.monotonic() - start, intel.MIN_MEASURE_DELAY)
+        self.assertLessEqual(power_usages[0], 2.0)
+
+    def test_energy_delta(self):
+        cpu = IntelCPU(pids=[], devices_by_pid={})
+        self.assertEqual(cpu._energy_delta([5, 10], [8, 20], [100, 100]), 13)
+        self.assertEqual(cpu._energy_delta([95], [5], [100]), 10)
+        self.assertEqual(cpu._energy_delta([95], [5], [None]), -90)
 
     @patch("builtins.open", new_callable=mock_open, read_data="1000000")
     def test__read_energy(self, mock_file):
@@ -70,7 +113,7 @@ class TestIntelCPU(unittest.TestCase):
     @patch("os.path.exists")
     @patch("os.listdir")
     @patch("builtins.open", new_callable=mock_open)
-    def test__get_measurements(self, mock_file, mock_listdir, mock_exists):
+    def test__get_counters(self, mock_file, mock_listdir, mock_exists):
         mock_exists.return_value = True
         mock_listdir.return_value = ["intel-rapl:0", "intel-rapl:1"]
         mock_file.return_value.read.return_value = "1000000"
@@ -78,8 +121,13 @@ class TestIntelCPU(unittest.TestCase):
         cpu = IntelCPU(pids=[], devices_by_pid={})
         cpu.init()
 
-        measurements = cpu._get_measurements()
-        self.assertEqual(measurements, [1000000, 1000000])
+        counters = cpu._get_counters()
+        self.assertEqual(counters, [[1000000], [1000000]])
+
+    def test__compute_power(self):
+        cpu = IntelCPU(pids=[], devices_by_pid={})
+        self.assertEqual(cpu._compute_power(3.0), 3.0)
+        self.assertEqual(cpu._compute_power(3.0, duration=2), 1.5)
 
     @patch("os.listdir")
     @patch("builtins.open", new_callable=mock_open, read_data="cpu")
@@ -103,33 +151,155 @@ class TestIntelCPU(unittest.TestCase):
 
         self.assertEqual(cpu.devices(), ["cpu:0", "cpu:1"])
 
-    @patch("os.path.join")
-    @patch("os.listdir")
     @patch("carbontracker.components.cpu.intel.IntelCPU._read_energy")
-    def test__get_measurements_permission_error(self, mock_read_energy, mock_listdir, mock_path_join):
-        mock_path_join.return_value = "/some/path"
+    def test__get_counters_permission_error(self, mock_read_energy):
         mock_read_energy.side_effect = PermissionError()
 
         cpu = IntelCPU(pids=[], devices_by_pid={})
-        cpu._rapl_devices = ["device1"]
+        cpu._energy_domains = [["/some/path"]]
         with self.assertRaises(exceptions.IntelRaplPermissionError):
-            cpu._get_measurements()
-
-    @patch("os.path.join")
-    @patch("os.listdir")
-    @patch("carbontracker.components.cpu.intel.IntelCPU._read_energy")
-    def test__get_measurements_file_not_found(self, mock_read_energy, mock_listdir, mock_path_join):
-        mock_path_join.return_value = "/some/path"
-        mock_read_energy.side_effect = [FileNotFoundError(), 1000000, 1000000, 1000000]
-        mock_listdir.return_value = ["intel-rapl:0", "intel-rapl:1"]
+            cpu._get_counters()
+
+    def test__get_counters_sums_subdomains(self):
+        with tempfile.TemporaryDirectory() as rapl_dir:
+            for domain, name, energy in (
+                ("intel-rapl:0", "package-0", None),
+                ("intel-rapl:0/intel-rapl:0:0", "core", "1000000"),
+                ("intel-rapl:0/intel-rapl:0:1", "dram", "1000000"),
+                ("intel-rapl:1", "package-1", "1000000"),
+                ("intel-rapl:2", "psys", "5000000"),
+            ):
+                os.makedirs(os.path.join(rapl_dir, domain))
+                with open(os.path.join(rapl_dir, domain, "name"), "w") as f:
+                    f.write(name)
+                if energy is not None:
+                    with open(os.path.join(rapl_dir, domain, "energy_uj"), "w") as f:
+                        f.write(energy)
+
+            with patch("carbontracker.components.cpu.intel.RAPL_DIR", rapl_dir):
+                cpu = IntelCPU(pids=[], devices_by_pid={})
+                cpu.init()
+                counters = cpu._get_counters()
 
+        self.assertEqual(cpu.devices(), ["cpu:0", "cpu:1"])
+        self.assertEqual(counters, [[1000000, 1000000], [1000000]])
+        zeros = [[0, 0], [0]]
+        energies = [cpu._energy_delta(*args) for args in zip(zeros, counters, cpu._max_energy_ranges)]
+        self.assertEqual(energies, [2000000, 1000000])
+
+    @patch("carbontracker.components.cpu.intel.time.sleep")
+    @patch("carbontracker.components.cpu.intel.time.monotonic")
+    @patch("carbontracker.components.cpu.intel.IntelCPU._get_counters")
+    def test_power_usage_counter_mode(self, mock_get_counters, mock_monotonic, mock_sleep):
+        mock_get_counters.side_effect = [[[1000000], [2000000]], [[21000000], [12000000]], [[31000000], [12000000]]]
+        mock_monotonic.side_effect = [100.0, 110.0, 115.0]
+
+        cpu = IntelCPU(pids=[], devices_by_pid={}, mode="counter")
+        cpu._energy_domains = [["/some/path"], ["/other/path"]]
+        cpu._devices = ["cpu:0", "cpu:1"]
+        cpu._max_energy_ranges = [[None], [None]]
+        cpu._last_time = mock_monotonic()
+        cpu._last_counters = mock_get_counters()
+
+        self.assertEqual(cpu.power_usage(), [2.0, 1.0])
+        self.assertEqual(cpu.power_usage(), [2.0, 0.0])
+        mock_sleep.assert_not_called()
+
+    @patch("carbontracker.components.cpu.intel.time.monotonic")
+    @patch("carbontracker.components.cpu.intel.IntelCPU._get_counters")
+    def test_power_usage_counter_mode_wraparound(self, mock_get_counters, mock_monotonic):
+        # Sampling every 100 s, the counter wraps between readings.
+        max_energy_range = 262143328850
+        mock_get_counters.side_effect = [[[max_energy_range - 5000000000]], [[15000000000]]]
+        mock_monotonic.side_effect = [0.0, 100.0]
+
+        cpu = IntelCPU(pids=[], devices_by_pid={}, mode="counter")
+        cpu._devices = ["cpu:0"]
+        cpu._max_energy_ranges = [[max_energy_range]]
+        cpu._last_time = mock_monotonic()
+        cpu._last_counters = mock_get_counters()
+
+        self.assertEqual(cpu.power_usage(), [200.0])
+
+    @patch("carbontracker.components.cpu.intel.IntelCPU._get_counters")
+    def test_power_usage_counter_mode_without_baseline(self, mock_get_counters):
+        mock_get_counters.side_effect = [exceptions.IntelRaplPermissionError(), [[1000000]]]
+
+        cpu = IntelCPU(pids=[], devices_by_pid={}, mode="counter")
+        with patch("carbontracker.components.cache.load", return_value={
+            "package_count": 1,
+            "devices": ["cpu:0"],
+            "energy_domains": [["/some/path"]],
+            "max_energy_ranges": [[None]],
+        }):
+            cpu.init()
+
+        self.assertIsNone(cpu._last_counters)
+        self.assertEqual(cpu.power_usage(), [0.0])
+        self.assertEqual(cpu._last_counters, [[1000000]])
+
+    def _create_rapl_dir(self, rapl_dir, packages=2):
+        for i in range(packages):
+            os.makedirs(os.path.join(rapl_dir, f"intel-rapl:{i}"))
+            for filename, content in (("name", f"package-{i}"), ("energy_uj", "1000000\n")):
+                with open(os.path.join(rapl_dir, f"intel-rapl:{i}", filename), "w") as f:
+                    f.write(content)
+
+    def test_energy_files_kept_open(self):
+        with tempfile.TemporaryDirectory() as rapl_dir:
+            self._create_rapl_dir(rapl_dir)
+            with patch("carbontracker.components.cpu.intel.RAPL_DIR", rapl_dir):
+                cpu = IntelCPU(pids=[], devices_by_pid={})
+                cpu.init()
+            self.assertEqual(len(cpu._energy_fds), 2)
+
+            with open(os.path.join(rapl_dir, "intel-rapl:1", "energy_uj"), "w") as f:
+                f.write("123456789012\n")
+            with patch("builtins.open") as mock_file:
+                self.assertEqual(cpu._get_counters(), [[1000000], [123456789012]])
+                mock_file.assert_not_called()
+
+            fds = [fd for device_fds in cpu._energy_fds for fd in device_fds]
+            cpu.shutdown()
+            self.assertIsNone(cpu._energy_fds)
+            for fd in fds:
+                with self.assertRaises(OSError):
+                    os.fstat(fd)
+
+    def test_energy_files_pread_fallback(self):
+        with tempfile.TemporaryDirectory() as rapl_dir:
+            self._create_rapl_dir(rapl_dir, packages=1)
+            with patch("carbontracker.components.cpu.intel.RAPL_DIR", rapl_dir):
+                cpu = IntelCPU(pids=[], devices_by_pid={})
+                cpu.init()
+            with patch("carbontracker.components.cpu.intel.os", wraps=os) as mock_os:
+                del mock_os.preadv
+                self.assertEqual(cpu._get_counters(), [[1000000]])
+            cpu.shutdown()
+
+    @patch("os.open", side_effect=PermissionError())
+    def test_energy_files_not_opened_without_permission(self, mock_os_open):
         cpu = IntelCPU(pids=[], devices_by_pid={})
-        cpu._rapl_devices = ["intel-rapl:0", "intel-rapl:1"]
-        cpu.parts_pattern = re.compile(r"intel-rapl:.")
-        measurements = cpu._get_measurements()
+        cpu._energy_domains = [["/some/path"]]
+        cpu._open_energy_files()
+        self.assertIsNone(cpu._energy_fds)
+
+    @patch("carbontracker.components.cpu.intel.IntelCPU._discover")
+    @patch("carbontracker.components.cache.load")
+    def test_init_cache_hit_skips_discovery(self, mock_load, mock_discover):
+        mock_load.return_value = {
+            "package_count": 1,
+            "devices": ["cpu:0"],
+            "energy_domains": [["/sys/class/powercap/intel-rapl:0"]],
+            "max_energy_ranges": [[262143328850]],
+        }
 
-        self.assertEqual(measurements, [2000000, 1000000])
+        cpu = IntelCPU(pids=[], devices_by_pid={})
+        cpu.init()
 
+        mock_discover.assert_not_called()
+        self.assertEqual(cpu.devices(), ["cpu:0"])
+        self.assertEqual(cpu._energy_domains, [["/sys/class/powercap/intel-rapl:0"]])
 
     def test_shutdown(self):
         cpu = IntelCPU(pids=[], devices_by_pid={})
@@ -1,11 +1,17 @@
 import sys
 import unittest
+from types import SimpleNamespace
 from unittest.mock import patch, MagicMock
+import numpy as np
 import pynvml
 from carbontracker import exceptions
+from carbontracker.components.gpu import nvidia
+from carbontracker.components.component import Component
 from carbontracker.components.gpu.nvidia import NvidiaGPU
 
 class PynvmlStub:
+    NVMLError = pynvml.NVMLError
+
     @staticmethod
     def nvmlInit():
         pass
@@ -47,6 +53,10 @@ class PynvmlStub:
 
 
 class TestNvidiaGPU(unittest.TestCase):
+    def tearDown(self):
+        # Reset the process-wide NVML session between tests.
+        nvidia._session_refs = 0
+
     @patch("carbontracker.components.gpu.nvidia.pynvml", new=PynvmlStub)
     def test_devices(self):
         gpu = NvidiaGPU(pids=[], devices_by_pid={})
@@ -114,6 +124,105 @@ class TestNvidiaGPU(unittest.TestCase):
         with self.assertRaises(exceptions.GPUPowerUsageRetrievalError):
             gpu.power_usage()
 
+    @patch("carbontracker.components.gpu.nvidia.time.monotonic", side_effect=[100.0, 110.0, 120.0])
+    @patch("carbontracker.components.gpu.nvidia.pynvml.nvmlDeviceGetPowerUsage", return_value=50000)
+    @patch("carbontracker.components.gpu.nvidia.pynvml.nvmlDeviceGetTotalEnergyConsumption")
+    def test_power_usage_counter_mode(self, mock_total_energy, mock_power_usage, mock_monotonic):
+        energies = {0: iter([1000000, 3000000, 3500000])}
+
+        def total_energy(handle):
+            if handle not in energies:
+                raise pynvml.NVMLError(pynvml.NVML_ERROR_NOT_SUPPORTED)
+            return next(energies[handle])
+
+        mock_total_energy.side_effect = total_energy
+        gpu = NvidiaGPU(pids=[], devices_by_pid={}, mode="counter")
+        gpu._handles = [0, 1]
+        gpu._last_time = mock_monotonic()
+        gpu._last_energies = [gpu._total_energy(handle) for handle in gpu._handles]
+
+        # The second GPU has no energy counter and falls back to polling.
+        self.assertEqual(gpu.power_usage(), [200.0, 50.0])
+        self.assertEqual(gpu.power_usage(), [50.0, 50.0])
+        self.assertEqual(mock_power_usage.call_count, 2)
+
+    @staticmethod
+    def _samples(*samples):
+        return pynvml.NVML_VALUE_TYPE_UNSIGNED_INT, [
+            SimpleNamespace(timeStamp=timestamp, sampleValue=SimpleNamespace(uiVal=value))
+            for timestamp, value in samples
+        ]
+
+    @patch("carbontracker.components.gpu.nvidia.pynvml.nvmlDeviceGetPowerUsage", return_value=50000)
+    @patch("carbontracker.components.gpu.nvidia.pynvml.nvmlDeviceGetSamples")
+    def test_power_samples(self, mock_get_samples, mock_power_usage):
+        gpu = NvidiaGPU(pids=[], devices_by_pid={}, mode="samples")
+        gpu._handles = [0]
+        gpu._last_sample_times = [1000000]
+        mock_get_samples.side_effect = [
+            self._samples((1000000, 90000), (1100000, 100000), (1050000, 120000)),
+            pynvml.NVMLError(pynvml.NVML_ERROR_NOT_FOUND),
+        ]
+
+        self.assertEqual(gpu.power_samples(), [[(1.05, 120.0), (1.1, 100.0)]])
+        mock_get_samples.assert_called_with(0, pynvml.NVML_TOTAL_POWER_SAMPLES, 1000000)
+        self.assertEqual(gpu._last_sample_times, [1100000])
+        self.assertEqual(gpu.power_samples(), [[]])
+        self.assertEqual(gpu._last_sample_times, [1100000])
+
+    @patch("carbontracker.components.gpu.nvidia.pynvml.nvmlDeviceGetPowerUsage", return_value=50000)
+    @patch("carbontracker.components.gpu.nvidia.pynvml.nvmlDeviceGetSamples")
+    def test_power_usage_samples_mode(self, mock_get_samples, mock_power_usage):
+        gpu = NvidiaGPU(pids=[], devices_by_pid={}, mode="samples")
+        gpu._handles = [0, 1, 2]
+        gpu._last_sample_times = [0, 0, 0]
+        mock_get_samples.side_effect = [
+            self._samples((50000, 100000), (100000, 200000)),
+            pynvml.NVMLError(pynvml.NVML_ERROR_NOT_FOUND),
+            pynvml.NVMLError(pynvml.NVML_ERROR_NOT_SUPPORTED),
+        ]
+
+        # GPUs without new samples or sample buffer fall back to polling.
+        self.assertEqual(gpu.power_usage(), [150.0, 50.0, 50.0])
+        self.assertEqual(gpu.power_range(), ([100.0, 50.0, 50.0], [200.0, 50.0, 50.0]))
+        self.assertEqual(gpu._last_sample_times, [100000, 0, None])
+        mock_get_samples.side_effect = [pynvml.NVMLError(pynvml.NVML_ERROR_NOT_FOUND)] * 2
+        gpu.power_usage()
+        self.assertEqual(mock_get_samples.call_count, 5)
+
+    @patch("carbontracker.components.gpu.nvidia.pynvml.nvmlDeviceGetSamples")
+    def test_samples_mode_spike_in_epoch_max(self, mock_get_samples):
+        gpu = NvidiaGPU(pids=[], devices_by_pid={}, mode="samples")
+        gpu._handles = [0]
+        gpu._last_sample_times = [0]
+        component = Component(name="gpu", pids=[], devices_by_pid={}, handler=gpu)
+        mock_get_samples.side_effect = [
+            self._samples((50000, 100000)),
+            self._samples(*[(100000 + i * 50000, 300000 if i == 10 else 100000) for i in range(20)]),
+            self._samples(*[(1100000 + i * 50000, 100000) for i in range(20)]),
+        ]
+        for _ in range(3):
+            component.collect_power_usage(epoch=1)
+
+        stats = component.epoch_statistics(1)
+        np.testing.assert_allclose(stats.mean, [105.0])
+        np.testing.assert_allclose(stats.min, [100.0])
+        np.testing.assert_allclose(stats.max, [300.0])
+
+    @patch("carbontracker.components.gpu.nvidia.pynvml.nvmlDeviceGetTotalEnergyConsumption", return_value=1000)
+    @patch("carbontracker.components.gpu.nvidia.pynvml.nvmlDeviceGetHandleByIndex", side_effect=lambda index: index)
+    @patch("carbontracker.components.gpu.nvidia.pynvml.nvmlDeviceGetCount", return_value=2)
+    @patch("carbontracker.components.gpu.nvidia.pynvml.nvmlDeviceGetName", return_value="GPU")
+    @patch("carbontracker.components.gpu.nvidia.pynvml.nvmlShutdown")
+    @patch("carbontracker.components.gpu.nvidia.pynvml.nvmlInit")
+    def test_init_counter_mode_primes_baseline(self, mock_init, mock_shutdown, mock_name, mock_count,
+                                               mock_handle, mock_total_energy):
+        gpu = NvidiaGPU(pids=[], devices_by_pid={}, mode="counter")
+        gpu.init()
+        self.assertEqual(gpu._last_energies, [1000, 1000])
+        self.assertIsNotNone(gpu._last_time)
+        gpu.shutdown()
+
     @patch("carbontracker.components.gpu.nvidia.pynvml.nvmlDeviceGetComputeRunningProcesses", return_value=[])
     @patch("carbontracker.components.gpu.nvidia.pynvml.nvmlDeviceGetGraphicsRunningProcesses", return_value=[])
     def test_get_handles_by_pid_no_gpus_running_processes(self, mock_nvmlDeviceGetComputeRunningProcesses, mock_nvmlDeviceGetGraphicsRunningProcesses):
@@ -132,5 +241,44 @@ class TestNvidiaGPU(unittest.TestCase):
         self.assertFalse(gpu.available())
 
 
+    @patch("carbontracker.components.gpu.nvidia.pynvml")
+    def test_available_keeps_session_for_init(self, mock_pynvml):
+        mock_pynvml.nvmlDeviceGetCount.return_value = 1
+        gpu = NvidiaGPU(pids=[], devices_by_pid={})
+        self.assertTrue(gpu.available())
+        gpu.init()
+
+        mock_pynvml.nvmlInit.assert_called_once()
+        mock_pynvml.nvmlDeviceGetCount.assert_called_once()
+        mock_pynvml.nvmlShutdown.assert_not_called()
+
+        gpu.shutdown()
+        mock_pynvml.nvmlShutdown.assert_called_once()
+        self.assertIsNone(gpu._handles)
+
+    @patch("carbontracker.components.gpu.nvidia.pynvml")
+    def test_unavailable_releases_session(self, mock_pynvml):
+        mock_pynvml.nvmlDeviceGetCount.return_value = 0
+        gpu = NvidiaGPU(pids=[], devices_by_pid={})
+        self.assertFalse(gpu.available())
+        mock_pynvml.nvmlShutdown.assert_called_once()
+        self.assertEqual(nvidia._session_refs, 0)
+
+    @patch("carbontracker.components.gpu.nvidia.pynvml")
+    def test_session_shared_between_handlers(self, mock_pynvml):
+        mock_pynvml.nvmlDeviceGetCount.return_value = 1
+        first = NvidiaGPU(pids=[], devices_by_pid={})
+        second = NvidiaGPU(pids=[], devices_by_pid={})
+        first.init()
+        second.init()
+        mock_pynvml.nvmlInit.assert_called_once()
+
+        first.shutdown()
+        first.shutdown()
+        mock_pynvml.nvmlShutdown.assert_not_called()
+        second.shutdown()
+        mock_pynvml.nvmlShutdown.assert_called_once()
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,130 @@
+import unittest
+
+import numpy as np
+
+from carbontracker.components.stats import DurationStats, EpochStats
+
+
+class TestEpochStats(unittest.TestCase):
+    def test_moments_and_extrema(self):
+        rng = np.random.default_rng(0)
+        samples = rng.uniform(0, 300, (1000, 3))
+        stats = EpochStats()
+        for i, power_usages in enumerate(samples):
+            stats.add(float(i), power_usages)
+
+        self.assertEqual(stats.count, 1000)
+        np.testing.assert_allclose(stats.mean, samples.mean(axis=0))
+        np.testing.assert_allclose(stats.variance, samples.var(axis=0))
+        np.testing.assert_allclose(stats.std, samples.std(axis=0))
+        np.testing.assert_array_equal(stats.min, samples.min(axis=0))
+        np.testing.assert_array_equal(stats.max, samples.max(axis=0))
+
+    def test_quantiles_estimated_from_sketch(self):
+        stats = EpochStats(sketch_size=256, seed=0)
+        for i in range(10000):
+            stats.add(float(i), [i % 100])
+
+        p50, p90 = stats.quantiles([0.5, 0.9])
+        self.assertAlmostEqual(p50[0], 50, delta=10)
+        self.assertAlmostEqual(p90[0], 90, delta=10)
+
+    def test_quantiles_exact_below_sketch_size(self):
+        stats = EpochStats(sketch_size=8)
+        for i, power_usage in enumerate([10, 20, 30]):
+            stats.add(float(i), [power_usage])
+
+        np.testing.assert_array_equal(stats.quantiles(0.5), [20])
+
+    def test_energy(self):
+        stats = EpochStats()
+        for timestamp, power_usages in [(0.0, [10, 0]), (1.0, [20, 0]), (3.0, [20, 20])]:
+            stats.add(timestamp, power_usages)
+
+        # 15 J between the first two and 60 J between the last two samples.
+        self.assertEqual(stats.energy, 75)
+        self.assertEqual(stats.first, (0.0, 10))
+        self.assertEqual(stats.last, (3.0, 40))
+
+    def test_include_range(self):
+        stats = EpochStats()
+        stats.add(0.0, [10, 20])
+        stats.include_range([5, 20], [10, 40])
+
+        np.testing.assert_array_equal(stats.mean, [10, 20])
+        np.testing.assert_array_equal(stats.min, [5, 20])
+        np.testing.assert_array_equal(stats.max, [10, 40])
+
+    def test_energy_step(self):
+        times, samples = [0.0, 1.0, 3.0], [[10, 0], [20, 0], [20, 20]]
+        stats = EpochStats(step=True)
+        for timestamp, power_usages in zip(times, samples):
+            stats.add(timestamp, power_usages)
+
+        # Every sample is held since the previous one: 20 J and 80 J.
+        self.assertEqual(stats.energy, 100)
+        self.assertEqual(stats.skeleton()[2].sum(), 100)
+        self.assertEqual(EpochStats.from_samples(np.array(times), np.array(samples), step=True).energy, 100)
+
+    def test_skeleton(self):
+        stats = EpochStats()
+        for i, power_usage in enumerate([10, 20, 30, 40]):
+            stats.add(float(i), [power_usage])
+
+        times, powers, energies = stats.skeleton()
+        np.testing.assert_array_equal(times, [0, 2, 3])
+        np.testing.assert_array_equal(powers, [10, 30, 40])
+        np.testing.assert_array_equal(energies, [40, 35])
+        self.assertEqual(energies.sum(), stats.energy)
+
+    def test_skeleton_few_samples(self):
+        stats = EpochStats()
+        self.assertEqual(len(stats.skeleton()[0]), 0)
+        stats.add(1.0, [10])
+        np.testing.assert_array_equal(stats.skeleton()[0], [1])
+        stats.add(2.0, [20])
+        times, powers, energies = stats.skeleton()
+        np.testing.assert_array_equal(times, [1, 2])
+        np.testing.assert_array_equal(energies, [15])
+
+    def test_from_samples(self):
+        rng = np.random.default_rng(0)
+        times = np.cumsum(rng.uniform(0.5, 1.5, 100))
+        samples = rng.uniform(0, 300, (100, 2))
+        stats = EpochStats()
+        for timestamp, power_usages in zip(times, samples):
+            stats.add(timestamp, power_usages)
+
+        batch = EpochStats.from_samples(times, samples)
+        self.assertEqual(batch.count, stats.count)
+        np.testing.assert_allclose(batch.mean, stats.mean)
+        np.testing.assert_allclose(batch.variance, stats.variance)
+        np.testing.assert_array_equal(batch.min, stats.min)
+        np.testing.assert_array_equal(batch.max, stats.max)
+        self.assertAlmostEqual(batch.energy, stats.energy)
+        for batch_array, array in zip(batch.skeleton(), stats.skeleton()):
+            np.testing.assert_allclose(batch_array, array)
+        self.assertEqual(EpochStats.from_samples(np.empty(0), np.empty((0, 2))).count, 0)
+
+    def test_empty(self):
+        stats = EpochStats()
+
+        self.assertIsNone(stats.variance)
+        self.assertIsNone(stats.std)
+        self.assertIsNone(stats.quantiles(0.5))
+
+
+class TestDurationStats(unittest.TestCase):
+    def test_add(self):
+        stats = DurationStats()
+        for duration in (0.5, 2.0, 1.0):
+            stats.add(duration)
+
+        self.assertEqual(stats.count, 3)
+        self.assertEqual(stats.total, 3.5)
+        self.assertEqual(stats.max, 2.0)
+        self.assertEqual(stats.last, 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
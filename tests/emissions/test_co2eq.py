@@ -1,5 +1,8 @@
 import unittest
-from carbontracker.emissions.conversion.co2eq import convert
+
+import numpy as np
+
+from carbontracker.emissions.conversion.co2eq import convert, convert_many
 
 class TestConversion(unittest.TestCase):
     def test_convert(self):
@@ -13,5 +16,21 @@ class TestConversion(unittest.TestCase):
         self.assertAlmostEqual(expected[0][0], actual[0][0], places=5)
         self.assertEqual(expected[0][1], actual[0][1])
 
+    def test_convert_out_of_range(self):
+        self.assertEqual(convert(-1), [])
+
+    def test_convert_many(self):
+        actual = convert_many([250, 500, -1])
+        self.assertEqual(list(actual), ['km travelled by car'])
+        np.testing.assert_allclose(actual['km travelled by car'][:2], [2.32558139535, 4.6511627907])
+        self.assertTrue(np.isnan(actual['km travelled by car'][2]))
+
+    def test_convert_many_matches_convert(self):
+        values = np.linspace(0, 1e6, 101)
+        actual = convert_many(values)
+        for i, value in enumerate(values):
+            for units, unit in convert(value):
+                self.assertAlmostEqual(actual[unit][i], units)
+
 if __name__ == '__main__':
     unittest.main()
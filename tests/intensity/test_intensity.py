@@ -1,17 +1,35 @@
+import csv
 import geocoder
 import unittest
 from unittest.mock import patch, MagicMock
 import numpy as np
-import pandas as pd
 import sys
 
 from carbontracker import constants
+from carbontracker.emissions.intensity import carbon_intensities
 from carbontracker.emissions.intensity import intensity
 
 from carbontracker.emissions.intensity.intensity import carbon_intensity
 
 
 class TestIntensity(unittest.TestCase):
+    @staticmethod
+    def _carbon_intensities_from_csv():
+        if sys.version_info < (3, 9):
+            import pkg_resources
+            path = pkg_resources.resource_filename("carbontracker", "data/carbon-intensities.csv")
+        else:
+            import importlib.resources
+            path = importlib.resources.files("carbontracker").joinpath("data", "carbon-intensities.csv")
+        with open(str(path), "r", newline="") as f:
+            return {
+                row["alpha-2"]: (int(row["Year"]), float(row["Carbon intensity of electricity (gCO2/kWh)"]))
+                for row in csv.DictReader(f)
+            }
+
+    def test_carbon_intensities_match_csv(self):
+        self.assertEqual(carbon_intensities.CARBON_INTENSITIES, self._carbon_intensities_from_csv())
+
     @patch("geocoder.ip")
     def test_get_default_intensity_success(self, mock_geocoder_ip):
         mock_location = MagicMock()
@@ -22,17 +40,7 @@ class TestIntensity(unittest.TestCase):
 
         result = intensity.get_default_intensity()
 
-        # importlib.resources.files was introduced in Python 3.9 and replaces deprecated pkg_resource.resources
-        if sys.version_info < (3,9):
-            import pkg_resources
-            carbon_intensities_df = pd.read_csv(pkg_resources.resource_filename("carbontracker", "data/carbon-intensities.csv"))
-        else:
-            import importlib.resources
-            ref = importlib.resources.files("carbontracker") / "data/carbon-intensities.csv"
-            with importlib.resources.as_file(ref) as path:
-                carbon_intensities_df = pd.read_csv(path)
-        intensity_row = carbon_intensities_df[carbon_intensities_df["alpha-2"] == mock_location.country].iloc[0]
-        expected_intensity = intensity_row["Carbon intensity of electricity (gCO2/kWh)"]
+        expected_intensity = self._carbon_intensities_from_csv()[mock_location.country][1]
 
         self.assertEqual(result["carbon_intensity"], expected_intensity)
         self.assertIn("Defaulted to average carbon intensity", result["description"])
@@ -47,18 +55,14 @@ class TestIntensity(unittest.TestCase):
         self.assertIn("Defaulted to average carbon intensity", result["description"])
 
     @patch("geocoder.ip")
-    @patch("pandas.read_csv")
-    def test_get_default_intensity_data_file_failure(
-            self, mock_read_csv, mock_geocoder_ip
-    ):
+    @patch("carbontracker.emissions.intensity.carbon_intensities.CARBON_INTENSITIES", {})
+    def test_get_default_intensity_data_file_failure(self, mock_geocoder_ip):
         mock_location = MagicMock()
         mock_location.ok = True
         mock_location.address = "Sample Address"
         mock_location.country = "US"
         mock_geocoder_ip.return_value = mock_location
 
-        mock_read_csv.side_effect = FileNotFoundError
-
         default_intensity = intensity.get_default_intensity()
 
         expected_description = (
@@ -70,18 +74,14 @@ class TestIntensity(unittest.TestCase):
         assert default_intensity["description"] == expected_description
 
     @patch("carbontracker.emissions.intensity.intensity.geocoder.ip")
-    @patch("carbontracker.emissions.intensity.intensity.pd.read_csv")
-    def test_CarbonIntensity_set_as_default(
-            self, mock_read_csv, mock_geocoder_ip
-    ):
+    @patch("carbontracker.emissions.intensity.carbon_intensities.CARBON_INTENSITIES", {})
+    def test_CarbonIntensity_set_as_default(self, mock_geocoder_ip):
         mock_location = MagicMock()
         mock_location.ok = True
         mock_location.address = "Sample Address"
         mock_location.country = "US"
         mock_geocoder_ip.return_value = mock_location
 
-        mock_read_csv.side_effect = FileNotFoundError
-
         default_intensity = intensity.get_default_intensity()
 
         expected_description = (
@@ -93,6 +93,29 @@ class TestIntensity(unittest.TestCase):
         self.assertEqual(default_intensity["description"], expected_description)
 
 
+    @patch("geocoder.ip")
+    def test_import_does_not_resolve_default_intensity(self, mock_geocoder_ip):
+        import importlib
+
+        try:
+            importlib.reload(intensity)
+            mock_geocoder_ip.assert_not_called()
+            self.assertIsNone(intensity.default_intensity)
+        finally:
+            importlib.reload(intensity)
+
+    @patch("carbontracker.emissions.intensity.intensity.get_default_intensity")
+    def test_resolve_default_intensity_memoized(self, mock_get_default_intensity):
+        mock_get_default_intensity.return_value = {"carbon_intensity": 100.0, "description": "Test"}
+
+        with patch("carbontracker.emissions.intensity.intensity.default_intensity", None):
+            first = intensity.resolve_default_intensity()
+            second = intensity.resolve_default_intensity()
+
+        self.assertIs(first, second)
+        self.assertEqual(first["carbon_intensity"], 100.0)
+        mock_get_default_intensity.assert_called_once()
+
     def test_CarbonIntensity_set_default_message(self):
         ci = intensity.CarbonIntensity(default=True)
         ci.set_default_message()
@@ -200,6 +223,37 @@ class TestIntensity(unittest.TestCase):
         self.assertFalse(result.success)
         self.assertIn("could not be fetched", result.message)
 
+    @patch("geocoder.ip")
+    @patch("carbontracker.emissions.intensity.fetchers.electricitymaps.ElectricityMap._api_key", "key")
+    @patch("carbontracker.emissions.intensity.fetchers.electricitymaps.ElectricityMap.carbon_intensity")
+    def test_carbon_intensity_durations(self, mock_electricity_map_carbon_intensity, mock_geocoder_ip):
+        mock_location = MagicMock()
+        mock_location.ok = True
+        mock_geocoder_ip.return_value = mock_location
+        mock_electricity_map_carbon_intensity.side_effect = Exception("Test Exception")
+
+        durations = {"geocoder": [1.0]}
+        default = {"carbon_intensity": 100.0, "description": "Test"}
+        with patch("carbontracker.emissions.intensity.intensity.default_intensity", default):
+            carbon_intensity(MagicMock(), durations=durations)
+
+        self.assertEqual(len(durations["geocoder"]), 2)
+        self.assertEqual(len(durations["ElectricityMap"]), 1)
+        self.assertGreaterEqual(durations["ElectricityMap"][0], 0)
+
+    @patch("geocoder.ip")
+    def test_carbon_intensity_durations_default_intensity(self, mock_geocoder_ip):
+        mock_geocoder_ip.return_value.ok = False
+
+        durations = {}
+        with patch("carbontracker.emissions.intensity.intensity.default_intensity", None):
+            carbon_intensity(MagicMock(), durations=durations)
+            carbon_intensity(MagicMock(), durations=durations)
+
+        # The default intensity is located once, the live intensity per call.
+        self.assertEqual(mock_geocoder_ip.call_count, 3)
+        self.assertEqual(len(durations["geocoder"]), 3)
+
     @patch("carbontracker.emissions.intensity.fetchers.carbonintensitygb.CarbonIntensityGB")
     @patch("carbontracker.emissions.intensity.intensity.geocoder.ip")
     def test_carbon_intensity_exception_carbonintensitygb(self, mock_geocoder, mock_carbonintensitygb):
@@ -1,10 +1,36 @@
+import time
 import unittest
 from unittest.mock import MagicMock, patch
 import numpy as np
 
 from carbontracker import exceptions
 from carbontracker.components.gpu import nvidia
-from carbontracker.components.component import Component, create_components, error_by_name
+from carbontracker.components.cpu import intel
+from carbontracker.components.component import Component, create_components, determine_handlers, error_by_name
+
+
+def add_epochs(component, epochs):
+    """Adds epochs of power usages sampled once per second to a component."""
+    timestamp = 0.0
+    for power_usages in epochs:
+        component._begin_epoch(len(component.epoch_stats) + 1)
+        for power_usage in power_usages:
+            component._add_sample(timestamp, power_usage)
+            timestamp += 1
+
+
+def make_handler(available, delay=0.0):
+    """Returns a handler class whose availability check takes delay seconds."""
+
+    class SlowHandler:
+        def __init__(self, pids, devices_by_pid, mode="power"):
+            pass
+
+        def available(self):
+            time.sleep(delay)
+            return available
+
+    return SlowHandler
 
 
 class TestComponent(unittest.TestCase):
@@ -42,41 +68,136 @@ class TestComponent(unittest.TestCase):
         handler_mock = MagicMock(power_usage=MagicMock(side_effect=exceptions.IntelRaplPermissionError))
         component = Component(name="cpu", pids=[], devices_by_pid={})
         component._handler = handler_mock
-        component.collect_power_usage(epoch=1)
-        self.assertEqual(component.power_usages, [[], [0]])
+        with patch("builtins.print") as mock_print:
+            component.collect_power_usage(epoch=1)
+            component.collect_power_usage(epoch=1)
+        self.assertEqual(component.samples.count, 0)
+        self.assertIsNone(component.average_power_usage(1))
+        mock_print.assert_called_once()
 
     def test_collect_power_usage_with_measurement(self):
         handler_mock = MagicMock(power_usage=MagicMock(return_value=1000))
         component = Component(name="cpu", pids=[], devices_by_pid={})
         component._handler = handler_mock
         component.collect_power_usage(epoch=1)
-        self.assertEqual(component.power_usages, [[1000]])
+        np.testing.assert_array_equal(component.epoch_samples(1)[1], [[1000]])
 
 
+    def test_collect_power_usage_records_duration(self):
+        component = Component(name="cpu", pids=[], devices_by_pid={})
+        component._handler = MagicMock(power_usage=MagicMock(side_effect=lambda: time.sleep(0.01) or [1]))
+        component.collect_power_usage(epoch=1)
+        component.collect_power_usage(epoch=1)
+        self.assertEqual(component.collection_durations.count, 2)
+        self.assertGreaterEqual(component.collection_durations.total, 0.02)
+        self.assertGreaterEqual(component.collection_durations.last, 0.01)
+
+        durations = component.take_collection_durations()
+        self.assertEqual(durations.count, 2)
+        self.assertGreaterEqual(durations.max, 0.01)
+        self.assertEqual(component.take_collection_durations().count, 0)
+        self.assertEqual(component.collection_durations.count, 2)
+
+    def test_collect_power_usage_records_timestamps(self):
+        component = Component(name="cpu", pids=[], devices_by_pid={})
+        component._handler = MagicMock(power_usage=MagicMock(side_effect=[[1, 2], [3, 4]]))
+        with patch("time.monotonic", side_effect=[10.0, 11.0, 20.0, 21.0]):
+            component.collect_power_usage(epoch=1)
+            component.collect_power_usage(epoch=1)
+        times, power_usages = component.samples.get()
+        np.testing.assert_array_equal(times, [10.5, 20.5])
+        np.testing.assert_array_equal(power_usages, [[1, 2], [3, 4]])
+
+    def test_collect_power_usage_counter_mode_timestamps_interval(self):
+        component = Component(name="cpu", pids=[], devices_by_pid={})
+        component._handler = MagicMock(mode="counter", power_usage=MagicMock(side_effect=[[5], [10], [20]]))
+        with patch("time.monotonic", side_effect=[10.0, 11.0, 20.0, 21.0, 30.0, 31.0]):
+            component.collect_power_usage(epoch=1)
+            component.collect_power_usage(epoch=1)
+            component.collect_power_usage(epoch=1)
+        times, power_usages = component.samples.get()
+        np.testing.assert_array_equal(times, [21.0, 31.0])
+        np.testing.assert_array_equal(power_usages, [[10], [20]])
+
     def test_collect_power_usage_with_measurement_but_no_epoch(self):
         power_collector = Component(name="cpu", pids=[], devices_by_pid={})
         power_collector._handler = MagicMock(power_usage=MagicMock(return_value=1000))
         power_collector.collect_power_usage(epoch=0)
-        assert len(power_collector.power_usages) == 0
+        assert len(power_collector.epoch_starts) == 0
+        assert power_collector.samples.count == 0
 
     def test_collect_power_usage_with_previous_measurement(self):
         power_collector = Component(name="cpu", pids=[], devices_by_pid={})
         power_collector._handler = MagicMock(power_usage=MagicMock(return_value=1000))
         power_collector.collect_power_usage(epoch=1)
         power_collector.collect_power_usage(epoch=3)
-        assert len(power_collector.power_usages) == 3
+        assert power_collector.epoch_starts == [0, 1, 1]
+        assert power_collector.average_power_usage(2) is None
+        np.testing.assert_array_equal(power_collector.average_power_usage(3), [1000])
+
 
+    def test_collect_power_usage_counter_mode_resets_baseline_on_new_epoch(self):
+        component = Component(name="cpu", pids=[], devices_by_pid={})
+        component._handler = MagicMock(mode="counter", power_usage=MagicMock(side_effect=[[5], [10], [20], [30]]))
+        component.collect_power_usage(epoch=1)
+        component.collect_power_usage(epoch=1)
+        component.collect_power_usage(epoch=2)
+        component.collect_power_usage(epoch=2)
+        np.testing.assert_array_equal(component.epoch_samples(1)[1], [[10]])
+        np.testing.assert_array_equal(component.epoch_samples(2)[1], [[30]])
+        self.assertEqual(component._handler.power_usage.call_count, 4)
+
+    def test_energy_usage_counter_mode_matches_counter(self):
+        # Power usage grows as t^2, so the counter reads t^3 / 3 J at time t.
+        def counter(t):
+            return t**3 / 3
+
+        collections = [[0.0, 1.0, 2.5, 4.0], [5.0, 7.0]]
+        epoch_bounds = [(0.0, 4.0), (4.0, 7.0)]
+        for streaming in (False, True):
+            component = Component(name="cpu", pids=[], devices_by_pid={}, streaming=streaming)
+            readings = []
+            previous = None
+            for t in [t for epoch in collections for t in epoch]:
+                readings.append([0.0 if previous is None else (counter(t) - counter(previous)) / (t - previous)])
+                previous = t
+            component._handler = MagicMock(mode="counter", power_usage=MagicMock(side_effect=readings))
+            times = iter([t for epoch in collections for t in epoch for _ in range(2)])
+            with patch("time.monotonic", side_effect=lambda: next(times)):
+                for _ in collections[0]:
+                    component.collect_power_usage(epoch=1)
+                # The last collection of epoch 1 is the baseline of epoch 2.
+                component.begin_epoch(2)
+                for _ in collections[1]:
+                    component.collect_power_usage(epoch=2)
+
+            expected = [counter(end) - counter(start) for start, end in epoch_bounds]
+            np.testing.assert_allclose(
+                component.energy_usage([4, 3], epoch_bounds), np.array(expected) / 3600000, rtol=1e-12
+            )
+
+    def test_begin_epoch_without_collection(self):
+        component = Component(name="cpu", pids=[], devices_by_pid={})
+        component._handler = MagicMock(mode="counter", power_usage=MagicMock(side_effect=[[5], [10]]))
+        component.begin_epoch(1)
+        component.collect_power_usage(epoch=1)
+        component.collect_power_usage(epoch=1)
+        np.testing.assert_array_equal(component.epoch_samples(1)[1], [[10]])
 
     def test_collect_power_usage_GPUPowerUsageRetrievalError(self):
         handler_mock = MagicMock(power_usage=MagicMock(side_effect=exceptions.GPUPowerUsageRetrievalError))
         component = Component(name="gpu", pids=[], devices_by_pid={})
         component._handler = handler_mock
-        component.collect_power_usage(epoch=1)
-        self.assertEqual(component.power_usages, [[], [0]])
+        with patch("builtins.print") as mock_print:
+            component.collect_power_usage(epoch=1)
+            component.collect_power_usage(epoch=1)
+            component.collect_power_usage(epoch=2)
+        self.assertEqual(component.samples.count, 0)
+        self.assertEqual(mock_print.call_count, 2)
 
     def test_energy_usage(self):
         component = Component(name="cpu", pids=[], devices_by_pid={})
-        component.power_usages = [[1000], [2000], [3000]]
+        add_epochs(component, [[[1000]], [[2000]], [[3000]]])
         epoch_times = [1, 2, 3]
         energy_usages = component.energy_usage(epoch_times)
         self.assertEqual(energy_usages, [0.0002777777777777778, 0.0011111111111111111, 0.0025])
@@ -84,7 +205,7 @@ class TestComponent(unittest.TestCase):
 
     def test_energy_usage_no_measurements(self):
         component = Component(name="cpu", pids=[], devices_by_pid={})
-        component.power_usages = [[]]
+        add_epochs(component, [[]])
         epoch_times = [1]
         energy_usages = component.energy_usage(epoch_times)
         self.assertEqual(energy_usages, [0])
@@ -92,14 +213,78 @@ class TestComponent(unittest.TestCase):
 
     def test_energy_usage_with_power_from_later_epoch(self):
         component = Component(name="cpu", pids=[], devices_by_pid={})
-        component.power_usages = [[1000], [2000], [3000]]
+        add_epochs(component, [[[1000]], [[2000]], [[3000]]])
         epoch_times = [1, 2, 3, 4]
         energy_usages = component.energy_usage(epoch_times)
         self.assertEqual(energy_usages, [0.0002777777777777778, 0.0011111111111111111, 0.0025, 0.0025])
 
+    def test_energy_usage_trapezoidal(self):
+        component = Component(name="cpu", pids=[], devices_by_pid={})
+        add_epochs(component, [[[5, 5], [10, 10], [10, 10], [20, 20]]])
+        epoch_bounds = [(0.5, 2.5), (3.0, 4.0), (-1.0, 0.0)]
+        energy_usages = component.energy_usage([2, 1, 1], epoch_bounds)
+        np.testing.assert_allclose(energy_usages, np.array([41.25, 40, 10]) / 3600000)
+
+    def test_energy_usage_trapezoidal_single_sample(self):
+        component = Component(name="cpu", pids=[], devices_by_pid={})
+        component._begin_epoch(1)
+        component._add_sample(5.0, [100])
+        energy_usages = component.energy_usage([2], [(0.0, 2.0)])
+        np.testing.assert_allclose(energy_usages, [200 / 3600000])
+
+    def test_energy_usage_keeps_closed_epochs_beyond_retention(self):
+        component = Component(name="cpu", pids=[], devices_by_pid={}, retention=4)
+        epoch_bounds = [(0.0, 2.0), (2.0, 4.0)]
+        add_epochs(component, [[[10], [10], [10]], [[20], [20]]])
+        component.close_epochs(epoch_bounds)
+        for timestamp in range(5, 9):
+            component._add_sample(timestamp, [20])
+
+        self.assertEqual(len(component.samples), 4)
+        energy_usages = component.energy_usage([2, 2], epoch_bounds)
+        np.testing.assert_allclose(energy_usages, np.array([20, 35]) / 3600000)
+        np.testing.assert_allclose(component.average_power_usage(2), [20])
+
+    def test_energy_usage_streaming_matches_samples(self):
+        rng = np.random.default_rng(0)
+        epoch_bounds, epochs, timestamp = [], [], 0.0
+        for samples in (5, 0, 1, 2, 9):
+            start = timestamp
+            times = np.sort(rng.uniform(start, start + 10, samples))
+            epochs.append([(t, rng.uniform(0, 100, 2)) for t in times])
+            timestamp += 10
+            epoch_bounds.append((start, timestamp))
+
+        components = [
+            Component(name="gpu", pids=[], devices_by_pid={}, streaming=streaming) for streaming in (False, True)
+        ]
+        for component in components:
+            for epoch, samples in enumerate(epochs, start=1):
+                component._begin_epoch(epoch)
+                for t, power_usages in samples:
+                    component._add_sample(t, power_usages)
+        components[1].close_epochs(epoch_bounds[:2])
+
+        self.assertIsNone(components[1].samples)
+        np.testing.assert_allclose(
+            components[1].energy_usage([10] * 5, epoch_bounds), components[0].energy_usage([10] * 5, epoch_bounds)
+        )
+
+    def test_epoch_statistics(self):
+        component = Component(name="cpu", pids=[], devices_by_pid={}, streaming=True)
+        add_epochs(component, [[[1, 10], [3, 30]], []])
+
+        stats = component.epoch_statistics(1)
+        np.testing.assert_array_equal(stats.mean, [2, 20])
+        np.testing.assert_array_equal(stats.min, [1, 10])
+        np.testing.assert_array_equal(stats.max, [3, 30])
+        np.testing.assert_array_equal(component.average_power_usage(1), [2, 20])
+        self.assertIsNone(component.epoch_statistics(2))
+        self.assertIsNone(component.epoch_statistics(3))
+
     def test_energy_usage_no_power(self):
         component = Component(name="cpu", pids=[], devices_by_pid={})
-        component.power_usages = [[], [], [], [], []]
+        add_epochs(component, [[], [], [], [], []])
         epoch_times = [1, 2, 3, 4, 5]
         energy_usages = component.energy_usage(epoch_times)
         expected_energy_usages = [0, 0, 0, 0, 0]
@@ -115,7 +300,8 @@ class TestComponent(unittest.TestCase):
 
         self.assertEqual(component.name, "gpu")
         self.assertEqual(component._handler, handler_mock)
-        self.assertEqual(component.power_usages, [])
+        self.assertEqual(component.samples.count, 0)
+        self.assertEqual(component.epoch_starts, [])
         self.assertEqual(component.cur_epoch, -1)
 
     def test_shutdown(self):
@@ -133,6 +319,78 @@ class TestComponent(unittest.TestCase):
         self.assertEqual(len(cpu), 1)
         self.assertEqual(len(all_components), 2)
 
+    def test_create_components_sampling_mode(self):
+        with patch('carbontracker.components.component.handlers_by_name', return_value=[intel.IntelCPU]), \
+                patch('carbontracker.components.cpu.intel.IntelCPU.available', return_value=True):
+            cpu = create_components("cpu", pids=[], devices_by_pid={}, sampling_mode="counter")
+        self.assertEqual(cpu[0].handler.mode, "counter")
+
+    def test_create_components_invalid_name(self):
+        with self.assertRaises(exceptions.ComponentNameError):
+            create_components("gpu,unknown", pids=[], devices_by_pid={})
+
+    def test_determine_handlers_concurrently(self):
+        handlers = {"gpu": [make_handler(True, delay=0.3)], "cpu": [make_handler(True, delay=0.3)]}
+        with patch("carbontracker.components.component.handlers_by_name", side_effect=handlers.get):
+            start = time.monotonic()
+            result = determine_handlers(["gpu", "cpu"], pids=[], devices_by_pid={})
+            duration = time.monotonic() - start
+
+        self.assertIsInstance(result["gpu"], handlers["gpu"][0])
+        self.assertIsInstance(result["cpu"], handlers["cpu"][0])
+        self.assertLess(duration, 0.55)
+
+    def test_determine_handlers_preference_order(self):
+        preferred, fallback = make_handler(True, delay=0.1), make_handler(True)
+        with patch("carbontracker.components.component.handlers_by_name", return_value=[preferred, fallback]):
+            result = determine_handlers(["gpu"], pids=[], devices_by_pid={})
+        self.assertIsInstance(result["gpu"], preferred)
+
+        unavailable, fallback = make_handler(False, delay=0.1), make_handler(True)
+        with patch("carbontracker.components.component.handlers_by_name", return_value=[unavailable, fallback]):
+            result = determine_handlers(["gpu"], pids=[], devices_by_pid={})
+        self.assertIsInstance(result["gpu"], fallback)
+
+    def test_determine_handlers_does_not_wait_for_less_preferred(self):
+        preferred, slow = make_handler(True), make_handler(True, delay=5)
+        with patch("carbontracker.components.component.handlers_by_name", return_value=[preferred, slow]):
+            start = time.monotonic()
+            result = determine_handlers(["gpu"], pids=[], devices_by_pid={})
+            self.assertLess(time.monotonic() - start, 1)
+        self.assertIsInstance(result["gpu"], preferred)
+
+    def test_determine_handlers_timeout(self):
+        slow, fallback = make_handler(True, delay=5), make_handler(True)
+        with patch("carbontracker.components.component.handlers_by_name", return_value=[slow, fallback]):
+            start = time.monotonic()
+            result = determine_handlers(["gpu"], pids=[], devices_by_pid={}, timeout=0.2)
+            self.assertLess(time.monotonic() - start, 1)
+        self.assertIsInstance(result["gpu"], fallback)
+
+        with patch("carbontracker.components.component.handlers_by_name", return_value=[slow]):
+            result = determine_handlers(["gpu"], pids=[], devices_by_pid={}, timeout=0.2)
+        self.assertIsNone(result["gpu"])
+
+    def test_determine_handlers_releases_unselected(self):
+        preferred, fallback = MagicMock(), MagicMock()
+        preferred.return_value.available.return_value = True
+        fallback.return_value.available.return_value = True
+        with patch("carbontracker.components.component.handlers_by_name", return_value=[preferred, fallback]):
+            result = determine_handlers(["gpu"], pids=[], devices_by_pid={})
+
+        self.assertIs(result["gpu"], preferred.return_value)
+        deadline = time.monotonic() + 1
+        while not fallback.return_value.shutdown.called and time.monotonic() < deadline:
+            time.sleep(0.01)
+        fallback.return_value.shutdown.assert_called_once()
+        preferred.return_value.shutdown.assert_not_called()
+
+    def test_determine_handlers_probe_error(self):
+        failing = MagicMock(side_effect=RuntimeError("Probe failed"))
+        with patch("carbontracker.components.component.handlers_by_name", return_value=[failing]):
+            with self.assertRaises(RuntimeError):
+                determine_handlers(["gpu"], pids=[], devices_by_pid={})
+
     def test_error_by_name(self):
         self.assertEqual(str(error_by_name('gpu')), str(exceptions.GPUError('No GPU(s) available.')))
         self.assertEqual(str(error_by_name('cpu')), str(exceptions.CPUError('No CPU(s) available.')))
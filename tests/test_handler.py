@@ -22,6 +22,13 @@ class TestHandler(unittest.TestCase):
         with self.assertRaises(NotImplementedError):
             self.handler.init()
 
+    def test_mode(self):
+        self.assertEqual(self.handler.mode, "power")
+
+    def test_unsupported_mode_falls_back_to_power(self):
+        handler = Handler(pids=[], devices_by_pid={}, mode="counter")
+        self.assertEqual(handler.mode, "power")
+
     def test_shutdown_raises_not_implemented(self):
         with self.assertRaises(NotImplementedError):
             self.handler.shutdown()
@@ -0,0 +1,89 @@
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import unittest
+
+from carbontracker import lazyutil
+from carbontracker.components.cpu.intel import IntelCPU
+
+
+class TestLazyUtil(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        with open(os.path.join(self.tmp_dir.name, "lazy_test_module.py"), "w") as f:
+            f.write(
+                "import builtins, time\n"
+                "builtins.lazy_test_module_executed = getattr(builtins, 'lazy_test_module_executed', 0) + 1\n"
+                "time.sleep(0.05)\n"
+                "VALUE = 42\n"
+            )
+        sys.path.insert(0, self.tmp_dir.name)
+
+    def tearDown(self):
+        sys.path.remove(self.tmp_dir.name)
+        sys.modules.pop("lazy_test_module", None)
+        import builtins
+
+        if hasattr(builtins, "lazy_test_module_executed"):
+            del builtins.lazy_test_module_executed
+        self.tmp_dir.cleanup()
+
+    def test_lazy_import_defers_execution(self):
+        import builtins
+
+        module = lazyutil.lazy_import("lazy_test_module")
+        self.assertIs(sys.modules["lazy_test_module"], module)
+        self.assertFalse(hasattr(builtins, "lazy_test_module_executed"))
+
+        self.assertEqual(module.VALUE, 42)
+        self.assertTrue(builtins.lazy_test_module_executed)
+
+    def test_lazy_import_concurrent_access(self):
+        import builtins
+
+        module = lazyutil.lazy_import("lazy_test_module")
+        results = []
+
+        def access():
+            try:
+                results.append(module.VALUE)
+            except AttributeError as e:
+                results.append(e)
+
+        threads = [threading.Thread(target=access) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, [42] * 8)
+        self.assertEqual(builtins.lazy_test_module_executed, 1)
+
+    def test_lazy_import_returns_imported_module(self):
+        self.assertIs(lazyutil.lazy_import("os"), os)
+
+    def test_lazy_import_missing_module(self):
+        with self.assertRaises(ModuleNotFoundError):
+            lazyutil.lazy_import("carbontracker_nonexistent_module")
+
+    def test_import_object(self):
+        self.assertIs(lazyutil.import_object("carbontracker.components.cpu.intel.IntelCPU"), IntelCPU)
+
+    def test_import_tracker_does_not_load_optional_dependencies(self):
+        code = (
+            "import sys, types\n"
+            "import carbontracker.tracker\n"
+            "lazy = ['pynvml', 'geocoder', 'requests', 'pandas', 'psutil',\n"
+            "        'carbontracker.components.gpu.nvidia',\n"
+            "        'carbontracker.emissions.intensity.fetchers.electricitymaps']\n"
+            "loaded = [m for m in lazy if type(sys.modules.get(m)) is types.ModuleType]\n"
+            "print(','.join(loaded))\n"
+        )
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        self.assertEqual(output.stdout.strip(), "")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,200 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, Mock, call, patch
+
+import numpy as np
+
+from carbontracker import sampler
+from carbontracker.components.component import Component
+
+
+class ThreadProcess:
+    """Stands in for the sampler process by serving in a thread."""
+
+    def __init__(self, args, **kwargs):
+        commands_r, commands_w = os.pipe()
+        messages_r, messages_w = os.pipe()
+        self.stdin = open(commands_w, "w")
+        self.stdout = open(messages_r)
+        self.returncode = None
+        self._thread = threading.Thread(
+            target=self._serve, args=(json.loads(args[-1]), open(commands_r), open(messages_w, "w")), daemon=True
+        )
+        self._thread.start()
+
+    def _serve(self, config, commands, messages):
+        with commands, messages:
+            sampler.serve(config, commands, messages, Mock())
+        self.returncode = 0
+
+    def poll(self):
+        return self.returncode
+
+    def wait(self, timeout=None):
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            raise subprocess.TimeoutExpired("sampler", timeout)
+        return self.returncode
+
+    def kill(self):
+        pass
+
+
+def make_component(name, power_usage, available=True):
+    handler = MagicMock(mode="power") if available else None
+    if available:
+        handler.devices.return_value = ["Device"]
+        handler.power_usage.return_value = [power_usage]
+    return Component(name=name, pids=[], devices_by_pid=False, handler=handler, retention=1)
+
+
+@patch("carbontracker.sampler.resource_tracker")
+@patch("carbontracker.sampler.subprocess.Popen", ThreadProcess)
+class TestSamplerProcess(unittest.TestCase):
+    def setUp(self):
+        self.logger = Mock()
+        self.delete = Mock()
+
+    def _create(self, ignore_errors=False):
+        return sampler.SamplerProcess(
+            components="gpu,cpu",
+            pids=[],
+            devices_by_pid=False,
+            logger=self.logger,
+            ignore_errors=ignore_errors,
+            delete=self.delete,
+            update_interval=0.01,
+            retention=64,
+        )
+
+    def _wait_for(self, condition, timeout=5):
+        deadline = time.monotonic() + timeout
+        while not condition():
+            if time.monotonic() > deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    @patch("carbontracker.sampler.component.create_components")
+    def test_samples_into_shared_memory(self, mock_create_components, mock_resource_tracker):
+        mock_create_components.return_value = [make_component("gpu", 100), make_component("cpu", 10)]
+        process = self._create()
+        process.start()
+        self.addCleanup(process.stop)
+        self.assertTrue(self._wait_for(lambda: len(process.components) == 2))
+
+        process.epoch_start()
+        gpu, cpu = process.components
+        self.assertTrue(self._wait_for(lambda: gpu.samples.count >= 3 and cpu.samples.count >= 3))
+        process.epoch_end()
+        self.assertTrue(self._wait_for(lambda: gpu.latest_sample_time() >= process.epoch_bounds[-1][1]))
+
+        # Samples are read from shared memory without copying.
+        times, power_usages = gpu.samples.get()
+        self.assertFalse(times.flags.owndata)
+        self.assertEqual(power_usages[0, 0], 100)
+        ((start, end),) = process.epoch_bounds
+        energy = gpu.energy_usage(process.epoch_times, process.epoch_bounds)[0] * 3600000
+        self.assertAlmostEqual(energy, 100 * (end - start))
+        # Logged once the sampler has sampled the boundary.
+        logged = call("Average power usage (W) for gpu: [100.]")
+        self.assertTrue(self._wait_for(lambda: logged in self.logger.info.call_args_list))
+
+        process.stop()
+        self.assertFalse(process.is_alive())
+        # Samples are kept after the shared memory is released.
+        self.assertEqual(process._shared_memory, [])
+        self.assertGreaterEqual(gpu.samples.count, 3)
+        # Overhead includes the handler calls in the sampler process.
+        logged = [args[0] for args, _ in self.logger.info.call_args_list]
+        self.assertTrue(any(line.startswith("Overhead of epoch 1 for gpu: ") for line in logged))
+        self.assertTrue(any(line.startswith("Overhead of monitoring for gpu: ") for line in logged))
+        energy = cpu.energy_usage(process.epoch_times, process.epoch_bounds)[0] * 3600000
+        self.assertAlmostEqual(energy, 10 * (end - start))
+        self.delete.assert_not_called()
+
+    @patch("carbontracker.sampler.component.create_components")
+    def test_no_components_available(self, mock_create_components, mock_resource_tracker):
+        mock_create_components.return_value = [make_component("gpu", 100, available=False)]
+        process = self._create(ignore_errors=True)
+        process.start()
+        process.join(5)
+
+        self.delete.assert_called_once()
+        self.assertIn("NoComponentsAvailableError", self.logger.err_critical.call_args[0][0])
+
+    @patch("carbontracker.sampler.component.create_components")
+    def test_stop_before_start(self, mock_create_components, mock_resource_tracker):
+        process = self._create()
+        process.stop()
+
+        mock_create_components.assert_not_called()
+        self.assertFalse(process.running)
+
+
+class TestSamplerSubprocess(unittest.TestCase):
+    """Runs the actual sampler process with fake GPUs, installed by a
+    sitecustomize module found through the sys.path passed on to it."""
+
+    def test_samples_into_shared_memory(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        with open(os.path.join(tmp_dir.name, "sitecustomize.py"), "w") as f:
+            f.write("from benchmarks import fakes\n\nfakes.install(device_count=1)\n")
+        logger = Mock()
+        delete = Mock()
+        process = sampler.SamplerProcess(
+            components="gpu",
+            pids=[],
+            devices_by_pid=False,
+            logger=logger,
+            ignore_errors=True,
+            delete=delete,
+            update_interval=0.01,
+            retention=64,
+        )
+        with patch.object(sys, "path", [tmp_dir.name] + sys.path):
+            process.start()
+        self.addCleanup(process.stop)
+
+        deadline = time.monotonic() + 30
+        while not process.components and process.is_alive() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual([comp.name for comp in process.components], ["gpu"])
+        process.epoch_start()
+        gpu = process.components[0]
+        while gpu.samples.count < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        process.epoch_end()
+        process.stop()
+
+        self.assertGreaterEqual(gpu.samples.count, 3)
+        np.testing.assert_allclose(gpu.samples.get()[1][:, 0], 150)
+        self.assertEqual(process._shared_memory, [])
+        self.assertIsNone(process._process)
+        logger.err_critical.assert_not_called()
+        delete.assert_not_called()
+        logger.info.assert_any_call("Average power usage (W) for gpu: [150.]")
+
+
+class TestServe(unittest.TestCase):
+    @patch("carbontracker.sampler.component.create_components")
+    def test_replies_error(self, mock_create_components):
+        mock_create_components.side_effect = ValueError("Test Exception")
+        messages = Mock()
+        config = {"components": "gpu", "pids": [], "devices_by_pid": False, "sampling_mode": "power"}
+
+        sampler.serve(config, Mock(), messages, Mock())
+
+        message = json.loads(messages.write.call_args[0][0])
+        self.assertIn("Test Exception", message["error"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,12 +4,20 @@ import time
 import traceback
 import unittest
 from unittest import mock, skipIf
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import Mock, patch, MagicMock, call
 from threading import Event
 import numpy as np
 
 from carbontracker import exceptions, constants
-from carbontracker.tracker import CarbonIntensityThread, CarbonTrackerThread, CarbonTracker
+from carbontracker.components.component import Component
+from carbontracker.components.stats import DurationStats
+from carbontracker.tracker import (
+    STOP_TIMEOUT,
+    CarbonIntensityThread,
+    CarbonTrackerThread,
+    CarbonTracker,
+    DisabledCarbonTracker,
+)
 from carbontracker.components.gpu import nvidia
 from carbontracker.components.cpu import intel
 
@@ -23,6 +31,7 @@ class TestCarbonIntensityThread(unittest.TestCase):
         thread = CarbonIntensityThread(self.logger, self.stop_event)
         self.assertEqual(thread.name, "CarbonIntensityThread")
         self.assertEqual(thread.daemon, True)
+        self.assertFalse(thread.is_alive())
 
     @patch("carbontracker.tracker.intensity")
     def test_fetch_carbon_intensity_success(self, mock_intensity):
@@ -102,11 +111,29 @@ class TestCarbonIntensityThread(unittest.TestCase):
 
         mock_logger = MagicMock()
         stop_event = threading.Event()
-        CarbonIntensityThread(mock_logger, stop_event, update_interval)
+        CarbonIntensityThread(mock_logger, stop_event, update_interval).start()
         time.sleep(wait_duration)
+        stop_event.set()
 
         assert mock_fetch_carbon_intensity.call_count > 1
 
+    @patch("carbontracker.tracker.intensity.carbon_intensity")
+    def test_run_logs_overhead(self, mock_carbon_intensity):
+        def fetch(logger, durations):
+            durations.setdefault("ElectricityMap", []).append(0.5)
+            return MagicMock(success=False)
+
+        mock_carbon_intensity.side_effect = fetch
+        mock_logger = MagicMock()
+        stop_event = threading.Event()
+        stop_event.set()
+
+        CarbonIntensityThread(mock_logger, stop_event).run()
+
+        mock_logger.info.assert_any_call(
+            "Overhead of carbon intensity from ElectricityMap: 1 call(s) taking 0.500000 s, max 0.500000 s."
+        )
+
     @patch("carbontracker.tracker.intensity.carbon_intensity")
     def test_average_carbon_intensity_empty_intensities(self, mock_carbon_intensity):
         mock_logger = MagicMock()
@@ -117,6 +144,8 @@ class TestCarbonIntensityThread(unittest.TestCase):
         thread.average_carbon_intensity()
 
         assert len(thread.carbon_intensities) == 1
+        # Fetches of the calling thread are not overhead of the thread.
+        mock_carbon_intensity.assert_called_once_with(mock_logger)
 
 
 class TestCarbonTrackerThread(unittest.TestCase):
@@ -128,6 +157,8 @@ class TestCarbonTrackerThread(unittest.TestCase):
 
         for component in self.mock_components:
             component.available.return_value = True
+            component.collection_durations = DurationStats()
+            component.take_collection_durations.side_effect = DurationStats
 
         self.mock_logger = MagicMock(name="Logger")
         self.mock_delete = MagicMock(name="Delete")
@@ -135,9 +166,11 @@ class TestCarbonTrackerThread(unittest.TestCase):
         self.thread = CarbonTrackerThread(
             self.mock_components, self.mock_logger, False, self.mock_delete, update_interval=0.1
         )
+        self.thread.start()
 
     def tearDown(self):
         self.thread.running = False
+        self.thread.join()
         self.thread.measuring = False
         self.thread.epoch_counter = 0
         self.thread.epoch_times = []
@@ -183,6 +216,29 @@ class TestCarbonTrackerThread(unittest.TestCase):
         self.assertEqual(thread.epoch_times, [])
         self.assertEqual(thread.running, True)
         self.assertEqual(thread.daemon, True)
+        self.assertFalse(thread.is_alive())
+
+    def test_stop_not_started_shuts_down_components(self):
+        mock_components = [MagicMock(name="Component1"), MagicMock(name="Component2")]
+        thread = CarbonTrackerThread(mock_components, MagicMock(name="Logger"), False, MagicMock(name="Delete"))
+
+        thread.stop()
+
+        self.assertFalse(thread.running)
+        for component in mock_components:
+            component.shutdown.assert_called_once()
+
+    def test_stop_not_started_with_unavailable_component(self):
+        handler = MagicMock(mode="power")
+        components = [
+            Component(name="gpu", pids=[], devices_by_pid={}, handler=None),
+            Component(name="cpu", pids=[], devices_by_pid={}, handler=handler),
+        ]
+        thread = CarbonTrackerThread(components, MagicMock(name="Logger"), False, MagicMock(name="Delete"))
+
+        thread.stop()
+
+        handler.shutdown.assert_called_once()
 
     def test_run_with_exception_ignore_errors(self):
         self.thread._components_remove_unavailable = MagicMock()
@@ -227,9 +283,19 @@ class TestCarbonTrackerThread(unittest.TestCase):
         self.assertTrue(self.thread.epoch_times)
         self.assertAlmostEqual(self.thread.epoch_times[-1], 1, delta=0.1)
 
+    def test_epoch_bounds(self):
+        self.thread.epoch_start()
+        time.sleep(0.05)
+        self.thread.epoch_end()
+
+        self.assertEqual(len(self.thread.epoch_bounds), 1)
+        start, end = self.thread.epoch_bounds[0]
+        self.assertGreaterEqual(end - start, 0.05)
+        self.assertLessEqual(end, time.monotonic())
+
     def test_epoch_end_too_short(self):
-        mock_component = MagicMock(name="Component")
-        mock_component.power_usages = []
+        mock_component = self.mock_components[0]
+        mock_component.epoch_statistics.return_value = None
 
         self.thread.components = [mock_component]
 
@@ -240,8 +306,156 @@ class TestCarbonTrackerThread(unittest.TestCase):
 
         self.assertTrue(self.thread.epoch_times)
         self.assertIsNotNone(self.thread.epoch_times[-1])
+        self.assertTrue(self._wait_for(lambda: self.mock_logger.err_warn.called))
         self.mock_logger.err_warn.assert_called_with("Epoch duration is too short for a measurement to be collected.")
 
+    def test_log_epoch_measurements(self):
+        comp = Component(name="cpu", pids=[], devices_by_pid={}, handler=MagicMock(), streaming=True)
+        comp._begin_epoch(1)
+        for timestamp, power_usage in enumerate([10, 20, 30]):
+            comp._add_sample(timestamp, [power_usage])
+        self.thread.components = [comp]
+        self.thread.epoch_times = [1.0]
+
+        self.thread._log_epoch_measurements(1)
+
+        self.mock_logger.info.assert_any_call("Average power usage (W) for cpu: [20.]")
+        self.mock_logger.info.assert_any_call(
+            "Power usage (W) for cpu: min [10.], max [30.], std [8.16496581], p50 [20.], p90 [28.], p99 [29.8]"
+        )
+
+    def test_log_effective_sample_rate(self):
+        comp = Component(name="cpu", pids=[], devices_by_pid={}, handler=MagicMock(), streaming=True)
+        comp._begin_epoch(1)
+        for timestamp in range(4):
+            comp._add_sample(timestamp, [10])
+        self.thread.components = [comp]
+        self.thread.epoch_times = [2.0]
+        self.thread.adaptive_sampling = {}
+
+        self.thread._log_epoch_measurements(1)
+
+        self.mock_logger.info.assert_any_call("Effective sample rate (Hz) for cpu: 2.000")
+
+    def test_log_epoch_overhead(self):
+        comp = Component(name="cpu", pids=[], devices_by_pid={}, handler=MagicMock())
+        comp._recent_collection_durations.add(0.5)
+        comp._recent_collection_durations.add(0.25)
+        self.thread.components = [comp]
+        self.thread.epoch_times = [1.0]
+        self.thread._cpu_times = {0: 2.0}
+
+        self.thread._log_epoch_measurements(1)
+
+        self.mock_logger.info.assert_any_call(
+            "Overhead of epoch 1 for cpu: 2 sample(s), handler time 0.750000 s, max 0.500000 s per call."
+        )
+        self.assertGreaterEqual(self.thread._overhead_cpu_time, 2.0)
+        # Only the calls since the previous epoch's overhead are counted.
+        self.assertEqual(comp._recent_collection_durations.count, 0)
+
+    def test_run_logs_overhead(self):
+        self.thread.stop()
+        self.thread.join()
+
+        self.assertTrue(any(
+            args[0].startswith("Overhead of monitoring: CPU time") for args, _ in self.mock_logger.info.call_args_list
+        ))
+
+    def test_workers_record_cpu_time(self):
+        self.assertTrue(self._wait_for(lambda: len(self.thread._worker_queues) == 2))
+        self.thread._collect_measurements()
+
+        # The thread and both of its workers.
+        self.assertTrue(self._wait_for(lambda: len(self.thread._cpu_times) == 3))
+        self.assertGreater(self.thread.cpu_time(), 0)
+
+    def test_epoch_end_logs_epoch_after_boundary_sample(self):
+        handler = MagicMock(mode="power")
+        handler.power_usage.side_effect = [[10], [30]]
+        comp = Component(name="cpu", pids=[], devices_by_pid={}, handler=handler)
+        thread = CarbonTrackerThread([comp], self.mock_logger, False, self.mock_delete, update_interval=100)
+        thread.start()
+        self.addCleanup(thread.stop)
+        thread.epoch_start()
+        self.assertTrue(self._wait_for(lambda: handler.power_usage.call_count == 1))
+
+        thread.epoch_end()
+
+        self.assertTrue(self._wait_for(lambda: handler.power_usage.call_count == 2))
+        self.assertTrue(self._wait_for(lambda: self.mock_logger.info.call_count >= 4))
+        self.mock_logger.info.assert_any_call("Epoch 1:")
+        self.mock_logger.info.assert_any_call("Average power usage (W) for cpu: [20.]")
+
+    def test_epoch_start_before_boundary_sample(self):
+        handler = MagicMock(mode="counter")
+        handler.power_usage.side_effect = [[5], [10], [20], [30]]
+        comp = Component(name="cpu", pids=[], devices_by_pid={}, handler=handler)
+        thread = CarbonTrackerThread([comp], self.mock_logger, False, self.mock_delete, update_interval=100)
+        thread.epoch_start()
+        thread._collect_measurements()
+        thread._collect_measurements()
+
+        # The next epoch begins before the thread wakes up to the ended one.
+        thread.epoch_end()
+        thread.epoch_start()
+        began = thread._log_ended_epochs([1], thread.measuring_event.is_set())
+        thread._collect_measurements()
+
+        self.assertTrue(began)
+        self.assertEqual(handler.power_usage.call_count, 4)
+        np.testing.assert_array_equal(comp.epoch_samples(1)[1], [[10], [20]])
+        np.testing.assert_array_equal(comp.epoch_samples(2)[1], [[30]])
+        self.mock_logger.info.assert_any_call("Epoch 1:")
+
+    def test_epochs_ended_before_stop_are_logged(self):
+        self.thread.epoch_start()
+        self.thread.epoch_end()
+        self.thread.stop()
+
+        # Logged by the time stop() returns and before the thread ends.
+        logged = [args[0] for args, _ in self.mock_logger.info.call_args_list]
+        self.assertLess(logged.index("Epoch 1:"), logged.index("Monitoring thread ended."))
+        self.assertFalse(self.thread.is_alive())
+
+    def test_stop_interrupts_components(self):
+        self.thread.stop()
+
+        for component in self.mock_components:
+            component.interrupt.assert_called_once()
+
+    @patch("carbontracker.tracker.STOP_TIMEOUT", 0.1)
+    def test_stop_does_not_wait_for_hanging_thread(self):
+        release = Event()
+        self.addCleanup(release.set)
+        handler = MagicMock(mode="power")
+        handler.power_usage.side_effect = lambda: release.wait() and [10]
+        comp = Component(name="cpu", pids=[], devices_by_pid={}, handler=handler)
+        thread = CarbonTrackerThread([comp], self.mock_logger, False, self.mock_delete)
+        thread.start()
+        thread.epoch_start()
+        self.assertTrue(self._wait_for(lambda: handler.power_usage.called))
+
+        thread.stop()
+
+        self.assertTrue(thread.is_alive())
+        self.mock_logger.err_warn.assert_called_with("Monitoring thread did not stop in time.")
+
+    def test_adaptive_sampling_interval(self):
+        handler = MagicMock(mode="power")
+        handler.power_usage.side_effect = [[100], [200], [100]]
+        comp = Component(name="cpu", pids=[], devices_by_pid={}, handler=handler)
+        thread = CarbonTrackerThread(
+            [comp], self.mock_logger, False, self.mock_delete, update_interval=8, adaptive_sampling={}
+        )
+        thread.epoch_counter = 1
+
+        self.assertEqual(thread.sampling_interval(comp), 8)
+        for _ in range(3):
+            thread._collect_measurements()
+
+        self.assertEqual(thread.sampling_interval(comp), 2)
+
     def test_no_components_available(self):
         self.thread.components = []
 
@@ -253,15 +467,18 @@ class TestCarbonTrackerThread(unittest.TestCase):
         mock_component1.energy_usage.return_value = np.array([1.0, 2.0, 3.0])
         mock_component2 = MagicMock(name="Component2")
         mock_component2.energy_usage.return_value = np.array([2.0, 3.0, 4.0])
+        # Not started s.t. the bare mocks are not logged when it stops.
+        thread = CarbonTrackerThread(
+            [mock_component1, mock_component2], self.mock_logger, False, self.mock_delete, update_interval=0.1
+        )
 
-        self.thread.components = [mock_component1, mock_component2]
-
-        self.thread.epoch_times = [1.0, 1.0, 1.0]
+        thread.epoch_times = [1.0, 1.0, 1.0]
 
-        total_energy = self.thread.total_energy_per_epoch()
+        total_energy = thread.total_energy_per_epoch()
 
         expected_total_energy = np.array([3.0, 5.0, 7.0]) * constants.PUE_2022
         np.testing.assert_array_equal(total_energy, expected_total_energy)
+        mock_component1.energy_usage.assert_called_once_with(thread.epoch_times, thread.epoch_bounds)
 
 
     @mock.patch('os._exit')
@@ -289,12 +506,106 @@ class TestCarbonTrackerThread(unittest.TestCase):
 
         mock_os_exit.assert_called_with(70)
 
+    def _wait_for(self, condition, timeout=2):
+        deadline = time.monotonic() + timeout
+        while not condition() and time.monotonic() < deadline:
+            time.sleep(0.001)
+        return condition()
+
+    def test_stop_wakes_thread(self):
+        self.thread.update_interval = 100
+        self.thread.epoch_start()
+        self.assertTrue(self._wait_for(lambda: self.mock_components[0].collect_power_usage.called))
+
+        start = time.monotonic()
+        self.thread.stop()
+        self.thread.join(2)
+
+        self.assertFalse(self.thread.is_alive())
+        self.assertLess(time.monotonic() - start, 1)
+        for component in self.mock_components:
+            component.shutdown.assert_called_once()
+
+    def test_update_interval_change_wakes_thread(self):
+        self.thread.update_interval = 100
+        self.thread.epoch_start()
+        self.assertTrue(self._wait_for(lambda: self.mock_components[0].collect_power_usage.call_count == 1))
+
+        self.thread.update_interval = 0.01
+
+        self.assertTrue(self._wait_for(lambda: self.mock_components[0].collect_power_usage.call_count >= 3))
+
+    def test_epoch_end_samples_boundary(self):
+        self.thread.update_interval = 100
+        self.thread.epoch_start()
+        self.assertTrue(self._wait_for(lambda: self.mock_components[0].collect_power_usage.call_count == 1))
+
+        self.thread.epoch_end()
+
+        self.assertTrue(self._wait_for(lambda: self.mock_components[0].collect_power_usage.call_count == 2))
+        self.mock_components[0].collect_power_usage.assert_called_with(1)
+        time.sleep(0.05)
+        self.assertEqual(self.mock_components[0].collect_power_usage.call_count, 2)
+
+    def test_sampling_intervals_per_component(self):
+        self.mock_components[0].name = "gpu"
+        self.mock_components[1].name = "cpu"
+        self.thread.update_interval = 100
+        self.thread.sampling_intervals = {"gpu": 0.01}
+        self.assertEqual(self.thread.sampling_interval(self.mock_components[0]), 0.01)
+        self.assertEqual(self.thread.sampling_interval(self.mock_components[1]), 100)
+
+        self.thread.epoch_start()
+
+        self.assertTrue(self._wait_for(lambda: self.mock_components[0].collect_power_usage.call_count >= 5))
+        self.assertEqual(self.mock_components[1].collect_power_usage.call_count, 1)
+
+    def test_sampling_intervals_change_wakes_thread(self):
+        self.mock_components[0].name = "gpu"
+        self.mock_components[1].name = "cpu"
+        self.thread.update_interval = 100
+        self.thread.epoch_start()
+        self.assertTrue(self._wait_for(lambda: self.mock_components[1].collect_power_usage.call_count == 1))
+
+        self.thread.sampling_intervals = {"cpu": 0.01}
+
+        self.assertTrue(self._wait_for(lambda: self.mock_components[1].collect_power_usage.call_count >= 3))
+        self.assertEqual(self.mock_components[0].collect_power_usage.call_count, 1)
+
+    def test_collect_measurements_concurrently(self):
+        start_times = {}
+
+        def slow_collection(component):
+            def collect(epoch):
+                start_times[component.name] = time.monotonic()
+                time.sleep(0.2)
+            return collect
+
+        for name, component in zip(("gpu", "cpu"), self.mock_components):
+            component.name = name
+            component.collect_power_usage.side_effect = slow_collection(component)
+        self.assertTrue(self._wait_for(lambda: len(self.thread._worker_queues) == 2))
+
+        start = time.monotonic()
+        self.thread._collect_measurements()
+
+        self.assertLess(time.monotonic() - start, 0.35)
+        self.assertLess(abs(start_times["gpu"] - start_times["cpu"]), 0.1)
+
+    def test_collect_measurements_concurrently_raises(self):
+        self.mock_components[1].collect_power_usage.side_effect = exceptions.GPUPowerUsageRetrievalError()
+        self.assertTrue(self._wait_for(lambda: len(self.thread._worker_queues) == 2))
+
+        with self.assertRaises(exceptions.GPUPowerUsageRetrievalError):
+            self.thread._collect_measurements()
+        self.mock_components[0].collect_power_usage.assert_called_once()
+
     @mock.patch('carbontracker.tracker.CarbonTrackerThread._handle_error')
     def test_run_exception_handling(self, mock_handle_error):
         mock_wait = mock.MagicMock()
         mock_wait.side_effect = Exception('Test exception')
 
-        self.thread.measuring_event.wait = mock_wait
+        self.thread._wakeup_event.wait = mock_wait
         self.thread.run()
 
         mock_handle_error.assert_called()
@@ -339,6 +650,24 @@ class TestCarbonTracker(unittest.TestCase):
         self.assertEqual(self.tracker.epoch_counter, initial_epoch_counter + 1)
         self.assertTrue(self.mock_tracker_thread.measuring_event.is_set())
 
+    def test_threads_start_on_first_epoch_start(self):
+        self.mock_tracker_thread.start.assert_not_called()
+        self.mock_intensity_thread.start.assert_not_called()
+
+        self.tracker.epoch_start()
+        self.tracker.epoch_start()
+
+        self.mock_tracker_thread.start.assert_called_once()
+        self.mock_intensity_thread.start.assert_called_once()
+
+    def test_start(self):
+        self.tracker.start()
+        self.tracker.start()
+
+        self.assertTrue(self.tracker.started)
+        self.mock_tracker_thread.start.assert_called_once()
+        self.mock_intensity_thread.start.assert_called_once()
+
     def test_check_input_yes(self):
         with patch('builtins.input', return_value='y'):
             self.tracker._check_input('y')
@@ -370,6 +699,25 @@ class TestCarbonTracker(unittest.TestCase):
         self.mock_tracker_thread.stop.assert_called_once()
         self.assertTrue(self.tracker.deleted)
 
+    def test_delete_joins_intensity_thread_first(self):
+        calls = MagicMock()
+        calls.attach_mock(self.mock_intensity_thread.join, "join")
+        calls.attach_mock(self.mock_tracker_thread.stop, "stop")
+        stopper = self.tracker.intensity_stopper
+
+        self.tracker._delete()
+
+        self.assertTrue(stopper.is_set())
+        self.assertEqual(calls.mock_calls, [call.join(STOP_TIMEOUT), call.stop()])
+
+    def test_delete_not_started_does_not_join_intensity_thread(self):
+        self.mock_intensity_thread.ident = None
+
+        self.tracker._delete()
+
+        self.mock_intensity_thread.join.assert_not_called()
+        self.mock_tracker_thread.stop.assert_called_once()
+
     @patch('carbontracker.tracker.psutil.Process')
     def test_get_pids(self, mock_process):
         mock_process.return_value.pid = 1234
@@ -451,6 +799,68 @@ class TestCarbonTracker(unittest.TestCase):
                 decimal_precision=6,
             )
 
+    def test_invalid_sampling_mode(self):
+        with self.assertRaises(ValueError):
+            CarbonTracker(epochs=5, log_dir=None, sampling_mode="unknown")
+
+    @patch('carbontracker.tracker.CarbonIntensityThread')
+    @patch('carbontracker.tracker.CarbonTrackerThread')
+    @patch('carbontracker.tracker.loggerutil.Logger')
+    @patch('carbontracker.tracker.component.create_components')
+    def test_sampling_mode_passed_to_components(self, mock_create_components, mock_logger, mock_tracker_thread,
+                                                mock_intensity_thread):
+        CarbonTracker(epochs=5, log_dir=None, sampling_mode="counter")
+        self.assertEqual(mock_create_components.call_args.kwargs["sampling_mode"], "counter")
+
+    def test_invalid_sampling_intervals(self):
+        for sampling_intervals in ({"tpu": 1}, {"gpu": 0}):
+            with self.assertRaises(ValueError):
+                CarbonTracker(epochs=5, log_dir=None, sampling_intervals=sampling_intervals)
+
+    def test_invalid_sample_retention(self):
+        for sample_retention in (0, 1.5):
+            with self.assertRaises(ValueError):
+                CarbonTracker(epochs=5, log_dir=None, sample_retention=sample_retention)
+
+    def test_invalid_adaptive_sampling(self):
+        for adaptive_sampling in ({"min_interval": 0}, {"overhead": 2}, {"interval": 1}):
+            with self.assertRaises(ValueError):
+                CarbonTracker(epochs=5, log_dir=None, adaptive_sampling=adaptive_sampling)
+
+    @patch('carbontracker.tracker.CarbonIntensityThread')
+    @patch('carbontracker.tracker.loggerutil.Logger')
+    @patch('carbontracker.tracker.component.create_components', return_value=[])
+    def test_adaptive_sampling_passed_to_thread(self, mock_create_components, mock_logger, mock_intensity_thread):
+        tracker = CarbonTracker(epochs=5, log_dir=None, adaptive_sampling=True)
+        self.assertEqual(tracker.tracker.adaptive_sampling, {})
+
+        tracker = CarbonTracker(epochs=5, log_dir=None, adaptive_sampling={"max_interval": 20})
+        self.assertEqual(tracker.tracker.adaptive_sampling, {"max_interval": 20})
+
+    def test_sampler_process_and_streaming(self):
+        with self.assertRaises(ValueError):
+            CarbonTracker(epochs=5, log_dir=None, sampler_process=True, streaming=True)
+
+    @patch('carbontracker.tracker.CarbonIntensityThread')
+    @patch('carbontracker.tracker.loggerutil.Logger')
+    @patch('carbontracker.tracker.sampler')
+    @patch('carbontracker.tracker.component.create_components')
+    def test_sampler_process(self, mock_create_components, mock_sampler, mock_logger, mock_intensity_thread):
+        tracker = CarbonTracker(epochs=5, log_dir=None, components="gpu", sampler_process=True, sample_retention=8)
+
+        self.assertIs(tracker.tracker, mock_sampler.SamplerProcess.return_value)
+        kwargs = mock_sampler.SamplerProcess.call_args.kwargs
+        self.assertEqual(kwargs["components"], "gpu")
+        self.assertEqual(kwargs["retention"], 8)
+        mock_create_components.assert_not_called()
+
+    @patch('carbontracker.tracker.CarbonIntensityThread')
+    @patch('carbontracker.tracker.loggerutil.Logger')
+    @patch('carbontracker.tracker.component.create_components', return_value=[])
+    def test_sampling_intervals_passed_to_thread(self, mock_create_components, mock_logger, mock_intensity_thread):
+        tracker = CarbonTracker(epochs=5, log_dir=None, sampling_intervals={"gpu": 0.2, "cpu": 5})
+        self.assertEqual(tracker.tracker.sampling_intervals, {"gpu": 0.2, "cpu": 5})
+
     def test_invalid_monitor_epochs_less_than_epochs_before_pred(self):
         with self.assertRaises(ValueError):
             CarbonTracker(
@@ -670,5 +1080,42 @@ class TestCarbonTracker(unittest.TestCase):
         self.assertEqual(str(context.exception), "'CarbonTracker' object has no attribute 'logger'")
 
 
+class TestDisabledCarbonTracker(unittest.TestCase):
+    @patch('carbontracker.tracker.CarbonIntensityThread')
+    @patch('carbontracker.tracker.CarbonTrackerThread')
+    @patch('carbontracker.tracker.loggerutil.Logger')
+    def test_disabled_argument(self, mock_logger, mock_tracker_thread, mock_intensity_thread):
+        tracker = CarbonTracker(epochs=3, log_dir=None, disabled=True)
+
+        self.assertIsInstance(tracker, DisabledCarbonTracker)
+        self.assertIsInstance(tracker, CarbonTracker)
+        self.assertEqual(tracker.epochs, 3)
+        tracker.epoch_start()
+        tracker.epoch_end()
+        tracker.stop()
+        mock_logger.assert_not_called()
+        mock_tracker_thread.assert_not_called()
+        mock_intensity_thread.assert_not_called()
+
+    @patch('carbontracker.tracker.component.create_components')
+    def test_disabled_environment_variable(self, mock_create_components):
+        for value in ("1", "true", "YES", "on"):
+            with patch.dict(os.environ, {"CARBONTRACKER_DISABLED": value}):
+                self.assertIsInstance(
+                    CarbonTracker(epochs=1, api_keys={"electricitymaps": "key"}), DisabledCarbonTracker
+                )
+        mock_create_components.assert_not_called()
+
+    @patch.dict(os.environ, {"CARBONTRACKER_DISABLED": "0"})
+    @patch('carbontracker.tracker.CarbonIntensityThread')
+    @patch('carbontracker.tracker.CarbonTrackerThread')
+    @patch('carbontracker.tracker.loggerutil.Logger')
+    def test_enabled(self, mock_logger, mock_tracker_thread, mock_intensity_thread):
+        tracker = CarbonTracker(epochs=1, log_dir=None, disabled=False)
+
+        self.assertNotIsInstance(tracker, DisabledCarbonTracker)
+        mock_tracker_thread.assert_called_once()
+
+
 if __name__ == '__main__':
     unittest.main()